@@ -1,9 +1,88 @@
 import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
 
 class Config:
     DEBUG = os.getenv("DEBUG", "false").lower() == "true"
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
 
-    DB_PATH = os.getenv("DB_PATH", "app/data/app.db")
+    DB_PATH = os.getenv("DB_PATH", str(BASE_DIR / "data" / "app.db"))
+    DB_JOURNAL_MODE = os.getenv("DB_JOURNAL_MODE", "WAL")
+    DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+    DB_CACHE_SIZE = int(os.getenv("DB_CACHE_SIZE", -20000))  # negative = KiB
+    DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", 256 * 1024 * 1024))
+    DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", 5000))
     HOST = os.getenv("HOST", "127.0.0.1")
     PORT = int(os.getenv("PORT", 5050))
+
+    # Load testing only: let the X-Experiment-Group request header pick the A/B group
+    EXPERIMENT_GROUP_HEADER = os.getenv("EXPERIMENT_GROUP_HEADER", "false").lower() == "true"
+
+    # Latency histograms / counters served at /metrics (Prometheus text format);
+    # false also drops the per-query SQLite timing (a few microseconds per query;
+    # measure with python -m benchmarks.suite --metrics-overhead)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # Opt-in SQL profiling: per-request query / connection / time accounting,
+    # slow queries logged with their plan, repeated statements flagged as N+1;
+    # with DEBUG the summary is returned in an X-SQL-Profile response header
+    SQL_PROFILE = os.getenv("SQL_PROFILE", "false").lower() == "true"
+    SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", 50))
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", 10))
+
+    # Build models in a background thread at startup instead of on first request
+    WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+
+    # Event ingestion: "direct" commits per request, "buffered" is write-behind,
+    # "process" hands events to a single writer process (event_writer.py)
+    EVENT_INGEST_MODE = os.getenv("EVENT_INGEST_MODE", "direct").lower()
+    EVENT_BUFFER_SIZE = int(os.getenv("EVENT_BUFFER_SIZE", 10000))
+    EVENT_BATCH_SIZE = int(os.getenv("EVENT_BATCH_SIZE", 500))
+    EVENT_FLUSH_INTERVAL_MS = int(os.getenv("EVENT_FLUSH_INTERVAL_MS", 200))
+    EVENT_BATCH_MAX_ITEMS = int(os.getenv("EVENT_BATCH_MAX_ITEMS", 1000))
+    EVENT_WRITER_ADDRESS = os.getenv("EVENT_WRITER_ADDRESS", str(BASE_DIR / "data" / "event_writer.sock"))
+    EVENT_WRITER_AUTOSTART = os.getenv("EVENT_WRITER_AUTOSTART", "true").lower() == "true"
+    EVENT_WRITER_TIMEOUT_MS = int(os.getenv("EVENT_WRITER_TIMEOUT_MS", 2000))
+    EVENT_SPILL_DIR = os.getenv("EVENT_SPILL_DIR", str(BASE_DIR / "data" / "event_spill"))
+    EVENT_SPILL_REPLAY_SECONDS = float(os.getenv("EVENT_SPILL_REPLAY_SECONDS", 5))
+
+    # Read-through caches for article/category data
+    ARTICLE_CACHE_SIZE = int(os.getenv("ARTICLE_CACHE_SIZE", 5000))
+    CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", 300))
+
+    # Recommendation result cache
+    RECOMMENDATION_CACHE_SIZE = int(os.getenv("RECOMMENDATION_CACHE_SIZE", 10000))
+    RECOMMENDATION_CACHE_MAX_STALENESS_SECONDS = float(os.getenv("RECOMMENDATION_CACHE_MAX_STALENESS_SECONDS", 60))
+    ENGAGEMENT_VERSION_BUCKET = int(os.getenv("ENGAGEMENT_VERSION_BUCKET", 100))
+    # POST /api/recommendations/batch: seeds per request, results per seed
+    RECOMMENDATION_BATCH_MAX_ITEMS = int(os.getenv("RECOMMENDATION_BATCH_MAX_ITEMS", 1000))
+    RECOMMENDATION_BATCH_MAX_LIMIT = int(os.getenv("RECOMMENDATION_BATCH_MAX_LIMIT", 50))
+
+    # Content recommendations: "inverted" (pruned top-k) or "brute" (score all)
+    CONTENT_RETRIEVAL = os.getenv("CONTENT_RETRIEVAL", "inverted").lower()
+    # "live" scores on request; "precomputed" reads related_articles first
+    CONTENT_MODE = os.getenv("CONTENT_MODE", "live").lower()
+
+    # Keywords stored per article in article_keywords (analytics shows the top 3)
+    KEYWORDS_TOP_N = int(os.getenv("KEYWORDS_TOP_N", 10))
+
+    # Trending strategy: hourly buckets kept for the window, decayed by half-life
+    TRENDING_WINDOW_HOURS = int(os.getenv("TRENDING_WINDOW_HOURS", 72))
+    TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", 12))
+
+    # Popular ranking: "sql" reads article_stats, "sketch" an in-memory heavy-hitters tracker
+    # (one per process, snapshotted to <path>.<pid>, exited processes' snapshots merged on startup)
+    POPULARITY_SOURCE = os.getenv("POPULARITY_SOURCE", "sql").lower()
+    HEAVY_HITTERS_CAPACITY = int(os.getenv("HEAVY_HITTERS_CAPACITY", 1000))
+    HEAVY_HITTERS_SNAPSHOT_PATH = os.getenv(
+        "HEAVY_HITTERS_SNAPSHOT_PATH", str(BASE_DIR / "data" / "heavy_hitters.json")
+    )
+    HEAVY_HITTERS_SNAPSHOT_SECONDS = float(os.getenv("HEAVY_HITTERS_SNAPSHOT_SECONDS", 60))
+
+    # Item-item collaborative filtering: neighbours kept per article, events read per chunk
+    CF_NEIGHBORS = int(os.getenv("CF_NEIGHBORS", 50))
+    CF_CHUNK_SIZE = int(os.getenv("CF_CHUNK_SIZE", 200000))
+
+    # ALS factors written by train_als.py and memory-mapped at startup
+    ALS_MODEL_DIR = os.getenv("ALS_MODEL_DIR", str(BASE_DIR / "data" / "als"))
@@ -1,9 +1,254 @@
+import logging
 import sqlite3
+import threading
+from collections import Counter
+from contextvars import ContextVar
 from pathlib import Path
+from time import perf_counter
+from typing import List, Optional, Tuple
 
-DB_PATH = Path(__file__).resolve().parent / "app.db"
+from app.config.config import Config
+from app.metrics import DB_FETCH_SECONDS, DB_QUERY_SECONDS, request_labels
 
-def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+logger = logging.getLogger("article_engine")
+
+# One connection per thread, reused by every repository/service call made on
+# that thread. Flask closes the request thread's connection on app teardown.
+_local = threading.local()
+_open_connections = set()
+_lock = threading.Lock()
+
+
+def db_path() -> str:
+    return str(Path(Config.DB_PATH).resolve())
+
+
+_statement_kinds = {}
+
+
+def statement_kind(sql: str) -> str:
+    """SELECT / INSERT / UPDATE / ... : the metric label of a statement."""
+    kind = _statement_kinds.get(sql)
+    if kind is None:
+        head = sql.lstrip()[:8].split(None, 1)
+        kind = head[0].upper() if head else ""
+        if len(_statement_kinds) < 10000:  # SQL is mostly constant strings
+            _statement_kinds[sql] = kind
+    return kind
+
+
+class QueryProfile:
+    """SQL issued while serving one request (SQL_PROFILE=true)."""
+
+    def __init__(self):
+        self.queries = 0
+        self.connections = 0  # opened during the request
+        self.checkouts = 0  # get_connection() calls
+        self.seconds = 0.0
+        self.slow = 0
+        self.statements: Counter = Counter()  # SQL text -> executions
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed more than `threshold` times, most frequent first."""
+        return [(" ".join(sql.split()), n) for sql, n in self.statements.most_common() if n > threshold]
+
+    def summary(self, threshold: int) -> str:
+        return (f"queries={self.queries}; connections={self.connections}; checkouts={self.checkouts}; "
+                f"sql_ms={self.seconds * 1000.0:.2f}; slow={self.slow}; "
+                f"repeated={len(self.repeated(threshold))}")
+
+
+_profile: ContextVar[Optional[QueryProfile]] = ContextVar("sql_profile", default=None)
+
+
+def start_profile() -> QueryProfile:
+    """Account every query on this thread / context to a fresh profile."""
+    profile = QueryProfile()
+    _profile.set(profile)
+    return profile
+
+
+def finish_profile(label: str) -> Optional[QueryProfile]:
+    """Stop accounting; warn about statements repeated past SQL_N_PLUS_ONE_THRESHOLD."""
+    profile = _profile.get()
+    if profile is None:
+        return None
+    _profile.set(None)
+    for sql, n in profile.repeated(Config.SQL_N_PLUS_ONE_THRESHOLD):
+        logger.warning(f"Possible N+1 in {label}: {n}x {sql}")
+    return profile
+
+
+def explain(conn: sqlite3.Connection, sql: str, parameters=()) -> str:
+    """EXPLAIN QUERY PLAN of a statement, one step per line."""
+    try:
+        # the base class execute: not profiled or timed itself
+        rows = sqlite3.Connection.execute(conn, f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+    except sqlite3.Error as e:
+        return f"(no plan: {e})"
+    return "\n".join(f"  {row[3]}" for row in rows)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Records execute()/executemany() and fetch time into the DB_* histograms
+    (METRICS_ENABLED) and the current request's QueryProfile (SQL_PROFILE).
+    With SQL_PROFILE a statement whose execute + fetch time passes
+    SQL_SLOW_QUERY_MS is logged once with its query plan.
+    """
+
+    _kind = ""
+    _sql = ""
+    _parameters = ()
+    _elapsed = 0.0
+    _logged_slow = False
+
+    def execute(self, sql, parameters=()):
+        start = perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._executed(sql, parameters, perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            # no single parameter set to explain the plan with
+            self._executed(sql, None, perf_counter() - start)
+
+    def fetchone(self):
+        start = perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            self._fetched(perf_counter() - start)
+
+    def fetchmany(self, size=None):
+        start = perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            self._fetched(perf_counter() - start)
+
+    def fetchall(self):
+        start = perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            self._fetched(perf_counter() - start)
+
+    def _executed(self, sql: str, parameters, seconds: float) -> None:
+        self._kind = statement_kind(sql)
+        if Config.METRICS_ENABLED:
+            DB_QUERY_SECONDS.labels(request_labels()[0], self._kind).observe(seconds)
+        if not Config.SQL_PROFILE:
+            return
+        self._sql, self._parameters = sql, parameters
+        self._elapsed, self._logged_slow = seconds, False
+        profile = _profile.get()
+        # a new connection's setup PRAGMAs show up under connections instead
+        if profile is not None and self._kind != "PRAGMA":
+            profile.queries += 1
+            profile.seconds += seconds
+            profile.statements[sql] += 1
+        self._check_slow(profile)
+
+    def _fetched(self, seconds: float) -> None:
+        if Config.METRICS_ENABLED:
+            DB_FETCH_SECONDS.labels(request_labels()[0], self._kind).observe(seconds)
+        if not Config.SQL_PROFILE:
+            return
+        self._elapsed += seconds
+        profile = _profile.get()
+        if profile is not None:
+            profile.seconds += seconds
+        self._check_slow(profile)
+
+    def _check_slow(self, profile: Optional[QueryProfile]) -> None:
+        if self._logged_slow or self._elapsed * 1000.0 < Config.SQL_SLOW_QUERY_MS:
+            return
+        self._logged_slow = True
+        if profile is not None:
+            profile.slow += 1
+        message = (f"Slow query ({self._elapsed * 1000.0:.1f}ms) in {request_labels()[0] or 'background'}: "
+                   f"{' '.join(self._sql.split())}")
+        if self._parameters is not None:
+            message += f" params={self._parameters}\n{explain(self.connection, self._sql, self._parameters)}"
+        logger.warning(message)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors (including conn.execute shortcuts) are InstrumentedCursor."""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def _open(path: str) -> sqlite3.Connection:
+    # check_same_thread=False only so close_all() can close it at shutdown;
+    # a connection is still used by the thread that opened it
+    instrumented = Config.METRICS_ENABLED or Config.SQL_PROFILE
+    factory = InstrumentedConnection if instrumented else sqlite3.Connection
+    conn = sqlite3.connect(path, timeout=Config.DB_BUSY_TIMEOUT_MS / 1000.0, check_same_thread=False,
+                           factory=factory)
     conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA journal_mode={Config.DB_JOURNAL_MODE}")
+    conn.execute(f"PRAGMA synchronous={Config.DB_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size={int(Config.DB_CACHE_SIZE)}")
+    conn.execute(f"PRAGMA mmap_size={int(Config.DB_MMAP_SIZE)}")
+    conn.execute(f"PRAGMA busy_timeout={int(Config.DB_BUSY_TIMEOUT_MS)}")
     return conn
+
+
+def get_connection() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    # compared as configured: resolving the path (a stat per component) is
+    # only paid when a connection is opened, not on every checkout
+    configured = Config.DB_PATH
+    if conn is not None and _local.configured != configured:
+        # DB_PATH was changed (tests, CLI tools): drop the stale connection
+        close_connection()
+        conn = None
+    profile = _profile.get()
+    if conn is None:
+        conn = _open(db_path())
+        _local.conn = conn
+        _local.configured = configured
+        with _lock:
+            _open_connections.add(conn)
+        if profile is not None:
+            profile.connections += 1
+    if profile is not None:
+        profile.checkouts += 1
+    return conn
+
+
+def close_connection(exc=None) -> None:
+    """Close the current thread's connection (rolls back anything uncommitted)."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        return
+    _local.conn = None
+    with _lock:
+        _open_connections.discard(conn)
+    conn.close()
+
+
+def close_all() -> None:
+    with _lock:
+        conns = list(_open_connections)
+        _open_connections.clear()
+    for conn in conns:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    _local.conn = None
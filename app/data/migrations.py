@@ -0,0 +1,135 @@
+"""
+Ordered schema migrations on top of the baseline in schema.SCHEMA_SQL.
+
+Every step runs once, in its own transaction, and is recorded in the
+schema_version table. Append new steps with the next version number;
+never edit or reorder a step that has shipped.
+"""
+import sqlite3
+from typing import Callable, List, Tuple
+
+SCHEMA_VERSION_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TEXT DEFAULT (datetime('now'))
+);
+"""
+
+
+def _add_experiment_group_column(conn: sqlite3.Connection) -> None:
+    # databases created before the A/B test shipped
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(interaction_events)")}
+    if "experiment_group" not in columns:
+        conn.execute("ALTER TABLE interaction_events ADD COLUMN experiment_group TEXT")
+
+
+def _sql(*statements: str) -> Callable[[sqlite3.Connection], None]:
+    def step(conn: sqlite3.Connection) -> None:
+        for statement in statements:
+            conn.execute(statement)
+    return step
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "add interaction_events.experiment_group", _add_experiment_group_column),
+    (2, "index interaction_events by article and event type", _sql(
+        # covers count_for_article and total_duration_ms_for_article
+        """CREATE INDEX IF NOT EXISTS idx_events_article_type
+           ON interaction_events(article_id, event_type, duration_ms)""",
+    )),
+    (3, "index interaction_events by experiment group and event type", _sql(
+        # covers the A/B summary aggregation
+        """CREATE INDEX IF NOT EXISTS idx_events_group_type
+           ON interaction_events(experiment_group, event_type, duration_ms)""",
+    )),
+    (4, "precomputed related articles", _sql(
+        """CREATE TABLE IF NOT EXISTS related_articles (
+               article_id INTEGER NOT NULL,
+               rank INTEGER NOT NULL,
+               neighbor_id INTEGER NOT NULL,
+               score REAL NOT NULL,
+               PRIMARY KEY (article_id, rank)
+           ) WITHOUT ROWID""",
+        # one row per processed article; content_hash detects edits
+        """CREATE TABLE IF NOT EXISTS related_articles_state (
+               article_id INTEGER PRIMARY KEY,
+               content_hash TEXT NOT NULL,
+               computed_at TEXT DEFAULT (datetime('now'))
+           )""",
+    )),
+    (5, "precomputed article keywords", _sql(
+        # top-N TF-IDF terms per article, written by KeywordExtractor / rekeyword.py
+        """CREATE TABLE IF NOT EXISTS article_keywords (
+               article_id INTEGER NOT NULL,
+               rank INTEGER NOT NULL,
+               keyword TEXT NOT NULL,
+               weight REAL NOT NULL,
+               PRIMARY KEY (article_id, rank)
+           ) WITHOUT ROWID""",
+    )),
+    (6, "hourly engagement buckets for trending", _sql(
+        # keyed by hour first: the trending window and roll-off are range scans
+        """CREATE TABLE IF NOT EXISTS article_event_buckets (
+               bucket_hour INTEGER NOT NULL,
+               article_id INTEGER NOT NULL,
+               views INTEGER NOT NULL DEFAULT 0,
+               likes INTEGER NOT NULL DEFAULT 0,
+               time_spent_ms INTEGER NOT NULL DEFAULT 0,
+               PRIMARY KEY (bucket_hour, article_id)
+           ) WITHOUT ROWID""",
+    )),
+    (7, "bulk import checkpoints", _sql(
+        # records consumed per source file, committed with each imported chunk
+        """CREATE TABLE IF NOT EXISTS import_progress (
+               source TEXT PRIMARY KEY,
+               position INTEGER NOT NULL,
+               imported INTEGER NOT NULL,
+               updated_at TEXT DEFAULT (datetime('now'))
+           )""",
+    )),
+    (8, "A/B group rollup", _sql(
+        # one row per experiment group, kept up to date at ingest
+        """CREATE TABLE IF NOT EXISTS experiment_group_stats (
+               experiment_group TEXT PRIMARY KEY,
+               views INTEGER NOT NULL DEFAULT 0,
+               likes INTEGER NOT NULL DEFAULT 0,
+               time_spent_ms INTEGER NOT NULL DEFAULT 0
+           )""",
+    )),
+    (9, "index interaction_events by user", _sql(
+        # covers article_ids_for_user (what to leave out of personal picks)
+        """CREATE INDEX IF NOT EXISTS idx_events_user_article
+           ON interaction_events(user_id, article_id)""",
+    )),
+]
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    conn.execute(SCHEMA_VERSION_SQL)
+    (version,) = conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()
+    return int(version)
+
+
+def migrate(conn: sqlite3.Connection) -> List[int]:
+    """Apply pending migrations in order. Returns the versions applied."""
+    applied = []
+    version = current_version(conn)
+    conn.commit()
+    for number, name, step in MIGRATIONS:
+        if number <= version:
+            continue
+        # explicit BEGIN so DDL is part of the transaction too
+        conn.execute("BEGIN")
+        try:
+            step(conn)
+            conn.execute(
+                "INSERT INTO schema_version(version, name) VALUES (?, ?)",
+                (number, name),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(number)
+    return applied
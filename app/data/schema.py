@@ -1,6 +1,9 @@
 from app.data.db import get_connection
+from app.data.migrations import migrate
 from app.config.config import Config
-import sqlite3
+from app.repositories.article_stats_repository import ArticleStatsRepository
+from app.repositories.event_bucket_repository import EventBucketRepository
+from app.repositories.experiment_group_stats_repository import ExperimentGroupStatsRepository
 
 SCHEMA_SQL = """
 CREATE TABLE IF NOT EXISTS categories (
@@ -33,22 +36,28 @@ CREATE TABLE IF NOT EXISTS interaction_events (
     created_at TEXT DEFAULT (datetime('now')),
     FOREIGN KEY (article_id) REFERENCES articles(id)
 );
-"""
 
-def ensure_experiment_group_column():
-    conn = sqlite3.connect(Config.DB_PATH)
-    try:
-        conn.execute("ALTER TABLE interaction_events ADD COLUMN experiment_group TEXT")
-        conn.commit()
-    except sqlite3.OperationalError:
-        pass
-    finally:
-        conn.close()
+CREATE TABLE IF NOT EXISTS article_stats (
+    article_id INTEGER PRIMARY KEY,
+    views INTEGER NOT NULL DEFAULT 0,
+    likes INTEGER NOT NULL DEFAULT 0,
+    time_spent_ms INTEGER NOT NULL DEFAULT 0,
+    score REAL NOT NULL DEFAULT 0,
+    FOREIGN KEY (article_id) REFERENCES articles(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_article_stats_score
+    ON article_stats(score DESC, article_id DESC);
+"""
 
 def init_db() -> None:
     conn = get_connection()
     conn.executescript(SCHEMA_SQL)
     conn.commit()
-    conn.close()
 
-    ensure_experiment_group_column()
+    migrate(conn)
+
+    # databases created before the materialized aggregates existed
+    ArticleStatsRepository().backfill_if_empty()
+    EventBucketRepository(window_hours=Config.TRENDING_WINDOW_HOURS).backfill_if_empty()
+    ExperimentGroupStatsRepository().backfill_if_empty()
@@ -1,15 +1,33 @@
 from app.config.config import Config
-from flask import Flask, render_template, jsonify, request, session
+from flask import Flask, Response, g, render_template, jsonify, request, session
 from app.services.article_service import ArticleService
 from app.services.interaction_event_service import InteractionEventService
+from app.services.event_buffer import EventWriteBuffer
+from app.services.event_writer import EventWriterClient, SpillDirectory, SpillReplayer, spawn_writer, stop_writer
 from app.models.interaction_event import InteractionEvent
 from app.data.schema import init_db
+from app.data.db import close_connection, close_all, db_path, finish_profile, start_profile
 from app.data.seed import seed_if_empty
 from app.services.recommendation_factory import RecommendationFactory
+from app.services.content_index import ContentIndex
+from app.services.analytics_service import AnalyticsService
+from app.services.keyword_extractor import KeywordExtractor
+from app.services.trending_service import TrendingService
+from app.services.heavy_hitters import HeavyHittersTracker
+from app.services.item_similarity import ItemItemModel
+from app.services.matrix_factorization import MatrixFactorizationModel
+from app.services.recommendation_cache import DataVersion, RecommendationCache
+from app.repositories.article_stats_repository import ArticleStatsRepository
+from app.repositories.cached_repository import CategoryNameCache
+from app.repositories.related_articles_repository import RelatedArticlesRepository
+from app.warmup import Warmup
+from app import metrics
 from dataclasses import replace
-from sklearn.feature_extraction.text import TfidfVectorizer
+import atexit
 import logging
 import random
+import sqlite3
+import time
 
 
 def create_app():
@@ -35,27 +53,182 @@ def create_app():
     service = ArticleService()
     event_service = InteractionEventService()
 
-    import sqlite3
+    if Config.EVENT_INGEST_MODE == "buffered":
+        # batches that keep failing are spilled to disk and replayed from there
+        spill = SpillDirectory(Config.EVENT_SPILL_DIR)
+        replayer = SpillReplayer(
+            spill, event_service.write_events,
+            batch_size=Config.EVENT_BATCH_SIZE,
+            interval=Config.EVENT_SPILL_REPLAY_SECONDS,
+        ).start()
+        event_service.buffer = EventWriteBuffer(
+            event_service.write_events,
+            max_size=Config.EVENT_BUFFER_SIZE,
+            batch_size=Config.EVENT_BATCH_SIZE,
+            flush_interval=Config.EVENT_FLUSH_INTERVAL_MS / 1000.0,
+            spill=spill.append,
+        ).start()
+        # at exit (last registered runs first): flush the queue, then replay leftovers
+        atexit.register(replayer.close)
+        atexit.register(event_service.buffer.close)
+    elif Config.EVENT_INGEST_MODE == "process":
+        event_service.writer = EventWriterClient(
+            Config.EVENT_WRITER_ADDRESS,
+            Config.SECRET_KEY.encode(),
+            Config.EVENT_SPILL_DIR,
+            timeout=Config.EVENT_WRITER_TIMEOUT_MS / 1000.0,
+        )
+        # single-process setups start their own writer; with several web
+        # workers run event_writer.py separately and set EVENT_WRITER_AUTOSTART=false
+        if Config.EVENT_WRITER_AUTOSTART and not event_service.writer.ping():
+            atexit.register(stop_writer, spawn_writer(db_path()))
+
+    # TF-IDF index shared by content recommendations, built on first use
+    content_index = ContentIndex(service, retrieval=Config.CONTENT_RETRIEVAL)
+    service.repo.subscribe(content_index.on_article_created)
+
+    # Keywords are extracted on create / index refit and stored in article_keywords
+    keyword_extractor = KeywordExtractor(content_index, top_n=Config.KEYWORDS_TOP_N)
+    service.repo.subscribe(keyword_extractor.on_article_created)
+    content_index.subscribe_refit(keyword_extractor.on_index_refit)
+
+    analytics_service = AnalyticsService(content_index, keyword_extractor=keyword_extractor)
+
+    # CONTENT_MODE=precomputed: read neighbours written by precompute_related.py
+    related_articles = RelatedArticlesRepository() if Config.CONTENT_MODE == "precomputed" else None
+
+    # Time-decayed popularity over hourly event buckets
+    trending = TrendingService(
+        half_life_hours=Config.TRENDING_HALF_LIFE_HOURS,
+        window_hours=Config.TRENDING_WINDOW_HOURS,
+    )
+
+    # POPULARITY_SOURCE=sketch: rank "popular" from memory, warmed from the last snapshot
+    heavy_hitters = None
+    if Config.POPULARITY_SOURCE == "sketch":
+        heavy_hitters = HeavyHittersTracker(
+            capacity=Config.HEAVY_HITTERS_CAPACITY,
+            snapshot_path=Config.HEAVY_HITTERS_SNAPSHOT_PATH,
+        )
+        if not heavy_hitters.load():
+            heavy_hitters.seed(ArticleStatsRepository().top_stats(Config.HEAVY_HITTERS_CAPACITY))
+        event_service.subscribe(heavy_hitters.on_events_logged)
+        heavy_hitters.start(Config.HEAVY_HITTERS_SNAPSHOT_SECONDS)
+        atexit.register(heavy_hitters.close)
+
+    # Item-item co-engagement neighbours, built on first use and updated from logged events
+    item_model = ItemItemModel(neighbors=Config.CF_NEIGHBORS, chunk_size=Config.CF_CHUNK_SIZE)
+    event_service.subscribe(item_model.on_events_logged)
+
+    # ALS factors from train_als.py, memory-mapped (shared pages across workers); None until trained
+    mf_model = MatrixFactorizationModel.load(Config.ALS_MODEL_DIR)
+
+    # Memoized recommendations, invalidated through cheap data versions
+    data_version = DataVersion(engagement_bucket=Config.ENGAGEMENT_VERSION_BUCKET)
+    service.repo.subscribe(data_version.on_article_created)
+    event_service.subscribe(data_version.on_events_logged)
+    recommendation_cache = RecommendationCache(
+        data_version,
+        maxsize=Config.RECOMMENDATION_CACHE_SIZE,
+        max_staleness=Config.RECOMMENDATION_CACHE_MAX_STALENESS_SECONDS,
+    )
+
+    category_names = CategoryNameCache(ttl=Config.CACHE_TTL_SECONDS)
+
+    # One pooled connection per request thread, released when the request ends
+    app.teardown_appcontext(close_connection)
+    atexit.register(close_all)
+
+    # Build recommendation state in the background; /readyz reports progress
+    warmup = Warmup()
+    if Config.WARMUP_ENABLED:
+        warmup.add("articles", service.list_articles)
+        warmup.add("content_index", content_index.ensure_built)
+        if Config.CONTENT_RETRIEVAL == "inverted":
+            warmup.add("inverted_index", content_index.inverted_index)
+        warmup.add("collaborative", item_model.ensure_built)
+    app.extensions["warmup"] = warmup.start()
 
     def get_category_name(category_id):
-        if not category_id:
-            return "Unknown"
-        conn = sqlite3.connect(Config.DB_PATH)
-        try:
-            row = conn.execute(
-                "SELECT name FROM categories WHERE id = ?",
-                (category_id,)
-            ).fetchone()
-            return row[0] if row else "Unknown"
-        finally:
-            conn.close()
+        return category_names.name_for(category_id) or "Unknown"
 
     # Step 3C: Assign A/B group once per browser session
     @app.before_request
     def assign_experiment_group():
-        if "experiment_group" not in session:
+        # load tests pick the group per request (off unless configured)
+        forced = request.headers.get("X-Experiment-Group") if Config.EXPERIMENT_GROUP_HEADER else None
+        if forced in ("A", "B"):
+            session["experiment_group"] = forced
+        elif "experiment_group" not in session:
             session["experiment_group"] = random.choice(["A", "B"])
 
+    # Step 3D: per-request latency / count metrics, labelled by route and group
+    if Config.METRICS_ENABLED:
+        @app.before_request
+        def start_request_metrics():
+            # the rule, not the path, so /articles/<id> is one label value
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            metrics.set_request_labels(route, session.get("experiment_group", ""))
+            g.request_started = time.perf_counter()
+
+        @app.after_request
+        def record_request_metrics(response):
+            started = g.pop("request_started", None)
+            if started is not None:
+                route, group = metrics.request_labels()
+                metrics.HTTP_SECONDS.labels(route, request.method, group).observe(time.perf_counter() - started)
+                metrics.HTTP_REQUESTS.labels(route, request.method, response.status_code, group).inc()
+            return response
+
+        @app.teardown_request
+        def clear_request_labels(exc=None):
+            metrics.set_request_labels("", "")
+
+        @app.route("/metrics")
+        def metrics_endpoint():
+            return Response(metrics.REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+    # Step 3E: opt-in SQL accounting per request (SQL_PROFILE)
+    if Config.SQL_PROFILE:
+        @app.before_request
+        def start_sql_profile():
+            start_profile()
+
+        @app.after_request
+        def finish_sql_profile(response):
+            rule = request.url_rule.rule if request.url_rule else request.path
+            profile = finish_profile(f"{request.method} {rule}")
+            if profile is not None and (app.debug or Config.DEBUG):
+                response.headers["X-SQL-Profile"] = profile.summary(Config.SQL_N_PLUS_ONE_THRESHOLD)
+            return response
+
+    def render(template: str, **context):
+        with metrics.TEMPLATE_SECONDS.labels(metrics.request_labels()[0], template).time():
+            return render_template(template, **context)
+
+    def recommend(strategy, article_id: int, limit: int = 8):
+        # the factory's canonical name ("content", ...), never the raw query string
+        name = getattr(strategy, "name", type(strategy).__name__)
+        route, group = metrics.request_labels()
+        with metrics.RECOMMEND_SECONDS.labels(route, name, group).time():
+            return strategy.recommend(article_id=article_id, limit=limit)
+
+    def is_lock_timeout(e: Exception) -> bool:
+        return isinstance(e, sqlite3.OperationalError) and (
+            "locked" in str(e) or "busy" in str(e)
+        )
+
+    @app.errorhandler(sqlite3.OperationalError)
+    def database_error(e):
+        # busy_timeout ran out waiting for the write lock: tell clients to retry
+        if is_lock_timeout(e):
+            logger.warning(f"{request.method} {request.path}: {e}")
+            response = jsonify({"status": "error", "message": "database is locked, retry later"})
+            response.headers["Retry-After"] = "1"
+            return response, 503
+        logger.exception(f"Database error in {request.method} {request.path}")
+        return jsonify({"status": "error", "message": "internal server error"}), 500
+
     # Step 4B helper: always read group from session
     def get_experiment_group() -> str:
         group = session.get("experiment_group")
@@ -71,12 +244,33 @@ def create_app():
     def debug_group():
         return jsonify({"experiment_group": session.get("experiment_group")})
 
+    @app.route("/healthz")
+    def healthz():
+        # liveness: the process is up and serving
+        return jsonify({"status": "ok"})
+
+    @app.route("/readyz")
+    def readyz():
+        status = warmup.status()
+        return jsonify(status), 200 if status["ready"] else 503
+
+    @app.route("/api/cache-stats")
+    def cache_stats():
+        return jsonify({
+            "articles": service.repo.stats(),
+            "categories": category_names.stats(),
+            "recommendations": recommendation_cache.stats(),
+            "heavy_hitters": heavy_hitters.stats() if heavy_hitters else None,
+            "collaborative": item_model.stats() if item_model.built else None,
+            "event_writer": event_service.writer.stats() if event_service.writer else None,
+        })
+
     # Web routes
 
     @app.route("/")
     def home():
         articles = service.list_articles()
-        return render_template("home.html", articles=articles)
+        return render("home.html", articles=articles)
 
     @app.route("/articles/<int:article_id>")
     def article_detail(article_id: int):
@@ -116,9 +310,16 @@ def create_app():
             strategy_name=strategy_name,
             article_service=service,
             event_service=event_service,
+            content_index=content_index,
+            cache=recommendation_cache,
+            related_articles=related_articles,
+            trending=trending,
+            popularity=heavy_hitters,
+            item_model=item_model,
+            mf_model=mf_model,
         )
 
-        recommendations = strategy.recommend(article_id=article_id, limit=8)
+        recommendations = recommend(strategy, article_id)
 
         # attach category names and exclude current article
         recommendations = [
@@ -127,7 +328,7 @@ def create_app():
             if a.id != article_id
         ]
 
-        return render_template(
+        return render(
             "article_detail.html",
             article=article,
             views=views,
@@ -136,67 +337,107 @@ def create_app():
             rec_strategy=strategy_name
         )
 
-    def get_top_keywords_for_article_id(article_id: int, top_n: int = 3) -> str:
-        articles = service.list_articles()
-        if not articles:
-            return "-"
-
-        def build_text(a) -> str:
-            title = (getattr(a, "title", "") or "").strip()
-            content = (getattr(a, "content", "") or "").strip()
-            category_name = get_category_name(getattr(a, "category_id", None))
-            return f"{title} {content} {category_name}".strip()
-
-        texts = [build_text(a) for a in articles]
+    # API routes
 
-        if not any(t.strip() for t in texts):
-            return "-"
+    @app.route("/api/recommendations/<int:article_id>")
+    def recommendations(article_id: int):
+        requested = request.args.get("strategy", "popular")
 
-        vectorizer = TfidfVectorizer(
-            lowercase=True,
-            max_features=5000,
-            stop_words="english"
+        strategy = RecommendationFactory.create(
+            strategy_name=requested,
+            article_service=service,
+            event_service=event_service,
+            content_index=content_index,
+            cache=recommendation_cache,
+            related_articles=related_articles,
+            trending=trending,
+            popularity=heavy_hitters,
+            item_model=item_model,
+            mf_model=mf_model,
         )
-        tfidf_matrix = vectorizer.fit_transform(texts)
-        feature_names = vectorizer.get_feature_names_out()
-
-        id_to_index = {a.id: i for i, a in enumerate(articles)}
-        idx = id_to_index.get(article_id)
-
-        if idx is None:
-            return "-"
-
-        row_vec = tfidf_matrix[idx]
-        if row_vec.nnz == 0:
-            return "-"
-
-        indices = row_vec.indices
-        data = row_vec.data
 
-        top_pairs = sorted(zip(indices, data), key=lambda x: x[1], reverse=True)[:top_n]
-        words = [feature_names[i] for i, _ in top_pairs]
+        results = recommend(strategy, article_id)
 
-        return ", ".join(words) if words else "-"
+        actual = type(getattr(strategy, "inner", strategy)).__name__
 
-    # API routes
+        return jsonify({
+            "requested_strategy": requested,
+            "actual_strategy": actual,
+            "recommendations": [{"id": a.id, "title": a.title} for a in results]
+        })
 
-    @app.route("/api/recommendations/<int:article_id>")
-    def recommendations(article_id: int):
-        requested = request.args.get("strategy", "popular")
+    @app.route("/api/recommendations/batch", methods=["POST"])
+    def recommendations_batch():
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"status": "error", "errors": ["body must be a JSON object"]}), 400
+
+        seeds = data.get("article_ids")
+        limit = data.get("limit", 8)
+        requested = data.get("strategy", "popular")
+
+        errors = []
+        if not isinstance(seeds, list) or not seeds or not all(isinstance(i, int) for i in seeds):
+            errors.append("article_ids must be a non-empty array of integers")
+        elif len(seeds) > Config.RECOMMENDATION_BATCH_MAX_ITEMS:
+            errors.append(f"at most {Config.RECOMMENDATION_BATCH_MAX_ITEMS} article_ids per batch")
+        if not isinstance(limit, int) or not 1 <= limit <= Config.RECOMMENDATION_BATCH_MAX_LIMIT:
+            errors.append(f"limit must be an integer between 1 and {Config.RECOMMENDATION_BATCH_MAX_LIMIT}")
+        if not isinstance(requested, str):
+            errors.append("strategy must be a string")
+        if errors:
+            return jsonify({"status": "error", "errors": errors}), 400
 
         strategy = RecommendationFactory.create(
             strategy_name=requested,
             article_service=service,
             event_service=event_service,
+            content_index=content_index,
+            cache=recommendation_cache,
+            related_articles=related_articles,
+            trending=trending,
+            popularity=heavy_hitters,
+            item_model=item_model,
+            mf_model=mf_model,
         )
 
-        results = strategy.recommend(article_id=article_id, limit=8)
+        # every seed scored in one pass (shared ranking / one sparse product)
+        name = getattr(strategy, "name", type(strategy).__name__)
+        route, group = metrics.request_labels()
+        with metrics.RECOMMEND_SECONDS.labels(route, name, group).time():
+            results = strategy.recommend_many(seeds, limit=limit)
 
-        actual = strategy.__class__.__name__
+        actual = type(getattr(strategy, "inner", strategy)).__name__
 
         return jsonify({
             "requested_strategy": requested,
             "actual_strategy": actual,
+            "results": [
+                {
+                    "article_id": seed,
+                    "recommendations": [{"id": a.id, "title": a.title} for a in results.get(seed, [])],
+                }
+                for seed in dict.fromkeys(seeds)
+            ],
+        })
+
+    @app.route("/api/users/<int:user_id>/recommendations")
+    def user_recommendations(user_id: int):
+        strategy = RecommendationFactory.create(
+            strategy_name="als",
+            article_service=service,
+            event_service=event_service,
+            popularity=heavy_hitters,
+            mf_model=mf_model,
+        )
+        # personal picks are for articles the user has not read yet
+        results = strategy.recommend_for_user(
+            user_id, limit=8, exclude_article_ids=event_service.article_ids_for_user(user_id)
+        )
+
+        return jsonify({
+            "user_id": user_id,
+            "personalized": mf_model is not None and mf_model.has_user(user_id),
             "recommendations": [{"id": a.id, "title": a.title} for a in results]
         })
 
@@ -218,13 +459,17 @@ def create_app():
                 strategy_name=strategy_name,
                 article_service=service,
                 event_service=event_service,
+                content_index=content_index,
+                cache=recommendation_cache,
+                related_articles=related_articles,
+                trending=trending,
+                popularity=heavy_hitters,
+                item_model=item_model,
+                mf_model=mf_model,
             )
-            recommendations = strategy.recommend(
-                article_id=article_id,
-                limit=8
-            )
+            recommendations = recommend(strategy, article_id)
 
-        return render_template(
+        return render(
             "recommendations.html",
             articles=articles,
             selected_article_id=article_id,
@@ -234,96 +479,72 @@ def create_app():
 
     @app.route("/api/analytics/<int:article_id>")
     def analytics(article_id: int):
-        total_ms = event_service.total_duration_ms_for_article(article_id, "time_spent")
-        total_seconds = round(total_ms / 1000.0, 2)
-        total_minutes = round(total_ms / 60000.0, 2)
-
-        article = service.get_article(article_id)
-        category_name = get_category_name(getattr(article, "category_id", None)) if article else "Unknown"
-        top_keywords = get_top_keywords_for_article_id(article_id, top_n=3)
+        row = analytics_service.article(article_id)
+        if row is None:
+            return jsonify({"status": "error", "message": "article not found"}), 404
 
         requested = request.args.get("strategy")
 
         data = {
             "article_id": article_id,
-            "views": event_service.count_for_article(article_id, "view"),
-            "likes": event_service.count_for_article(article_id, "like"),
-            "time_spent_minutes": total_minutes,
-            "time_spent_seconds": total_seconds,
-            "category": category_name,
-            "top_keywords": top_keywords,
+            "views": row["views"],
+            "likes": row["likes"],
+            "time_spent_minutes": row["time_spent_minutes"],
+            "time_spent_seconds": row["time_spent_seconds"],
+            "category": row["category"],
+            "top_keywords": row["top_keywords"],
             "requested_strategy": requested
         }
         return jsonify(data)
 
     @app.route("/analytics")
     def analytics_page():
-        articles = service.list_articles()
-
-        def build_text(a) -> str:
-            title = (getattr(a, "title", "") or "").strip()
-            content = (getattr(a, "content", "") or "").strip()
-            category_name = get_category_name(getattr(a, "category_id", None))
-            return f"{title} {content} {category_name}".strip()
-
-        texts = [build_text(a) for a in articles]
-
-        top_keywords = [""] * len(articles)
-
-        if articles and any(t.strip() for t in texts):
-            vectorizer = TfidfVectorizer(
-                lowercase=True,
-                max_features=5000,
-                stop_words="english"
-            )
-            tfidf_matrix = vectorizer.fit_transform(texts)
-            feature_names = vectorizer.get_feature_names_out()
-
-            for i in range(len(articles)):
-                row_vec = tfidf_matrix[i]
-                if row_vec.nnz == 0:
-                    top_keywords[i] = ""
-                    continue
-
-                indices = row_vec.indices
-                data = row_vec.data
-
-                top_pairs = sorted(zip(indices, data), key=lambda x: x[1], reverse=True)[:3]
-                words = [feature_names[idx] for idx, _ in top_pairs]
-
-                top_keywords[i] = ", ".join(words)
-
-        analytics_data = []
-        category_counts = {}
-
-        for idx, article in enumerate(articles):
-            total_ms = event_service.total_duration_ms_for_article(article.id, "time_spent")
-            total_seconds = round(total_ms / 1000, 2)
-            total_minutes = round(total_ms / 60000, 2)
-
-            category_name = get_category_name(getattr(article, "category_id", None))
-            category_counts[category_name] = category_counts.get(category_name, 0) + 1
-
-            kw = top_keywords[idx] or "-"
-
-            analytics_data.append({
-                "article": article,
-                "category": category_name,
-                "views": event_service.count_for_article(article.id, "view"),
-                "likes": event_service.count_for_article(article.id, "like"),
-                "time_spent_seconds": total_seconds,
-                "time_spent_minutes": total_minutes,
-                "top_keywords": kw,
-            })
+        result = analytics_service.page(
+            page=request.args.get("page", 1, type=int),
+            per_page=request.args.get("per_page", 50, type=int),
+            sort=request.args.get("sort", "newest"),
+            order=request.args.get("order", "desc"),
+        )
 
-        category_labels = list(category_counts.keys())
-        category_values = [category_counts[k] for k in category_labels]
+        category_labels = [name for name, _ in result["category_counts"]]
+        category_values = [n for _, n in result["category_counts"]]
 
-        return render_template(
+        return render(
             "analytics.html",
-            analytics_data=analytics_data,
+            analytics_data=result["rows"],
             category_labels=category_labels,
-            category_values=category_values
+            category_values=category_values,
+            pagination=result
+        )
+
+    allowed_types = {"view", "like", "time_spent"}
+
+    def validate_event_payload(data) -> list:
+        event_type = data.get("event_type")
+        article_id = data.get("article_id")
+        duration = data.get("duration_ms")
+
+        errors = []
+        if event_type not in allowed_types:
+            errors.append("event_type must be one of: view, like, time_spent")
+        if not isinstance(article_id, int):
+            errors.append("article_id must be an integer")
+        user_id = data.get("user_id")
+        if user_id is not None and not isinstance(user_id, int):
+            errors.append("user_id must be an integer or null")
+        if event_type == "time_spent" and duration is not None and not isinstance(duration, int):
+            errors.append("duration_ms must be an integer (milliseconds)")
+        return errors
+
+    def event_from_payload(data) -> InteractionEvent:
+        return InteractionEvent(
+            id=None,
+            article_id=data.get("article_id"),
+            user_id=data.get("user_id"),
+            event_type=data.get("event_type"),
+            duration_ms=data.get("duration_ms"),
+            created_at=None,
+            experiment_group=get_experiment_group(),
         )
 
     @app.route("/api/events", methods=["POST"])
@@ -335,59 +556,61 @@ def create_app():
             article_id = data.get("article_id")
             duration = data.get("duration_ms")
 
-            allowed_types = {"view", "like", "time_spent"}
-
-            errors = []
-            if event_type not in allowed_types:
-                errors.append("event_type must be one of: view, like, time_spent")
-            if not isinstance(article_id, int):
-                errors.append("article_id must be an integer")
-            if event_type == "time_spent" and duration is not None and not isinstance(duration, int):
-                errors.append("duration_ms must be an integer (milliseconds)")
+            errors = validate_event_payload(data)
 
             if errors:
                 logger.warning(f"Bad /api/events payload: {data} errors={errors}")
                 return jsonify({"status": "error", "errors": errors, "received": data}), 400
 
-            event_service.log(
-                InteractionEvent(
-                    id=None,
-                    article_id=article_id,
-                    user_id=data.get("user_id"),
-                    event_type=event_type,
-                    duration_ms=duration,
-                    created_at=None,
-                    experiment_group=get_experiment_group(),
-                )
-            )
+            event_service.log(event_from_payload(data))
 
             logger.info(f"Event logged: article_id={article_id} type={event_type} duration_ms={duration}")
             return jsonify({"status": "ok"}), 201
 
-        except Exception:
+        except Exception as e:
+            if is_lock_timeout(e):
+                raise
             logger.exception("Unhandled error in /api/events")
             return jsonify({"status": "error", "message": "internal server error"}), 500
-        
+
+    @app.route("/api/events/batch", methods=["POST"])
+    def log_events_batch():
+        try:
+            data = request.get_json(silent=True)
+            items = data.get("events") if isinstance(data, dict) else data
+
+            if not isinstance(items, list) or not items:
+                errors = ["body must be a non-empty JSON array of events (or {\"events\": [...]})"]
+                return jsonify({"status": "error", "errors": errors}), 400
+            if len(items) > Config.EVENT_BATCH_MAX_ITEMS:
+                errors = [f"at most {Config.EVENT_BATCH_MAX_ITEMS} events per batch"]
+                return jsonify({"status": "error", "errors": errors}), 400
+
+            # all-or-nothing: one invalid event rejects the whole batch
+            item_errors = []
+            for i, item in enumerate(items):
+                errors = validate_event_payload(item) if isinstance(item, dict) else ["event must be a JSON object"]
+                if errors:
+                    item_errors.append({"index": i, "errors": errors})
+
+            if item_errors:
+                logger.warning(f"Bad /api/events/batch payload: {len(item_errors)} invalid of {len(items)}")
+                return jsonify({"status": "error", "errors": item_errors}), 400
+
+            event_service.log_many([event_from_payload(item) for item in items])
+
+            logger.info(f"Event batch logged: {len(items)} events")
+            return jsonify({"status": "ok", "logged": len(items)}), 201
+
+        except Exception as e:
+            if is_lock_timeout(e):
+                raise
+            logger.exception("Unhandled error in /api/events/batch")
+            return jsonify({"status": "error", "message": "internal server error"}), 500
+
     @app.route("/api/ab-summary")
     def ab_summary():
-            conn = sqlite3.connect(Config.DB_PATH)
-            conn.row_factory = sqlite3.Row
-            cur = conn.cursor()
-
-            cur.execute("""
-                SELECT
-                experiment_group,
-                COUNT(CASE WHEN event_type='view' THEN 1 END)  AS views,
-                COUNT(CASE WHEN event_type='like' THEN 1 END)  AS likes,
-                COALESCE(SUM(CASE WHEN event_type='time_spent' THEN duration_ms END),0) AS total_duration_ms
-                FROM interaction_events
-                WHERE experiment_group IN ('A','B')
-                GROUP BY experiment_group
-                ORDER BY experiment_group;
-            """)
-
-            rows = cur.fetchall()
-            conn.close()
+            rows = event_service.experiment_group_summary()
 
             results = []
             for r in rows:
@@ -403,23 +626,7 @@ def create_app():
     
     @app.route("/ab-dashboard")
     def ab_dashboard():
-        conn = sqlite3.connect(Config.DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-
-        cur.execute("""
-            SELECT
-              experiment_group,
-              COUNT(CASE WHEN event_type='view' THEN 1 END)  AS views,
-              COUNT(CASE WHEN event_type='like' THEN 1 END)  AS likes,
-              COALESCE(SUM(CASE WHEN event_type='time_spent' THEN duration_ms END),0) AS total_duration_ms
-            FROM interaction_events
-            WHERE experiment_group IN ('A','B')
-            GROUP BY experiment_group
-            ORDER BY experiment_group;
-        """)
-        rows = cur.fetchall()
-        conn.close()
+        rows = event_service.experiment_group_summary()
 
         summary = []
         for r in rows:
@@ -461,7 +668,7 @@ def create_app():
                 else:
                     winner_group = "A"
 
-        return render_template(
+        return render(
             "ab_dashboard.html",
             summary=summary,
             winner_group=winner_group,
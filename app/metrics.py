@@ -0,0 +1,214 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Seconds; the low end resolves sub-millisecond SQLite queries
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (route, experiment group) of the request being served on this thread; set
+# by the app for every request so code below the routes (repositories, the
+# database layer) can label what it records without knowing about Flask
+_request_labels: ContextVar[Tuple[str, str]] = ContextVar("request_labels", default=("", ""))
+
+
+def set_request_labels(route: str, group: str) -> None:
+    _request_labels.set((route, group))
+
+
+def request_labels() -> Tuple[str, str]:
+    return _request_labels.get()
+
+
+class _CounterChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _HistogramChild:
+    def __init__(self, bounds: Sequence[float]):
+        self._lock = threading.Lock()
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+
+class _Timer:
+    """Context manager observing the elapsed seconds of its block."""
+
+    __slots__ = ("child", "start")
+
+    def __init__(self, child: _HistogramChild):
+        self.child = child
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.start)
+        return False
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 registry: Optional["Registry"] = None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        # also keyed by the raw label values callers pass (ints, ...)
+        self._lookup: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def labels(self, *values, **kwargs):
+        """Child for one combination of label values (created on first use)."""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        # hot path: one dict lookup on the values as passed, no conversion
+        child = self._lookup.get(values)
+        if child is None:
+            key = tuple(str(v) for v in values)
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+                self._lookup[values] = child
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> List[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self._samples():
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+            lines.append(f"{self.name}{suffix}{{{label_text}}} {_format(value)}" if label_text
+                         else f"{self.name}{suffix} {_format(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self):
+        # counter names carry their _total suffix themselves
+        return [("", tuple(zip(self.labelnames, key)), child.value)
+                for key, child in sorted(self._children.items())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional["Registry"] = None):
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self) -> _Timer:
+        return self.labels().time()
+
+    def _samples(self):
+        samples = []
+        for key, child in sorted(self._children.items()):
+            labels = tuple(zip(self.labelnames, key))
+            with child._lock:
+                counts, total, count = list(child.counts), child.sum, child.count
+            cumulative = 0
+            for bound, n in zip(self.bounds + (float("inf"),), counts):
+                cumulative += n
+                samples.append(("_bucket", labels + (("le", _format(bound)),), cumulative))
+            samples.append(("_sum", labels, total))
+            samples.append(("_count", labels, count))
+        return samples
+
+
+class Registry:
+    """
+    In-process metrics with no client library: a child per label
+    combination, each behind its own lock, so recording is a bisect and
+    three additions. render() is only paid when /metrics is scraped.
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> None:
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+REGISTRY = Registry()
+
+# Every metric is per process: with several web workers, scrape each one
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests served",
+                        ["route", "method", "status", "group"])
+HTTP_SECONDS = Histogram("http_request_duration_seconds", "HTTP request latency",
+                         ["route", "method", "group"])
+DB_QUERY_SECONDS = Histogram("db_query_duration_seconds",
+                             "SQLite execute()/executemany() time (first result row for SELECTs)",
+                             ["route", "statement"])
+DB_FETCH_SECONDS = Histogram("db_fetch_duration_seconds", "SQLite fetchone/fetchmany/fetchall time",
+                             ["route", "statement"])
+RECOMMEND_SECONDS = Histogram("recommendation_duration_seconds", "Strategy recommend() latency",
+                              ["route", "strategy", "group"])
+TFIDF_SECONDS = Histogram("tfidf_build_duration_seconds", "TF-IDF index fit / re-weighting time",
+                          ["phase"])
+SIMILARITY_SECONDS = Histogram("similarity_duration_seconds", "Content similarity search time",
+                               ["retrieval"])
+TEMPLATE_SECONDS = Histogram("template_render_duration_seconds", "Jinja template rendering time",
+                             ["route", "template"])
@@ -1,17 +1,37 @@
-from typing import List, Optional
+from typing import Callable, Iterable, List, Optional
 from app.data.db import get_connection
 from app.models.article import Article
 
 class ArticleRepository:
 
+    def __init__(self):
+        # callbacks invoked with the new article id after every successful
+        # create() through this instance (per instance, so apps don't share them)
+        self._create_listeners: List[Callable[[int], None]] = []
+
+    def subscribe(self, listener: Callable[[int], None]) -> None:
+        self._create_listeners.append(listener)
+
     def count(self) -> int:
         conn = get_connection()
         cur = conn.cursor()
         cur.execute("SELECT COUNT(*) FROM articles")
         (n,) = cur.fetchone()
-        conn.close()
         return int(n)
 
+    def count_by_category(self) -> List[tuple]:
+        """(category name or None, number of articles), largest first."""
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT c.name, COUNT(*) AS n
+            FROM articles a
+            LEFT JOIN categories c ON c.id = a.category_id
+            GROUP BY a.category_id
+            ORDER BY n DESC, c.name
+        """)
+        return [(row[0], int(row[1])) for row in cur.fetchall()]
+
     def create(self, article: Article) -> int:
         conn = get_connection()
         cur = conn.cursor()
@@ -21,9 +41,23 @@ class ArticleRepository:
         )
         conn.commit()
         new_id = cur.lastrowid
-        conn.close()
+
+        for listener in self._create_listeners:
+            listener(int(new_id))
         return int(new_id)
 
+    def insert_many(self, cur, articles: Iterable[Article]) -> int:
+        """
+        Insert articles on the caller's cursor/transaction with one
+        executemany. Create listeners are not called: bulk loaders rebuild
+        derived data once at the end instead of per article.
+        """
+        cur.executemany(
+            "INSERT INTO articles(title, category_id, content) VALUES (?, ?, ?)",
+            [(a.title, a.category_id, a.content) for a in articles],
+        )
+        return cur.rowcount
+
     def list_all(self) -> List[Article]:
         conn = get_connection()
         cur = conn.cursor()
@@ -34,7 +68,6 @@ class ArticleRepository:
             ORDER BY a.id DESC
         """)
         rows = cur.fetchall()
-        conn.close()
         articles: List[Article] = []
         for (id_, title, category_id, content, category_name) in rows:
             articles.append(
@@ -58,7 +91,6 @@ class ArticleRepository:
             WHERE a.id = ?
         """, (article_id,))
         row = cur.fetchone()
-        conn.close()
         if not row:
             return None
         (id_, title, category_id, content, category_name) = row
@@ -69,3 +101,29 @@ class ArticleRepository:
             content=content,
             category_name=category_name,
         )
+
+    def get_many(self, article_ids: List[int]) -> List[Article]:
+        """Articles for the given ids, in the same order (missing ids skipped)."""
+        if not article_ids:
+            return []
+        conn = get_connection()
+        cur = conn.cursor()
+        placeholders = ", ".join("?" for _ in article_ids)
+        cur.execute(f"""
+            SELECT a.id, a.title, a.category_id, a.content, c.name
+            FROM articles a
+            LEFT JOIN categories c ON c.id = a.category_id
+            WHERE a.id IN ({placeholders})
+        """, list(article_ids))
+        rows = cur.fetchall()
+        by_id = {
+            id_: Article(
+                id=id_,
+                title=title,
+                category_id=category_id,
+                content=content,
+                category_name=category_name,
+            )
+            for (id_, title, category_id, content, category_name) in rows
+        }
+        return [by_id[i] for i in article_ids if i in by_id]
@@ -0,0 +1,190 @@
+from typing import Dict, List, Optional
+from app.data.db import get_connection
+
+# Same weights as PopularityStrategy: views + likes*3 + minutes*2 (minutes capped at 10)
+SCORE_SQL = "({views}) + ({likes}) * 3 + MIN(({time_ms}) / 60000.0, 10) * 2"
+
+UPSERT_SQL = """
+    INSERT INTO article_stats(article_id, views, likes, time_spent_ms, score)
+    VALUES (?, ?, ?, ?, {initial_score})
+    ON CONFLICT(article_id) DO UPDATE SET
+        views = views + excluded.views,
+        likes = likes + excluded.likes,
+        time_spent_ms = time_spent_ms + excluded.time_spent_ms,
+        score = {updated_score}
+""".format(
+    initial_score=SCORE_SQL.format(views="?2", likes="?3", time_ms="?4"),
+    updated_score=SCORE_SQL.format(
+        views="views + excluded.views",
+        likes="likes + excluded.likes",
+        time_ms="time_spent_ms + excluded.time_spent_ms",
+    ),
+)
+
+REBUILD_SQL = """
+    INSERT INTO article_stats(article_id, views, likes, time_spent_ms, score)
+    SELECT article_id, views, likes, time_spent_ms, {score}
+    FROM (
+        SELECT
+            article_id,
+            COUNT(CASE WHEN event_type='view' THEN 1 END) AS views,
+            COUNT(CASE WHEN event_type='like' THEN 1 END) AS likes,
+            COALESCE(SUM(CASE WHEN event_type='time_spent' THEN duration_ms END), 0) AS time_spent_ms
+        FROM interaction_events
+        GROUP BY article_id
+    )
+""".format(score=SCORE_SQL.format(views="views", likes="likes", time_ms="time_spent_ms"))
+
+# Joined to articles: events may name ids that have no (or no longer an) article row
+TOP_POPULAR_SQL = """
+    SELECT s.article_id FROM article_stats s
+    JOIN articles a ON a.id = s.article_id
+    WHERE s.score > 0 AND s.article_id != ?
+    ORDER BY s.score DESC, s.article_id DESC
+    LIMIT ?
+"""
+
+# Articles with their engagement and category name, one row per article
+ENGAGEMENT_SQL = """
+    SELECT
+        a.id, a.title, a.category_id, a.content, c.name AS category_name,
+        COALESCE(s.views, 0) AS views,
+        COALESCE(s.likes, 0) AS likes,
+        COALESCE(s.time_spent_ms, 0) AS time_spent_ms
+    FROM articles a
+    LEFT JOIN article_stats s ON s.article_id = a.id
+    LEFT JOIN categories c ON c.id = a.category_id
+"""
+
+ENGAGEMENT_SORT_COLUMNS = {
+    "newest": "a.id",
+    "views": "views",
+    "likes": "likes",
+    "time": "time_spent_ms",
+}
+
+
+def stats_delta(event_type: str, duration_ms: Optional[int]):
+    """(views, likes, time_spent_ms) increment for one event."""
+    if event_type == "view":
+        return (1, 0, 0)
+    if event_type == "like":
+        return (0, 1, 0)
+    if event_type == "time_spent":
+        return (0, 0, int(duration_ms or 0))
+    return (0, 0, 0)
+
+
+class ArticleStatsRepository:
+    """
+    Materialized per-article engagement counters (views, likes, time spent)
+    plus the popularity score derived from them.
+    """
+
+    def apply_many(self, cur, events) -> None:
+        """Add events to the counters on the caller's cursor/transaction, one upsert per article."""
+        deltas: Dict[int, List[int]] = {}
+        for event in events:
+            views, likes, time_ms = stats_delta(event.event_type, event.duration_ms)
+            if not (views or likes or time_ms):
+                continue
+            d = deltas.setdefault(event.article_id, [0, 0, 0])
+            d[0] += views
+            d[1] += likes
+            d[2] += time_ms
+        if deltas:
+            cur.executemany(UPSERT_SQL, [(article_id, *d) for article_id, d in deltas.items()])
+
+    def rebuild(self) -> int:
+        """Recompute all counters from interaction_events. Returns row count."""
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("DELETE FROM article_stats")
+        cur.execute(REBUILD_SQL)
+        conn.commit()
+        cur.execute("SELECT COUNT(*) FROM article_stats")
+        (n,) = cur.fetchone()
+        return int(n)
+
+    def backfill_if_empty(self) -> None:
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("SELECT EXISTS(SELECT 1 FROM article_stats)")
+        (has_stats,) = cur.fetchone()
+        cur.execute("SELECT EXISTS(SELECT 1 FROM interaction_events)")
+        (has_events,) = cur.fetchone()
+        if has_events and not has_stats:
+            self.rebuild()
+
+    def get(self, article_id: int) -> Dict[str, int]:
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT views, likes, time_spent_ms FROM article_stats WHERE article_id = ?",
+            (article_id,)
+        )
+        row = cur.fetchone()
+        if not row:
+            return {"views": 0, "likes": 0, "time_spent_ms": 0}
+        return {"views": row["views"], "likes": row["likes"], "time_spent_ms": row["time_spent_ms"]}
+
+    def top_article_ids(self, limit: int, exclude_article_id: Optional[int] = None) -> List[int]:
+        """
+        Article ids by popularity score (desc), ties by newest id. Articles
+        without engagement score 0 and fill the tail in id order.
+        """
+        exclude = -1 if exclude_article_id is None else exclude_article_id
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute(TOP_POPULAR_SQL, (exclude, limit))
+        ids = [row[0] for row in cur.fetchall()]
+
+        if len(ids) < limit:
+            # every positively scored article is already in `ids`
+            cur.execute(
+                """
+                SELECT a.id FROM articles a
+                LEFT JOIN article_stats s ON s.article_id = a.id
+                WHERE a.id != ? AND COALESCE(s.score, 0) <= 0
+                ORDER BY a.id DESC
+                LIMIT ?
+                """,
+                (exclude, limit - len(ids))
+            )
+            ids.extend(row[0] for row in cur.fetchall())
+        return ids
+
+    def top_stats(self, limit: int):
+        """(article_id, views, likes, time_spent_ms) of the `limit` best scored articles."""
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT s.article_id, s.views, s.likes, s.time_spent_ms FROM article_stats s
+            JOIN articles a ON a.id = s.article_id
+            WHERE s.score > 0
+            ORDER BY s.score DESC, s.article_id DESC
+            LIMIT ?
+            """,
+            (limit,)
+        )
+        return [tuple(row) for row in cur.fetchall()]
+
+    def engagement_page(self, sort: str = "newest", descending: bool = True,
+                        limit: int = 50, offset: int = 0):
+        """One page of ENGAGEMENT_SQL rows; `sort` is a key of ENGAGEMENT_SORT_COLUMNS."""
+        column = ENGAGEMENT_SORT_COLUMNS[sort]
+        direction = "DESC" if descending else "ASC"
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute(
+            ENGAGEMENT_SQL + f" ORDER BY {column} {direction}, a.id DESC LIMIT ? OFFSET ?",
+            (limit, offset)
+        )
+        return cur.fetchall()
+
+    def engagement_for(self, article_id: int):
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute(ENGAGEMENT_SQL + " WHERE a.id = ?", (article_id,))
+        return cur.fetchone()
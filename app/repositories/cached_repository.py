@@ -0,0 +1,124 @@
+import threading
+import time
+from typing import Dict, List, Optional
+
+from app.cache import LRUCache
+from app.models.article import Article
+from app.repositories.article_repository import ArticleRepository
+from app.repositories.category_repository import CategoryRepository
+
+
+class CachedArticleRepository:
+    """
+    Read-through cache in front of ArticleRepository.
+
+    Entries are bounded (LRU) and expire after `ttl` seconds, which also
+    bounds staleness for rows written by other processes. Any create() in
+    through this repository invalidates the list/count entries immediately.
+    """
+
+    def __init__(self, repo: Optional[ArticleRepository] = None,
+                 maxsize: int = 5000, ttl: Optional[float] = 300):
+        self.repo = repo or ArticleRepository()
+        self.cache = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.repo.subscribe(self._on_article_created)
+
+    def subscribe(self, listener) -> None:
+        """Call listener(article_id) after every create() through this repository."""
+        self.repo.subscribe(listener)
+
+    def _on_article_created(self, article_id: int) -> None:
+        self.cache.invalidate("count")
+        self.cache.invalidate("all")
+        self.cache.invalidate(("id", article_id))
+
+    def count(self) -> int:
+        return self.cache.get_or_load("count", self.repo.count)
+
+    def create(self, article: Article) -> int:
+        return self.repo.create(article)
+
+    def list_all(self) -> List[Article]:
+        return self.cache.get_or_load("all", self.repo.list_all)
+
+    def get_by_id(self, article_id: int) -> Optional[Article]:
+        return self.cache.get_or_load(("id", article_id), lambda: self.repo.get_by_id(article_id))
+
+    def get_many(self, article_ids: List[int]) -> List[Article]:
+        found: Dict[int, Article] = {}
+        missing = []
+        for article_id in article_ids:
+            article = self.cache.get(("id", article_id))
+            if article is None:
+                missing.append(article_id)
+            else:
+                found[article_id] = article
+
+        # one query for everything that was not cached
+        for article in self.repo.get_many(missing):
+            self.cache.set(("id", article.id), article)
+            found[article.id] = article
+        return [found[i] for i in article_ids if i in found]
+
+    def stats(self):
+        return self.cache.stats()
+
+
+class CategoryNameCache:
+    """
+    In-memory id -> name map of all categories.
+
+    Loaded with one query and reloaded when a category is created through
+    its repository or the map is older than `ttl` seconds.
+    """
+
+    def __init__(self, repo: Optional[CategoryRepository] = None, ttl: Optional[float] = 300):
+        self.repo = repo or CategoryRepository()
+        self.ttl = ttl
+        self._names: Optional[Dict[int, str]] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.repo.subscribe(self._on_category_created)
+
+    def _on_category_created(self, category_id: int, name: str) -> None:
+        with self._lock:
+            if self._names is not None:
+                self._names = {**self._names, category_id: name}
+
+    def _names_map(self) -> Dict[int, str]:
+        names = self._names
+        expired = self.ttl is not None and time.monotonic() - self._loaded_at > self.ttl
+        if names is None or expired:
+            with self._lock:
+                names = {c.id: c.name for c in self.repo.list_all()}
+                self._names = names
+                self._loaded_at = time.monotonic()
+                self.reloads += 1
+        return names
+
+    def name_for(self, category_id: Optional[int]) -> Optional[str]:
+        if not category_id:
+            return None
+        name = self._names_map().get(category_id)
+        if name is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return name
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._names = None
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._names or {}),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
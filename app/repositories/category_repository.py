@@ -1,9 +1,17 @@
 from app.data.db import get_connection
 from app.models.category import Category
-from typing import List
+from typing import Callable, Dict, Iterable, List
 
 class CategoryRepository:
 
+    def __init__(self):
+        # callbacks invoked with (id, name) when create_or_get_id on this
+        # instance inserts a new category
+        self._create_listeners: List[Callable[[int, str], None]] = []
+
+    def subscribe(self, listener: Callable[[int, str], None]) -> None:
+        self._create_listeners.append(listener)
+
     def create_or_get_id(self, name: str) -> int:
         """
         Krijon një kategori nëse nuk ekziston, ose kthen ID-në e saj ekzistuese.
@@ -14,12 +22,35 @@ class CategoryRepository:
         # Insert only if not exists
         cur.execute("INSERT OR IGNORE INTO categories(name) VALUES (?)", (name,))
         conn.commit()
+        created = cur.rowcount == 1
 
         # Get ID
         cur.execute("SELECT id FROM categories WHERE name = ?", (name,))
         row = cur.fetchone()
-        conn.close()
-        return int(row["id"])
+        category_id = int(row["id"])
+
+        if created:
+            for listener in self._create_listeners:
+                listener(category_id, name)
+        return category_id
+
+    def ids_by_name(self) -> Dict[str, int]:
+        conn = get_connection()
+        rows = conn.execute("SELECT id, name FROM categories").fetchall()
+        return {r["name"]: int(r["id"]) for r in rows}
+
+    def insert_missing(self, cur, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Insert the categories that do not exist yet on the caller's
+        cursor/transaction and return {name: id} for all of `names`.
+        """
+        names = sorted(set(names))
+        if not names:
+            return {}
+        cur.executemany("INSERT OR IGNORE INTO categories(name) VALUES (?)", [(n,) for n in names])
+        placeholders = ", ".join("?" for _ in names)
+        cur.execute(f"SELECT id, name FROM categories WHERE name IN ({placeholders})", names)
+        return {row[1]: int(row[0]) for row in cur.fetchall()}
 
     def list_all(self) -> List[Category]:
         """
@@ -29,18 +60,16 @@ class CategoryRepository:
         cur = conn.cursor()
         cur.execute("SELECT id, name FROM categories ORDER BY name")
         rows = cur.fetchall()
-        conn.close()
         return [Category(id=r["id"], name=r["name"]) for r in rows]
     
     def get_by_id(self, category_id: int):
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT id, name FROM categories WHERE id = ?",
-                (category_id,)
-            ).fetchone()
+        conn = get_connection()
+        row = conn.execute(
+            "SELECT id, name FROM categories WHERE id = ?",
+            (category_id,)
+        ).fetchone()
 
         if not row:
             return None
 
         return Category(id=row[0], name=row[1])
-
@@ -0,0 +1,120 @@
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from app.data.db import get_connection
+from app.repositories.article_stats_repository import stats_delta
+
+UPSERT_BUCKET_SQL = """
+    INSERT INTO article_event_buckets(bucket_hour, article_id, views, likes, time_spent_ms)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(bucket_hour, article_id) DO UPDATE SET
+        views = views + excluded.views,
+        likes = likes + excluded.likes,
+        time_spent_ms = time_spent_ms + excluded.time_spent_ms
+"""
+
+ACTIVE_BUCKETS_SQL = """
+    SELECT bucket_hour, article_id, views, likes, time_spent_ms
+    FROM article_event_buckets
+    WHERE bucket_hour >= ?
+"""
+
+REBUILD_BUCKETS_SQL = """
+    INSERT INTO article_event_buckets(bucket_hour, article_id, views, likes, time_spent_ms)
+    SELECT
+        CAST(strftime('%s', created_at) AS INTEGER) / 3600 AS bucket_hour,
+        article_id,
+        COUNT(CASE WHEN event_type='view' THEN 1 END),
+        COUNT(CASE WHEN event_type='like' THEN 1 END),
+        COALESCE(SUM(CASE WHEN event_type='time_spent' THEN duration_ms END), 0)
+    FROM interaction_events
+    WHERE created_at IS NOT NULL AND CAST(strftime('%s', created_at) AS INTEGER) / 3600 >= ?
+    GROUP BY bucket_hour, article_id
+"""
+
+
+def current_hour(now: Optional[float] = None) -> int:
+    """Hours since the Unix epoch (UTC)."""
+    return int((time.time() if now is None else now) // 3600)
+
+
+def bucket_hour(created_at: Optional[str]) -> int:
+    """Hour bucket of an event; events without a timestamp count as now."""
+    if not created_at:
+        return current_hour()
+    # interaction_events.created_at is SQLite datetime('now'): UTC, "YYYY-MM-DD HH:MM:SS";
+    # a value carrying an offset is converted, not relabelled
+    moment = datetime.fromisoformat(created_at)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    else:
+        moment = moment.astimezone(timezone.utc)
+    return current_hour(moment.timestamp())
+
+
+class EventBucketRepository:
+    """
+    Hourly engagement counters per article (views, likes, time spent).
+
+    Buckets older than `window_hours` are deleted the first time a batch is
+    written in a new hour, so the table only ever holds the active window.
+    """
+
+    def __init__(self, window_hours: int = 72):
+        self.window_hours = window_hours
+        self._rolled_at: Optional[int] = None
+
+    def apply_many(self, cur, events) -> None:
+        """Add events to their hour buckets on the caller's cursor/transaction."""
+        deltas: Dict[Tuple[int, int], List[int]] = {}
+        for event in events:
+            views, likes, time_ms = stats_delta(event.event_type, event.duration_ms)
+            if not (views or likes or time_ms):
+                continue
+            key = (bucket_hour(getattr(event, "created_at", None)), event.article_id)
+            d = deltas.setdefault(key, [0, 0, 0])
+            d[0] += views
+            d[1] += likes
+            d[2] += time_ms
+        if deltas:
+            cur.executemany(UPSERT_BUCKET_SQL, [(*key, *d) for key, d in deltas.items()])
+
+        hour = current_hour()
+        if self._rolled_at != hour:
+            self.roll_off(cur, hour)
+
+    def roll_off(self, cur, hour: int) -> None:
+        cur.execute("DELETE FROM article_event_buckets WHERE bucket_hour < ?",
+                    (hour - self.window_hours,))
+        self._rolled_at = hour
+
+    def active(self, since_hour: int) -> List[Tuple[int, int, int, int, int]]:
+        """(bucket_hour, article_id, views, likes, time_spent_ms) for buckets since since_hour."""
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute(ACTIVE_BUCKETS_SQL, (since_hour,))
+        return [tuple(row) for row in cur.fetchall()]
+
+    def backfill_if_empty(self) -> None:
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("SELECT EXISTS(SELECT 1 FROM article_event_buckets)")
+        (has_buckets,) = cur.fetchone()
+        cur.execute("SELECT EXISTS(SELECT 1 FROM interaction_events)")
+        (has_events,) = cur.fetchone()
+        if has_events and not has_buckets:
+            self.rebuild()
+
+    def rebuild(self) -> int:
+        """Recompute the buckets of the active window from interaction_events. Returns row count."""
+        conn = get_connection()
+        hour = current_hour()
+        with conn:
+            cur = conn.cursor()
+            cur.execute("DELETE FROM article_event_buckets")
+            cur.execute(REBUILD_BUCKETS_SQL, (hour - self.window_hours,))
+            self._rolled_at = hour
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM article_event_buckets")
+        (n,) = cur.fetchone()
+        return int(n)
@@ -0,0 +1,81 @@
+from typing import Dict, List
+from app.data.db import get_connection
+from app.repositories.article_stats_repository import stats_delta
+
+GROUPS = ("A", "B")
+
+# A/B totals straight from interaction_events (covered by idx_events_group_type)
+EXPERIMENT_GROUP_SUMMARY_SQL = """
+    SELECT
+      experiment_group,
+      COUNT(CASE WHEN event_type='view' THEN 1 END)  AS views,
+      COUNT(CASE WHEN event_type='like' THEN 1 END)  AS likes,
+      COALESCE(SUM(CASE WHEN event_type='time_spent' THEN duration_ms END),0) AS total_duration_ms
+    FROM interaction_events
+    WHERE experiment_group IN ('A','B')
+    GROUP BY experiment_group
+    ORDER BY experiment_group
+"""
+
+UPSERT_GROUP_SQL = """
+    INSERT INTO experiment_group_stats(experiment_group, views, likes, time_spent_ms)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(experiment_group) DO UPDATE SET
+        views = views + excluded.views,
+        likes = likes + excluded.likes,
+        time_spent_ms = time_spent_ms + excluded.time_spent_ms
+"""
+
+
+class ExperimentGroupStatsRepository:
+    """Materialized A/B totals (views, likes, time spent) per experiment group."""
+
+    def apply_many(self, cur, events) -> None:
+        """Add events to their group's totals on the caller's cursor/transaction."""
+        deltas: Dict[str, List[int]] = {}
+        for event in events:
+            group = getattr(event, "experiment_group", None)
+            if group not in GROUPS:
+                continue
+            views, likes, time_ms = stats_delta(event.event_type, event.duration_ms)
+            d = deltas.setdefault(group, [0, 0, 0])
+            d[0] += views
+            d[1] += likes
+            d[2] += time_ms
+        if deltas:
+            cur.executemany(UPSERT_GROUP_SQL, [(group, *d) for group, d in deltas.items()])
+
+    def summary(self):
+        """Rows of (experiment_group, views, likes, total_duration_ms), A then B."""
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT experiment_group, views, likes, time_spent_ms AS total_duration_ms
+            FROM experiment_group_stats
+            WHERE experiment_group IN ('A','B')
+            ORDER BY experiment_group
+        """)
+        return cur.fetchall()
+
+    def rebuild(self) -> int:
+        """Recompute the totals from interaction_events. Returns row count."""
+        conn = get_connection()
+        with conn:
+            cur = conn.cursor()
+            cur.execute("DELETE FROM experiment_group_stats")
+            cur.execute(
+                "INSERT INTO experiment_group_stats(experiment_group, views, likes, time_spent_ms) "
+                f"SELECT * FROM ({EXPERIMENT_GROUP_SUMMARY_SQL})"
+            )
+        (n,) = conn.execute("SELECT COUNT(*) FROM experiment_group_stats").fetchone()
+        return int(n)
+
+    def backfill_if_empty(self) -> None:
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("SELECT EXISTS(SELECT 1 FROM experiment_group_stats)")
+        (has_stats,) = cur.fetchone()
+        cur.execute("SELECT EXISTS(SELECT 1 FROM interaction_events WHERE experiment_group IN ('A','B'))")
+        (has_events,) = cur.fetchone()
+        if has_events and not has_stats:
+            self.rebuild()
@@ -0,0 +1,28 @@
+from app.data.db import get_connection
+
+
+class ImportProgressRepository:
+    """Resume points of import_articles.py, one row per source file."""
+
+    def position(self, source: str) -> int:
+        conn = get_connection()
+        row = conn.execute("SELECT position FROM import_progress WHERE source = ?", (source,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def save(self, cur, source: str, position: int, imported: int) -> None:
+        """Record progress on the caller's cursor, in the same transaction as the chunk."""
+        cur.execute(
+            """
+            INSERT INTO import_progress(source, position, imported) VALUES (?, ?, ?)
+            ON CONFLICT(source) DO UPDATE SET
+                position = excluded.position,
+                imported = import_progress.imported + excluded.imported,
+                updated_at = datetime('now')
+            """,
+            (source, position, imported),
+        )
+
+    def reset(self, source: str) -> None:
+        conn = get_connection()
+        with conn:
+            conn.execute("DELETE FROM import_progress WHERE source = ?", (source,))
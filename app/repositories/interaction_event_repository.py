@@ -12,7 +12,6 @@ class InteractionEventRepository:
         """, (event.user_id, event.article_id, event.event_type, event.duration_ms))
         conn.commit()
         new_id = cur.lastrowid
-        conn.close()
         return new_id
 
     def count_events(self, article_id: int, event_type: str) -> int:
@@ -23,5 +22,4 @@ class InteractionEventRepository:
             WHERE article_id = ? AND event_type = ?
         """, (article_id, event_type))
         (n,) = cur.fetchone()
-        conn.close()
         return n
@@ -0,0 +1,59 @@
+from typing import Dict, List, Sequence, Tuple
+from app.data.db import get_connection
+
+# SQLite limits bound parameters per statement (999 on older builds)
+MAX_IDS_PER_QUERY = 900
+
+# rank 0 row of an article that was extracted but has no keywords, so it is not extracted again
+NO_KEYWORDS_RANK = 0
+
+
+class KeywordRepository:
+    """Top TF-IDF keywords per article, precomputed by KeywordExtractor."""
+
+    def for_articles(self, article_ids: Sequence[int], top_n: int = 3) -> Dict[int, List[Tuple[str, float]]]:
+        """{article_id: [(keyword, weight), ...] in rank order} for the ids extracted so far ([] if none)."""
+        result: Dict[int, List[Tuple[str, float]]] = {}
+        ids = list(dict.fromkeys(article_ids))
+        conn = get_connection()
+        cur = conn.cursor()
+        for start in range(0, len(ids), MAX_IDS_PER_QUERY):
+            chunk = ids[start:start + MAX_IDS_PER_QUERY]
+            placeholders = ",".join("?" * len(chunk))
+            cur.execute(
+                f"""
+                SELECT article_id, rank, keyword, weight FROM article_keywords
+                WHERE article_id IN ({placeholders}) AND rank <= ?
+                ORDER BY article_id, rank
+                """,
+                (*chunk, top_n)
+            )
+            for row in cur.fetchall():
+                keywords = result.setdefault(row["article_id"], [])
+                if row["rank"] != NO_KEYWORDS_RANK:
+                    keywords.append((row["keyword"], row["weight"]))
+        return result
+
+    def replace_many(self, results: Sequence[Tuple[int, List[Tuple[str, float]]]]) -> None:
+        """
+        Store keyword lists, one transaction for the whole batch.
+        results: (article_id, [(keyword, weight), ...] in rank order); an
+        empty list is stored as a NO_KEYWORDS_RANK marker row
+        """
+        rows = []
+        for article_id, keywords in results:
+            rows.extend((article_id, rank, keyword, weight)
+                        for rank, (keyword, weight) in enumerate(keywords, start=1))
+            if not keywords:
+                rows.append((article_id, NO_KEYWORDS_RANK, "", 0.0))
+        conn = get_connection()
+        with conn:
+            cur = conn.cursor()
+            cur.executemany(
+                "DELETE FROM article_keywords WHERE article_id = ?",
+                [(article_id,) for article_id, _ in results]
+            )
+            cur.executemany(
+                "INSERT INTO article_keywords(article_id, rank, keyword, weight) VALUES (?, ?, ?, ?)",
+                rows
+            )
@@ -0,0 +1,55 @@
+from typing import Dict, List, Sequence, Tuple
+from app.data.db import get_connection
+
+NEIGHBORS_SQL = """
+    SELECT neighbor_id FROM related_articles
+    WHERE article_id = ?
+    ORDER BY rank
+    LIMIT ?
+"""
+
+
+class RelatedArticlesRepository:
+    """Content neighbours precomputed offline by precompute_related.py."""
+
+    def neighbor_ids(self, article_id: int, limit: int) -> List[int]:
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute(NEIGHBORS_SQL, (article_id, limit))
+        return [row[0] for row in cur.fetchall()]
+
+    def content_hashes(self) -> Dict[int, str]:
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("SELECT article_id, content_hash FROM related_articles_state")
+        return {row[0]: row[1] for row in cur.fetchall()}
+
+    def replace_many(self, results: Sequence[Tuple[int, str, List[Tuple[int, float]]]]) -> None:
+        """
+        Store neighbour lists, one transaction for the whole block.
+        results: (article_id, content_hash, [(neighbor_id, score), ...] in rank order)
+        """
+        conn = get_connection()
+        with conn:
+            cur = conn.cursor()
+            cur.executemany(
+                "DELETE FROM related_articles WHERE article_id = ?",
+                [(article_id,) for article_id, _, _ in results]
+            )
+            cur.executemany(
+                "INSERT INTO related_articles(article_id, rank, neighbor_id, score) VALUES (?, ?, ?, ?)",
+                [
+                    (article_id, rank, neighbor_id, score)
+                    for article_id, _, neighbors in results
+                    for rank, (neighbor_id, score) in enumerate(neighbors, start=1)
+                ]
+            )
+            cur.executemany(
+                """
+                INSERT INTO related_articles_state(article_id, content_hash) VALUES (?, ?)
+                ON CONFLICT(article_id) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    computed_at = datetime('now')
+                """,
+                [(article_id, content_hash) for article_id, content_hash, _ in results]
+            )
@@ -12,7 +12,6 @@ class UserRepository:
         )
         conn.commit()
         new_id = cur.lastrowid
-        conn.close()
         return int(new_id)
 
     def get_by_id(self, user_id: int) -> Optional[User]:
@@ -20,7 +19,6 @@ class UserRepository:
         cur = conn.cursor()
         cur.execute("SELECT id, name FROM users WHERE id = ?", (user_id,))
         row = cur.fetchone()
-        conn.close()
         if not row:
             return None
         return User(id=row["id"], name=row["name"])
@@ -30,7 +28,6 @@ class UserRepository:
         cur = conn.cursor()
         cur.execute("SELECT id, name FROM users WHERE name = ?", (name,))
         row = cur.fetchone()
-        conn.close()
         if not row:
             return None
         return User(id=row["id"], name=row["name"])
@@ -40,5 +37,4 @@ class UserRepository:
         cur = conn.cursor()
         cur.execute("SELECT id, name FROM users ORDER BY id DESC")
         rows = cur.fetchall()
-        conn.close()
         return [User(id=r["id"], name=r["name"]) for r in rows]
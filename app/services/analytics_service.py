@@ -0,0 +1,94 @@
+from math import ceil
+
+from app.models.article import Article
+from app.repositories.article_repository import ArticleRepository
+from app.repositories.article_stats_repository import ArticleStatsRepository, ENGAGEMENT_SORT_COLUMNS
+from app.repositories.keyword_repository import KeywordRepository
+from app.services.keyword_extractor import KeywordExtractor
+
+
+class AnalyticsService:
+    """
+    Engagement analytics for the /analytics dashboard and /api/analytics.
+
+    Counters come from article_stats in one joined query per page, and
+    keywords from article_keywords in one query for the rows of that page.
+    Articles without stored keywords are extracted from the ContentIndex
+    and written back, so each one is computed at most once.
+    """
+
+    SORTS = tuple(ENGAGEMENT_SORT_COLUMNS)
+    MAX_PER_PAGE = 200
+
+    KEYWORDS_SHOWN = 3
+
+    def __init__(self, content_index, stats_repo=None, article_repo=None,
+                 keyword_repo=None, keyword_extractor=None):
+        self.content_index = content_index
+        self.stats_repo = stats_repo or ArticleStatsRepository()
+        self.article_repo = article_repo or ArticleRepository()
+        self.keyword_repo = keyword_repo or KeywordRepository()
+        self.keyword_extractor = keyword_extractor or KeywordExtractor(content_index, repo=self.keyword_repo)
+
+    def page(self, page: int = 1, per_page: int = 50, sort: str = "newest", order: str = "desc"):
+        sort = sort if sort in self.SORTS else "newest"
+        descending = order != "asc"
+        per_page = max(1, min(per_page, self.MAX_PER_PAGE))
+
+        category_counts = self.article_repo.count_by_category()
+        total = sum(n for _, n in category_counts)
+        pages = max(1, ceil(total / per_page))
+        page = max(1, min(page, pages))
+
+        rows = self.stats_repo.engagement_page(
+            sort=sort, descending=descending, limit=per_page, offset=(page - 1) * per_page
+        )
+        return {
+            "rows": self._build_rows(rows),
+            "page": page,
+            "pages": pages,
+            "per_page": per_page,
+            "total": total,
+            "sort": sort,
+            "order": "desc" if descending else "asc",
+            "category_counts": [(name or "Unknown", n) for name, n in category_counts],
+        }
+
+    def article(self, article_id: int):
+        """Engagement row of one article; None if there is no such article."""
+        row = self.stats_repo.engagement_for(article_id)
+        if row is None:
+            return None
+        return self._build_rows([row])[0]
+
+    def _build_rows(self, rows):
+        keywords = self._keywords([row["id"] for row in rows])
+        result = []
+        for row in rows:
+            total_ms = row["time_spent_ms"]
+            result.append({
+                "article": Article(
+                    id=row["id"],
+                    title=row["title"],
+                    category_id=row["category_id"],
+                    content=row["content"],
+                    category_name=row["category_name"],
+                ),
+                "category": row["category_name"] or "Unknown",
+                "views": row["views"],
+                "likes": row["likes"],
+                "time_spent_seconds": round(total_ms / 1000, 2),
+                "time_spent_minutes": round(total_ms / 60000, 2),
+                "top_keywords": ", ".join(keywords.get(row["id"], [])) or "-",
+            })
+        return result
+
+    def _keywords(self, article_ids):
+        stored = self.keyword_repo.for_articles(article_ids, top_n=self.KEYWORDS_SHOWN)
+        missing = [i for i in article_ids if i not in stored]
+        if missing:
+            stored.update(self.keyword_extractor.extract(missing))
+        return {
+            article_id: [keyword for keyword, _ in pairs[:self.KEYWORDS_SHOWN]]
+            for article_id, pairs in stored.items()
+        }
@@ -1,12 +1,19 @@
+from app.config.config import Config
 from app.models.article import Article
-from app.repositories.article_repository import ArticleRepository
+from app.repositories.cached_repository import CachedArticleRepository
 
 class ArticleService:
-    def __init__(self):
-        self.repo = ArticleRepository()
+    def __init__(self, repo=None):
+        self.repo = repo or CachedArticleRepository(
+            maxsize=Config.ARTICLE_CACHE_SIZE,
+            ttl=Config.CACHE_TTL_SECONDS,
+        )
 
     def list_articles(self):
         return self.repo.list_all()
 
     def get_article(self, article_id: int):
         return self.repo.get_by_id(article_id)
+
+    def get_articles(self, article_ids):
+        return self.repo.get_many(article_ids)
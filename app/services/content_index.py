@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.metrics import SIMILARITY_SECONDS, TFIDF_SECONDS
+from app.models.article import Article
+from app.services.incremental_tfidf import IncrementalTfidf
+from app.services.inverted_index import SCORE_DECIMALS, InvertedIndex
+
+
+def build_text(a) -> str:
+    # text = title + content + category_name
+    title = (getattr(a, "title", "") or "").strip()
+    content = (getattr(a, "content", "") or "").strip()
+    category = (getattr(a, "category_name", "") or "").strip()
+    return f"{title} {content} {category}".strip()
+
+
+class ContentIndex:
+    """
+    Long-lived TF-IDF index over all articles.
+
+    Vocabulary and document frequencies live in an IncrementalTfidf, so an
+    article created afterwards is tokenized once, updates df and is appended
+    as a row weighted with the current IDF; nothing is refitted. Older rows
+    keep the IDF they were weighted with until the appended rows exceed
+    `refit_ratio` of the corpus, when every row is re-weighted from stored
+    term counts (renormalize()); refit listeners are then told so anything
+    derived from the old weights can be refreshed.
+    """
+
+    def __init__(self, article_service, refit_ratio: float = 0.1, retrieval: str = "inverted"):
+        self.article_service = article_service
+        self.refit_ratio = refit_ratio
+        # "inverted": pruned top-k over postings; "brute": score every article
+        self.retrieval = retrieval
+
+        self._lock = threading.RLock()
+        self._built = False
+        self._appended = 0
+
+        self.tfidf: Optional[IncrementalTfidf] = None
+        self.matrix = None
+        self.terms: List[str] = []
+        self.articles: List[Article] = []
+        self.id_to_row: Dict[int, int] = {}
+        self._ids = np.empty(0, dtype=np.int64)
+        self._category_ids = np.empty(0, dtype=np.int64)
+        self._rows: Optional[_GrowableRows] = None  # buffers behind matrix / _ids / _category_ids
+        self._refits = 0  # bumped whenever existing rows are re-weighted
+        self._inverted = (None, 0, None)  # (matrix it indexes, its refit count, InvertedIndex)
+        self._refit_listeners = []
+
+    def subscribe_refit(self, listener) -> None:
+        """Call listener() after every row is re-weighted with fresh document frequencies."""
+        self._refit_listeners.append(listener)
+
+    # Building / updating
+
+    def build(self) -> None:
+        articles = list(self.article_service.list_articles())
+        with self._lock:
+            self._fit(articles)
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def ensure_built(self) -> None:
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self._fit(list(self.article_service.list_articles()))
+
+    def _fit(self, articles: List[Article]) -> None:
+        self.articles = articles
+        self.id_to_row = {a.id: i for i, a in enumerate(articles)}
+
+        with TFIDF_SECONDS.labels("fit").time():
+            self.tfidf = IncrementalTfidf()
+            self.tfidf.add_many([build_text(a) for a in articles])
+            self._set_rows(_GrowableRows(
+                self.tfidf.matrix(),
+                np.array([a.id for a in articles], dtype=np.int64),
+                np.array([_category_key(a) for a in articles], dtype=np.int64),
+            ))
+        self.terms = self.tfidf.terms
+
+        self._appended = 0
+        self._refits += 1
+        self._built = True
+
+    def renormalize(self) -> None:
+        """Re-weight every row with the current IDF (no tokenizing) and notify refit listeners."""
+        with self._lock:
+            if not self._built:
+                return
+            with TFIDF_SECONDS.labels("renormalize").time():
+                self._set_rows(_GrowableRows(self.tfidf.matrix(), self._ids, self._category_ids))
+            self._appended = 0
+            self._refits += 1
+        for listener in self._refit_listeners:
+            listener()
+
+    def add_article(self, article: Article) -> None:
+        with self._lock:
+            if not self._built or article.id in self.id_to_row:
+                return
+
+            # O(article): the list and the row buffers grow in place; snapshots
+            # handed out earlier only see their own rows
+            self._rows.append(self.tfidf.add(build_text(article)), article.id, _category_key(article))
+            self._set_rows(self._rows)
+            self.articles.append(article)
+            self.id_to_row[article.id] = len(self.articles) - 1
+            self._appended += 1
+            stale = self._appended > self.refit_ratio * len(self.articles)
+
+        if stale:
+            self.renormalize()
+
+    def _set_rows(self, rows: "_GrowableRows") -> None:
+        self._rows = rows
+        self.matrix, self._ids, self._category_ids = rows.view()
+
+    def on_article_created(self, article_id: int) -> None:
+        """ArticleRepository listener: index a freshly inserted article."""
+        if not self._built:
+            return
+        article = self.article_service.get_article(article_id)
+        if article:
+            self.add_article(article)
+
+    # Querying
+
+    def row_for(self, article_id: int) -> Optional[int]:
+        self.ensure_built()
+        row = self.id_to_row.get(article_id)
+        if row is None:
+            # may have been created by another process since we were built
+            article = self.article_service.get_article(article_id)
+            if not article:
+                return None
+            self.add_article(article)
+            row = self.id_to_row.get(article_id)
+        return row
+
+    def keywords(self, article_ids: List[int], top_n: int = 3) -> Dict[int, List[str]]:
+        """Top TF-IDF terms of each article, computed for all ids in one pass."""
+        return {
+            article_id: [term for term, _ in pairs]
+            for article_id, pairs in self.keyword_weights(article_ids, top_n).items()
+        }
+
+    def keyword_weights(self, article_ids: List[int], top_n: int = 3) -> Dict[int, List[Tuple[str, float]]]:
+        """Like keywords(), with the TF-IDF weight of every term."""
+        rows = {}
+        for article_id in article_ids:
+            row = self.row_for(article_id)
+            if row is not None:
+                rows[article_id] = row
+
+        with self._lock:
+            matrix, terms = self.matrix, self.terms
+        if matrix is None or not rows:
+            return {article_id: [] for article_id in rows}
+
+        top = top_terms(matrix[list(rows.values())], top_n, with_weights=True)
+        return {
+            article_id: [(str(terms[t]), weight) for t, weight in term_rows]
+            for article_id, term_rows in zip(rows, top)
+        }
+
+    def _snapshot(self):
+        with self._lock:
+            return self.matrix, self.articles, self._ids, self._category_ids
+
+    def inverted_index(self) -> Optional[InvertedIndex]:
+        return self._search_snapshot()[4]
+
+    def _search_snapshot(self):
+        """_snapshot() plus an InvertedIndex over exactly that matrix."""
+        with self._lock:
+            matrix, articles, ids, category_ids = self.matrix, self.articles, self._ids, self._category_ids
+            refits = self._refits
+            built_from, built_refits, inverted = self._inverted
+        if matrix is None or built_from is matrix:
+            return matrix, articles, ids, category_ids, inverted
+
+        # built outside the lock so article inserts are not held up
+        if inverted is not None and built_refits == refits and built_from.shape[0] <= matrix.shape[0]:
+            # only rows were appended since: index them as the postings' tail
+            with TFIDF_SECONDS.labels("postings_append").time():
+                inverted = inverted.extended(matrix, ids, category_ids)
+        else:
+            with TFIDF_SECONDS.labels("postings").time():
+                inverted = InvertedIndex(matrix, ids, category_ids)
+        with self._lock:
+            # keep the newer index if another thread got there first
+            if self.matrix is matrix:
+                self._inverted = (matrix, refits, inverted)
+        return matrix, articles, ids, category_ids, inverted
+
+    def similar(self, article_id: int, limit: int = 5) -> List[Article]:
+        row = self.row_for(article_id)
+        if row is None:
+            return []
+
+        if self.retrieval == "inverted":
+            matrix, articles, ids, category_ids, inverted = self._search_snapshot()
+            if matrix is not None:
+                with SIMILARITY_SECONDS.labels("inverted").time():
+                    return [articles[i] for i in inverted.search(row, limit)]
+
+        with SIMILARITY_SECONDS.labels("brute").time():
+            return self.similar_brute_force(article_id, limit)
+
+    def similar_many(self, article_ids: List[int], limit: int = 5,
+                     block_size: int = 256) -> Dict[int, List[Article]]:
+        """
+        similar() for many articles: each block of seed rows is scored against
+        the whole corpus with one sparse product (block @ M.T) and ranked with
+        the same rules. Unknown ids map to [].
+        """
+        rows = {article_id: self.row_for(article_id) for article_id in dict.fromkeys(article_ids)}
+        results: Dict[int, List[Article]] = {article_id: [] for article_id in rows}
+        seeds = [(article_id, row) for article_id, row in rows.items() if row is not None]
+
+        matrix, articles, ids, category_ids, inverted = self._search_snapshot()
+        if matrix is None or not seeds:
+            return results
+
+        with SIMILARITY_SECONDS.labels("batch").time():
+            for offset in range(0, len(seeds), block_size):
+                block = seeds[offset:offset + block_size]
+                products = (matrix[[row for _, row in block]] @ matrix.T).tocsr()
+                for i, (article_id, row) in enumerate(block):
+                    lo, hi = products.indptr[i], products.indptr[i + 1]
+                    ranked = inverted.rank_scored(row, products.indices[lo:hi], products.data[lo:hi], limit)
+                    results[article_id] = [articles[r] for r in ranked]
+        return results
+
+    def similar_brute_force(self, article_id: int, limit: int = 5) -> List[Article]:
+        row = self.row_for(article_id)
+        if row is None:
+            return []
+
+        matrix, articles, ids, category_ids = self._snapshot()
+
+        n = len(articles)
+        if matrix is None:
+            sims = np.zeros(n)
+        else:
+            # rows are L2-normalised, so the dot product is the cosine similarity
+            sims = (matrix @ matrix[row].T).toarray().ravel()
+
+        order = rank_candidates(sims, ids, category_ids, category_ids[row], exclude_row=row)
+        return [articles[i] for i in order[:limit]]
+
+
+class _GrowableRows:
+    """
+    A CSR matrix and its per-row ids / category keys held in buffers that
+    double when full (as IncrementalTfidf does for df), so append() copies
+    one row, not the corpus. view() returns arrays over the filled prefix:
+    later appends write past it, so earlier views never change.
+    """
+
+    def __init__(self, matrix, ids: np.ndarray, category_ids: np.ndarray):
+        matrix = matrix.tocsr()
+        self.n_rows, self.n_cols = matrix.shape
+        self.nnz = matrix.nnz
+        # the index dtype scipy chose: rebuilding the view in it avoids a conversion copy
+        self.data = matrix.data
+        self.indices = matrix.indices
+        self.indptr = matrix.indptr
+        self.ids = ids
+        self.category_ids = category_ids
+
+    def append(self, row, article_id: int, category_key: int) -> None:
+        row = row.tocsr()
+        n, end = self.n_rows, self.nnz + row.nnz
+        self.data = _with_room(self.data, self.nnz, end)
+        self.indices = _with_room(self.indices, self.nnz, end)
+        self.indptr = _with_room(self.indptr, n + 1, n + 2)
+        self.ids = _with_room(self.ids, n, n + 1)
+        self.category_ids = _with_room(self.category_ids, n, n + 1)
+
+        self.data[self.nnz:end] = row.data
+        self.indices[self.nnz:end] = row.indices
+        self.indptr[n + 1] = end
+        self.ids[n] = article_id
+        self.category_ids[n] = category_key
+        self.n_rows, self.nnz = n + 1, end
+        self.n_cols = max(self.n_cols, row.shape[1])
+
+    def view(self):
+        from scipy.sparse import csr_matrix
+
+        n, nnz = self.n_rows, self.nnz
+        matrix = csr_matrix((self.data[:nnz], self.indices[:nnz], self.indptr[:n + 1]),
+                            shape=(n, self.n_cols), copy=False)
+        matrix.has_sorted_indices = True  # IncrementalTfidf rows are sorted
+        return matrix, self.ids[:n], self.category_ids[:n]
+
+
+def _with_room(buffer: np.ndarray, used: int, needed: int) -> np.ndarray:
+    # same buffer if it has room, else a copy of the used part with doubled capacity
+    if needed <= len(buffer):
+        return buffer
+    grown = np.empty(max(needed, 2 * len(buffer), 16), dtype=buffer.dtype)
+    grown[:used] = buffer[:used]
+    return grown
+
+
+def _category_key(a) -> int:
+    category_id = getattr(a, "category_id", None)
+    return -1 if category_id is None else int(category_id)
+
+
+def rank_candidates(sims, ids, category_ids, current_category: int, exclude_row: int):
+    """
+    Row order used by content recommendations: articles from the same
+    category first, each group by similarity (desc), ties by newest id.
+    """
+    # rounding keeps float noise from reordering equal scores
+    scores = np.round(sims, SCORE_DECIMALS)
+    if current_category == -1:
+        same = np.zeros(len(ids), dtype=bool)
+    else:
+        same = category_ids == current_category
+    order = np.lexsort((-ids, -scores, ~same))
+    return order[order != exclude_row]
+
+
+def top_terms(rows, n: int, with_weights: bool = False) -> List[list]:
+    """
+    Column indices of the n largest entries of every row of a CSR matrix,
+    largest first (ties by lower column); (column, weight) pairs with
+    with_weights=True. Rows are scattered into a padded dense block so
+    selection is one argpartition over axis 1.
+    """
+    rows = rows.tocsr()
+    lengths = np.diff(rows.indptr)
+    if n <= 0 or rows.nnz == 0:
+        return [[] for _ in range(rows.shape[0])]
+
+    width = int(lengths.max())
+    weights = np.full((rows.shape[0], width), -np.inf)
+    columns = np.full((rows.shape[0], width), -1, dtype=np.int64)
+    row_of = np.repeat(np.arange(rows.shape[0]), lengths)
+    position = np.arange(rows.nnz) - np.repeat(rows.indptr[:-1], lengths)
+    weights[row_of, position] = rows.data
+    columns[row_of, position] = rows.indices
+
+    if width > n:
+        keep = np.argpartition(-weights, n - 1, axis=1)[:, :n]
+        weights = np.take_along_axis(weights, keep, axis=1)
+        columns = np.take_along_axis(columns, keep, axis=1)
+
+    result = []
+    for w, c in zip(weights, columns):
+        order = np.lexsort((c, -w))
+        picked = [(int(col), float(weight)) for col, weight in zip(c[order], w[order]) if weight > 0]
+        result.append(picked if with_weights else [col for col, _ in picked])
+    return result
@@ -0,0 +1,88 @@
+from typing import Dict
+
+from app.data.db import get_connection
+from app.repositories.article_stats_repository import SCORE_SQL
+from app.repositories.event_bucket_repository import current_hour
+
+ROLLUP_SELECT = """
+    SELECT
+        article_id,
+        CAST(strftime('%s', created_at) AS INTEGER) / 3600 AS bucket_hour,
+        experiment_group,
+        COUNT(CASE WHEN event_type='view' THEN 1 END) AS views,
+        COUNT(CASE WHEN event_type='like' THEN 1 END) AS likes,
+        COALESCE(SUM(CASE WHEN event_type='time_spent' THEN duration_ms END), 0) AS time_spent_ms
+    FROM interaction_events
+    WHERE {where}
+    GROUP BY article_id, bucket_hour, experiment_group
+"""
+
+# The only scan of interaction_events: totals per (article, hour, group)
+ROLLUP_SQL = "CREATE TEMP TABLE event_rollup AS" + ROLLUP_SELECT.format(where="id <= ?")
+
+# Events committed while the rollup was built (a rowid range, under the write lock);
+# the queries below all sum by key, so these rows simply add to the scanned ones
+ROLLUP_SINCE_SQL = "INSERT INTO event_rollup" + ROLLUP_SELECT.format(where="id > ?")
+
+ARTICLE_STATS_SQL = """
+    INSERT INTO article_stats(article_id, views, likes, time_spent_ms, score)
+    SELECT article_id, views, likes, time_spent_ms, {score}
+    FROM (
+        SELECT article_id, SUM(views) AS views, SUM(likes) AS likes, SUM(time_spent_ms) AS time_spent_ms
+        FROM event_rollup
+        GROUP BY article_id
+    )
+""".format(score=SCORE_SQL.format(views="views", likes="likes", time_ms="time_spent_ms"))
+
+BUCKETS_SQL = """
+    INSERT INTO article_event_buckets(bucket_hour, article_id, views, likes, time_spent_ms)
+    SELECT bucket_hour, article_id, SUM(views), SUM(likes), SUM(time_spent_ms)
+    FROM event_rollup
+    WHERE bucket_hour >= ?
+    GROUP BY bucket_hour, article_id
+"""
+
+GROUPS_SQL = """
+    INSERT INTO experiment_group_stats(experiment_group, views, likes, time_spent_ms)
+    SELECT experiment_group, SUM(views), SUM(likes), SUM(time_spent_ms)
+    FROM event_rollup
+    WHERE experiment_group IN ('A','B')
+    GROUP BY experiment_group
+"""
+
+
+def rebuild_event_aggregates(window_hours: int) -> Dict[str, int]:
+    """
+    Recompute article_stats, article_event_buckets (the active trending
+    window) and experiment_group_stats with a single scan of
+    interaction_events.
+
+    The scan folds events up to the current max id into a temp table
+    keyed by (article, hour, group), usually far smaller than the log
+    itself, without blocking writers. The swap then takes the write lock
+    (BEGIN IMMEDIATE), folds in the events committed since the scan and
+    replaces the three aggregates in that one transaction, so no event is
+    counted twice or missed. Returns the row count of each table.
+    """
+    conn = get_connection()
+    (last_id,) = conn.execute("SELECT COALESCE(MAX(id), 0) FROM interaction_events").fetchone()
+    conn.execute("DROP TABLE IF EXISTS temp.event_rollup")
+    conn.execute(ROLLUP_SQL, (last_id,))
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        with conn:
+            cur = conn.cursor()
+            cur.execute(ROLLUP_SINCE_SQL, (last_id,))
+            cur.execute("DELETE FROM article_stats")
+            cur.execute(ARTICLE_STATS_SQL)
+            cur.execute("DELETE FROM article_event_buckets")
+            cur.execute(BUCKETS_SQL, (current_hour() - window_hours,))
+            cur.execute("DELETE FROM experiment_group_stats")
+            cur.execute(GROUPS_SQL)
+    finally:
+        conn.execute("DROP TABLE temp.event_rollup")
+
+    counts = {}
+    for table in ("article_stats", "article_event_buckets", "experiment_group_stats"):
+        (counts[table],) = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
+    return counts
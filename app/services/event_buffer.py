@@ -0,0 +1,160 @@
+import logging
+import queue
+import threading
+import time
+from typing import Callable, List, Optional
+
+from app.models.interaction_event import InteractionEvent
+
+logger = logging.getLogger("article_engine")
+
+_STOP = object()
+
+
+class EventWriteBuffer:
+    """
+    Write-behind (group commit) buffer for interaction events.
+
+    Events are put on a bounded in-process queue and a background thread
+    writes them with one transaction per batch. A batch is flushed once it
+    holds `batch_size` events or `flush_interval` seconds after its first
+    event arrived, whichever comes first. close() drains the queue.
+
+    A failing batch is retried `retries` times with exponential backoff
+    (a locked database usually clears), then handed to `spill` (e.g.
+    SpillDirectory.append) to be replayed later. Only without a spill, or
+    if spilling fails too, are the events dropped. Queue items are marked
+    done once their batch is committed, spilled or given up on, so flush()
+    means "persisted" whenever a spill is configured.
+    """
+
+    def __init__(self, write_batch: Callable[[List[InteractionEvent]], None],
+                 max_size: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 0.2, put_timeout: float = 0.05,
+                 spill: Optional[Callable[[List[InteractionEvent]], None]] = None,
+                 retries: int = 3, retry_backoff: float = 0.05):
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.spill = spill
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.spilled = 0
+        self.dropped = 0
+
+        self._queue: "queue.Queue[InteractionEvent]" = queue.Queue(maxsize=max_size)
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="event-writer", daemon=True)
+
+    def start(self) -> "EventWriteBuffer":
+        self._thread.start()
+        return self
+
+    def put(self, event: InteractionEvent) -> bool:
+        """Enqueue an event; False if the buffer is closed or stays full."""
+        if self._closed.is_set():
+            return False
+        try:
+            self._queue.put(event, timeout=self.put_timeout)
+            return True
+        except queue.Full:
+            return False
+
+    def put_many(self, events: List[InteractionEvent]) -> int:
+        """Enqueue events in order; returns how many went in before the buffer stayed full."""
+        for i, event in enumerate(events):
+            if not self.put(event):
+                return i
+        return len(events)
+
+    def flush(self) -> None:
+        """Block until everything enqueued so far has been written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._thread.is_alive():
+            # wakes the writer even if it is waiting out a flush interval
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if first is _STOP:
+                self._queue.task_done()
+                self._drain()
+                return
+
+            batch = [first]
+            stopping = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        item = self._queue.get_nowait()
+                    else:
+                        item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._write(batch)
+            if stopping:
+                self._drain()
+                return
+
+    def _drain(self) -> None:
+        # events that raced past close()
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch: List[InteractionEvent]) -> None:
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    self.write_batch(batch)
+                    return
+                except Exception as e:
+                    if attempt == self.retries:
+                        logger.warning(f"Event batch of {len(batch)} failed {attempt + 1} times: {e}")
+                        break
+                    time.sleep(self.retry_backoff * 2 ** attempt)
+            self._give_up(batch)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _give_up(self, batch: List[InteractionEvent]) -> None:
+        if self.spill is not None:
+            try:
+                self.spill(batch)
+                self.spilled += len(batch)
+                return
+            except Exception:
+                logger.exception(f"Spilling {len(batch)} events failed")
+        self.dropped += len(batch)
+        logger.error(f"Event writer dropped a batch of {len(batch)} events")
@@ -0,0 +1,435 @@
+import fcntl
+import glob
+import itertools
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime, timezone
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from app.models.interaction_event import InteractionEvent
+from app.services.event_buffer import EventWriteBuffer
+
+logger = logging.getLogger("article_engine")
+
+# Wire and spill-file layout of an event
+FIELDS = ("article_id", "user_id", "event_type", "duration_ms", "experiment_group", "created_at")
+
+
+def utc_now() -> str:
+    # same format as SQLite datetime('now')
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def to_record(event: InteractionEvent) -> list:
+    return [getattr(event, field) for field in FIELDS]
+
+
+def from_record(record) -> InteractionEvent:
+    return InteractionEvent(id=None, **dict(zip(FIELDS, record)))
+
+
+# tells apart SpillDirectory instances of one process in claimed file names
+_claimers = itertools.count(1)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SpillDirectory:
+    """
+    Append-only JSONL files for events the writer process could not take.
+
+    Each client process appends to its own spill-<pid>.jsonl and fsyncs
+    before returning, so a spilled event survives a crash. The writer claims
+    a file by renaming it to *.<pid>-<n>.replay under the same flock the
+    appenders take, so no append can land in a file that is already being
+    replayed. Every web worker runs its own replayer on the directory: the
+    owner in the name keeps each claimed file with one of them until that
+    process exits.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._claimer = next(_claimers)
+
+    def append(self, events: List[InteractionEvent]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"spill-{os.getpid()}.jsonl")
+        lines = "".join(json.dumps(to_record(e)) + "\n" for e in events)
+        while True:
+            with open(path, "a", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                # the writer may have claimed the file between open() and flock()
+                try:
+                    current = os.stat(path).st_ino == os.fstat(f.fileno()).st_ino
+                except FileNotFoundError:
+                    current = False
+                if current:
+                    f.write(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    return
+
+    def claim(self) -> List[str]:
+        """
+        Rename spill files to *.replay owned by us and return the files we
+        own: those, our earlier claims (a failed replay is retried) and the
+        claims of exited processes, taken over by another rename.
+        """
+        pid = os.getpid()
+        owner = f"{pid}-{self._claimer}"
+        claimed = []
+        for path in glob.glob(os.path.join(self.directory, "spill-*.jsonl")):
+            target = f"{path}.{time.time_ns()}.{owner}.replay"
+            try:
+                with open(path, "a", encoding="utf-8") as f:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                    os.replace(path, target)
+            except FileNotFoundError:
+                continue
+            claimed.append(target)
+
+        for path in glob.glob(os.path.join(self.directory, "*.replay")):
+            if path in claimed:
+                continue
+            source, stamp = path[:-len(".replay")].rsplit(".jsonl.", 1)
+            # <ns>.<pid>-<n>; a bare <ns> is a claim from before owners were recorded
+            current = stamp.split(".", 1)[1] if "." in stamp else None
+            if current == owner:
+                claimed.append(path)
+                continue
+            if current is not None and _alive(int(current.split("-")[0])):
+                continue  # another worker is replaying it
+            target = f"{source}.jsonl.{time.time_ns()}.{owner}.replay"
+            try:
+                os.rename(path, target)
+            except FileNotFoundError:
+                continue  # another worker took it over first
+            claimed.append(target)
+        return sorted(claimed)
+
+    @staticmethod
+    def read(path: str, batch_size: int) -> Iterator[List[InteractionEvent]]:
+        batch = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    batch.append(from_record(json.loads(line)))
+                except (ValueError, TypeError):
+                    # a torn last line from a crash mid-append
+                    logger.warning(f"Skipping unreadable spill line in {path}")
+                    continue
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+
+class SpillReplayer:
+    """
+    Commits spilled events with `write_batch` every `interval` seconds on a
+    daemon thread. A file is deleted only after all of it was committed;
+    one that fails stays claimed and is retried on the next pass, so a
+    partly committed file can be replayed twice (at-least-once).
+    """
+
+    def __init__(self, spill: SpillDirectory, write_batch, batch_size: int = 500, interval: float = 5.0):
+        self.spill = spill
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.interval = interval
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="event-spill-replay", daemon=True)
+
+    def start(self) -> "SpillReplayer":
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """Stop the thread and replay whatever is left."""
+        self._closed.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.replay()
+
+    def _run(self) -> None:
+        while True:
+            self.replay()
+            if self._closed.wait(self.interval):
+                return
+
+    def replay(self) -> int:
+        """Commit every spilled event; returns how many were replayed."""
+        replayed = 0
+        for path in self.spill.claim():
+            try:
+                for batch in SpillDirectory.read(path, self.batch_size):
+                    self.write_batch(batch)
+                    replayed += len(batch)
+            except FileNotFoundError:
+                continue  # taken over by another worker
+            except Exception:
+                # the file stays claimed and is retried on the next pass
+                logger.exception(f"Replaying {path} failed")
+                continue
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        if replayed:
+            logger.info(f"Replayed {replayed} spilled events")
+        return replayed
+
+
+class EventWriterClient:
+    """
+    Web-process side of the event writer: hands validated events to the
+    writer process over a Unix socket.
+
+    Events are stamped with created_at when they are handed over, so
+    batching and replay delays do not move them into a later trending
+    bucket. If the writer pushes back (its queue stays full), cannot be
+    reached, or does not answer within `timeout` seconds, the events that
+    were not accepted are appended to the spill directory instead, which
+    the writer replays later. A timed-out batch is spilled whole, so
+    delivery is at-least-once.
+    """
+
+    def __init__(self, address: str, authkey: bytes, spill_dir: str, timeout: float = 2.0):
+        self.address = address
+        self.authkey = authkey
+        self.spill = SpillDirectory(spill_dir)
+        self.timeout = timeout
+        # Connection objects are not thread-safe: one per thread
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.sent = 0
+        self.spilled = 0
+
+    def put_many(self, events: List[InteractionEvent]) -> None:
+        events = [e if e.created_at else replace(e, created_at=utc_now()) for e in events]
+        accepted = self._send(events)
+        with self._stats_lock:
+            self.sent += accepted
+            self.spilled += len(events) - accepted
+        if accepted < len(events):
+            self.spill.append(events[accepted:])
+
+    def ping(self) -> bool:
+        try:
+            conn = self._connection()
+            conn.send(("ping",))
+            return conn.poll(self.timeout) and conn.recv() == "pong"
+        # AuthenticationError: a writer with another SECRET_KEY holds the socket
+        except (OSError, EOFError, AuthenticationError):
+            self._drop()
+            return False
+
+    def _send(self, events: List[InteractionEvent]) -> int:
+        """Number of leading events the writer accepted (0 if it is unreachable)."""
+        try:
+            conn = self._connection()
+            conn.send(("events", [to_record(e) for e in events]))
+            if not conn.poll(self.timeout):
+                raise TimeoutError("event writer did not answer")
+            return int(conn.recv())
+        except (OSError, EOFError, AuthenticationError) as e:
+            logger.warning(f"Event writer unavailable, spilling {len(events)} events: {e}")
+            self._drop()
+            return 0
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = Client(self.address, family="AF_UNIX", authkey=self.authkey)
+            self._local.conn = conn
+        return conn
+
+    def _drop(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def stats(self):
+        return {"sent": self.sent, "spilled": self.spilled}
+
+
+class EventWriterServer:
+    """
+    The writer process: the only process that writes interaction events.
+
+    Clients connect over a Unix socket; each connection gets a thread that
+    puts incoming events on an EventWriteBuffer, whose single thread commits
+    them in batches through InteractionEventService.write_events. The
+    buffer's bounded queue is the backpressure: a put that stays full is
+    answered with the number of events taken so far and the client spills
+    the rest. Spilled files are replayed every `replay_interval` seconds.
+
+    An exclusive flock on `<address>.lock` makes sure only one writer runs
+    per socket; a second one exits instead of stealing the address.
+    """
+
+    def __init__(self, address: str, authkey: bytes, spill_dir: str,
+                 max_size: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 0.2, replay_interval: float = 5.0):
+        from app.services.interaction_event_service import InteractionEventService
+
+        self.address = address
+        self.authkey = authkey
+        self.spill = SpillDirectory(spill_dir)
+        self.batch_size = batch_size
+        self.replay_interval = replay_interval
+        self.service = InteractionEventService()
+        self.buffer = EventWriteBuffer(
+            self.service.write_events,
+            max_size=max_size,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            # batches that keep failing go back to the spill directory
+            spill=self.spill.append,
+        )
+        self.replayer = SpillReplayer(self.spill, self.service.write_events,
+                                      batch_size=batch_size, interval=replay_interval)
+        self._closed = threading.Event()
+        self._listener: Optional[Listener] = None
+        self._lock_file = None
+
+    def acquire(self) -> bool:
+        """Take the per-address lock; False if another writer holds it."""
+        self._lock_file = open(f"{self.address}.lock", "w")
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock_file.close()
+            self._lock_file = None
+            return False
+        # a socket file left by a crashed writer would make bind() fail
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+        return True
+
+    def serve_forever(self) -> None:
+        self._listener = Listener(self.address, family="AF_UNIX", authkey=self.authkey)
+        self.buffer.start()
+        self.replayer.start()
+        logger.info(f"Event writer listening on {self.address}")
+        try:
+            while not self._closed.is_set():
+                try:
+                    conn = self._listener.accept()
+                except (OSError, EOFError, AuthenticationError):
+                    # failed handshakes (wrong authkey, client gone) just drop
+                    continue
+                if self._closed.is_set():
+                    conn.close()
+                    break
+                threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+        finally:
+            self._shutdown()
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        # accept() does not notice a closed listener: wake it with a connection
+        try:
+            Client(self.address, family="AF_UNIX", authkey=self.authkey).close()
+        except OSError:
+            pass
+
+    def _serve(self, conn) -> None:
+        try:
+            while True:
+                message = conn.recv()
+                if message[0] == "ping":
+                    conn.send("pong")
+                elif message[0] == "events":
+                    events = [from_record(r) for r in message[1]]
+                    conn.send(self.buffer.put_many(events))
+        except (OSError, EOFError):
+            pass
+        finally:
+            conn.close()
+
+    def replay(self) -> int:
+        """Commit every spilled event; returns how many were replayed."""
+        return self.replayer.replay()
+
+    def _shutdown(self) -> None:
+        if self._listener is not None:
+            self._listener.close()
+        self.buffer.close()
+        self.replayer.close()
+        if self._lock_file is not None:
+            self._lock_file.close()
+
+
+def run_writer(db_path: Optional[str] = None) -> None:
+    """Process entry point: serve until SIGTERM/SIGINT, then drain and exit."""
+    from app.config.config import Config
+    from app.data.schema import init_db
+
+    if db_path:
+        Config.DB_PATH = db_path
+    init_db()
+
+    server = EventWriterServer(
+        Config.EVENT_WRITER_ADDRESS,
+        Config.SECRET_KEY.encode(),
+        Config.EVENT_SPILL_DIR,
+        max_size=Config.EVENT_BUFFER_SIZE,
+        batch_size=Config.EVENT_BATCH_SIZE,
+        flush_interval=Config.EVENT_FLUSH_INTERVAL_MS / 1000.0,
+        replay_interval=Config.EVENT_SPILL_REPLAY_SECONDS,
+    )
+    if not server.acquire():
+        logger.info("Another event writer is already running")
+        return
+
+    def stop(signum, frame):
+        threading.Thread(target=server.close, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    server.serve_forever()
+
+
+def spawn_writer(db_path: str) -> subprocess.Popen:
+    """Start the writer as a child process of the web server (EVENT_WRITER_AUTOSTART)."""
+    # a fresh interpreter rather than multiprocessing: spawn would re-import
+    # run.py, which builds an app at import time, and fork would copy its threads
+    script = Path(__file__).resolve().parent.parent.parent / "event_writer.py"
+    env = dict(os.environ, DB_PATH=db_path)
+    return subprocess.Popen([sys.executable, str(script)], cwd=script.parent, env=env)
+
+
+def stop_writer(process: subprocess.Popen, timeout: float = 10.0) -> None:
+    # SIGTERM makes the writer drain its queue and replay spills before exiting
+    process.terminate()
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
@@ -0,0 +1,314 @@
+import glob
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.repositories.article_stats_repository import stats_delta
+
+logger = logging.getLogger("article_engine")
+
+# PopularityStrategy weights: views + likes*3 + minutes*2, minutes capped at 10
+LIKE_WEIGHT = 3
+MINUTE_WEIGHT = 2
+MAX_MINUTES = 10
+
+
+def score_of(views: int, likes: int, time_ms: int) -> float:
+    return views + likes * LIKE_WEIGHT + min(time_ms / 60000.0, MAX_MINUTES) * MINUTE_WEIGHT
+
+
+def time_term(time_ms: float) -> float:
+    return min(time_ms / 60000.0, MAX_MINUTES) * MINUTE_WEIGHT
+
+
+class HeavyHittersTracker:
+    """
+    Approximate top articles by popularity score with Space-Saving.
+
+    At most `capacity` articles are tracked. An event for an untracked
+    article evicts the one with the smallest score and inherits that score
+    as its error, so an estimate never undercounts and overcounts by at
+    most the error; any article whose true score exceeds total/capacity is
+    guaranteed to be tracked. The smallest counter is found through a lazy
+    min-heap (stale entries are skipped, and the heap is compacted when it
+    grows past a few times the capacity), so memory stays O(capacity).
+
+    Reads never touch SQLite. Every process keeps its own sketch (like the
+    /metrics counters) and snapshots it to `<snapshot_path>.<pid>`. load()
+    claims the snapshots of processes that are gone, renaming each so two
+    starting workers cannot both take it, and merges them. Merged scores
+    add up, and an article missing from a full sketch gets that sketch's
+    smallest counter added as error, so estimates stay upper bounds. The
+    claimed files are deleted once this process's own snapshot, which now
+    carries their counts, is written, so every event stays in exactly one
+    file. Snapshots of live workers are not read: their counts reach a
+    restarted process only after those workers exit.
+    """
+
+    def __init__(self, capacity: int = 1000, snapshot_path: Optional[str] = None):
+        self.capacity = max(1, capacity)
+        self.snapshot_path = snapshot_path
+
+        # article_id -> [score, error, time_spent_ms]
+        self._counters: Dict[int, List[float]] = {}
+        self._heap: List[Tuple[float, int]] = []
+        self._lock = threading.Lock()
+        self.total = 0.0
+        self.evictions = 0
+        # counters change once per batch; rankings are reused until then
+        self._version = 0
+        self._ranked: Tuple[int, List[Tuple[int, float, float]]] = (-1, [])
+
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # snapshot files merged by load(), deleted after our next snapshot
+        self._claimed: List[str] = []
+
+    # Updating
+
+    def on_events_logged(self, events) -> None:
+        """InteractionEventService listener: fold a committed batch into the counters."""
+        with self._lock:
+            for event in events:
+                views, likes, time_ms = stats_delta(event.event_type, event.duration_ms)
+                if views or likes or time_ms:
+                    self._add(event.article_id, views, likes, time_ms)
+            self._version += 1
+
+    def _add(self, article_id: int, views: int, likes: int, time_ms: int) -> None:
+        counter = self._counters.get(article_id)
+        if counter is None:
+            counter = self._admit(article_id)
+
+        # the time term is capped per article, so its increment depends on the running total
+        old_minutes = min(counter[2] / 60000.0, MAX_MINUTES)
+        counter[2] += time_ms
+        new_minutes = min(counter[2] / 60000.0, MAX_MINUTES)
+        delta = views + likes * LIKE_WEIGHT + (new_minutes - old_minutes) * MINUTE_WEIGHT
+
+        counter[0] += delta
+        self.total += delta
+        heapq.heappush(self._heap, (counter[0], article_id))
+        if len(self._heap) > 4 * self.capacity:
+            self._compact()
+
+    def _admit(self, article_id: int) -> List[float]:
+        if len(self._counters) < self.capacity:
+            counter = [0.0, 0.0, 0]
+        else:
+            floor = self._evict_min()
+            counter = [floor, floor, 0]
+            self.evictions += 1
+        self._counters[article_id] = counter
+        return counter
+
+    def _evict_min(self) -> float:
+        while self._heap:
+            score, article_id = heapq.heappop(self._heap)
+            counter = self._counters.get(article_id)
+            # entries pushed before the last increment are stale
+            if counter is not None and counter[0] == score:
+                del self._counters[article_id]
+                return score
+        return 0.0
+
+    def _compact(self) -> None:
+        self._heap = [(c[0], article_id) for article_id, c in self._counters.items()]
+        heapq.heapify(self._heap)
+
+    def seed(self, rows: Iterable[Tuple[int, int, int, int]]) -> None:
+        """Start from exact counters: (article_id, views, likes, time_spent_ms), best first."""
+        with self._lock:
+            for article_id, views, likes, time_ms in rows:
+                if len(self._counters) >= self.capacity:
+                    break
+                score = score_of(views, likes, time_ms)
+                self._counters[article_id] = [score, 0.0, time_ms]
+                self.total += score
+            self._compact()
+            self._version += 1
+
+    # Reading
+
+    def top(self, limit: int, exclude_article_id: Optional[int] = None) -> List[Tuple[int, float, float]]:
+        """(article_id, estimated score, error) of the best `limit` articles, ties by newest id."""
+        version, ranked = self._ranked
+        if version != self._version or len(ranked) < min(limit + 1, len(self._counters)):
+            with self._lock:
+                version = self._version
+                best = heapq.nlargest(limit + 1, self._counters.items(),
+                                      key=lambda item: (item[1][0], item[0]))
+                ranked = [(article_id, c[0], c[1]) for article_id, c in best]
+            self._ranked = (version, ranked)
+        return [
+            entry for entry in ranked
+            if entry[0] != exclude_article_id and entry[1] > 0
+        ][:limit]
+
+    def popular_article_ids(self, limit: int, exclude_article_id: Optional[int] = None) -> List[int]:
+        return [article_id for article_id, _, _ in self.top(limit, exclude_article_id)]
+
+    def stats(self):
+        return {
+            "tracked": len(self._counters),
+            "capacity": self.capacity,
+            "total_score": round(self.total, 2),
+            "evictions": self.evictions,
+            # any article scoring above this is guaranteed to be tracked
+            "guarantee_threshold": round(self.total / self.capacity, 2),
+        }
+
+    # Snapshots
+
+    def snapshot(self, path: Optional[str] = None) -> None:
+        """Write this process's counters to `<path>.<pid>`."""
+        path = path or self.snapshot_path
+        if not path:
+            return
+        with self._lock:
+            data = {
+                "capacity": self.capacity,
+                "total": self.total,
+                "saved_at": time.time(),
+                "counters": [[article_id, *c] for article_id, c in self._counters.items()],
+            }
+            claimed, self._claimed = self._claimed, []
+        # write then rename so a crash never leaves a half-written snapshot
+        own = f"{path}.{os.getpid()}"
+        tmp = f"{own}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, own)
+        # their counts are in our snapshot now
+        for claimed_path in claimed:
+            if claimed_path != own:
+                os.unlink(claimed_path)
+
+    def load(self, path: Optional[str] = None) -> bool:
+        """Merge the snapshots left by exited processes into the counters; False if there are none."""
+        path = path or self.snapshot_path
+        if not path:
+            return False
+        claimed = _claim_snapshots(path)
+        snapshots = []
+        for claimed_path in claimed:
+            try:
+                with open(claimed_path, encoding="utf-8") as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                logger.warning(f"Skipping unreadable heavy-hitters snapshot {claimed_path}")
+        if not snapshots:
+            return False
+
+        counters, total = merge_snapshots(snapshots)
+        ranked = sorted(counters.items(), key=lambda item: (item[1][0], item[0]), reverse=True)
+        with self._lock:
+            self._counters = dict(ranked[:self.capacity])
+            self.total = total
+            self._compact()
+            self._version += 1
+            self._claimed = claimed
+        return True
+
+    def start(self, interval: float) -> "HeavyHittersTracker":
+        """Snapshot every `interval` seconds in a background thread."""
+        if self.snapshot_path and interval > 0:
+            self._thread = threading.Thread(
+                target=self._run, args=(interval,), name="heavy-hitters-snapshot", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._save()
+
+    def _run(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            self._save()
+
+    def _save(self) -> None:
+        try:
+            self.snapshot()
+        except Exception:
+            logger.exception("Heavy-hitters snapshot failed")
+
+
+def merge_snapshots(snapshots: List[dict]) -> Tuple[Dict[int, List[float]], float]:
+    """
+    Space-Saving sketches merged into one ({article_id: [score, error,
+    time_spent_ms]}, total). The capped time term is recomputed from the
+    summed time, and an article absent from a full sketch may have been
+    evicted there, so that sketch's smallest score is added to its score
+    and error.
+    """
+    parsed = [{int(r[0]): (r[1], r[2], r[3]) for r in data["counters"]} for data in snapshots]
+    # every id first: a full sketch's floor applies to ids only later sketches have
+    merged: Dict[int, List[float]] = {article_id: [0.0, 0.0, 0] for rows in parsed for article_id in rows}
+    total = 0.0
+    for data, rows in zip(snapshots, parsed):
+        total += data.get("total", sum(score for score, _, _ in rows.values()))
+        floor = min((score for score, _, _ in rows.values()), default=0.0)
+        full = len(rows) >= data.get("capacity", len(rows) + 1)
+        for article_id, counter in merged.items():
+            if article_id in rows:
+                score, error, time_ms = rows[article_id]
+                counter[0] += score - time_term(time_ms)
+                counter[1] += error
+                counter[2] += time_ms
+            elif full:
+                counter[0] += floor
+                counter[1] += floor
+    for counter in merged.values():
+        counter[0] += time_term(counter[2])
+    return merged, total
+
+
+def _claim_snapshots(path: str) -> List[str]:
+    """
+    Rename the snapshots of exited processes (and a pre-per-process `path`)
+    to `<path>.<our pid>.<n>` and return them with our own snapshot.
+    """
+    pid = os.getpid()
+    candidates = [path] + glob.glob(f"{glob.escape(path)}.*")
+    claimed = []
+    for n, candidate in enumerate(candidates):
+        if candidate.endswith(".tmp") or not os.path.exists(candidate):
+            continue
+        owner = _owner_pid(path, candidate)
+        if owner == pid:
+            claimed.append(candidate)
+            continue
+        if (owner is None and candidate != path) or (owner is not None and _alive(owner)):
+            continue
+        target = f"{path}.{pid}.{time.time_ns()}-{n}"
+        try:
+            os.rename(candidate, target)
+        except FileNotFoundError:
+            continue  # another starting worker claimed it first
+        claimed.append(target)
+    return claimed
+
+
+def _owner_pid(path: str, candidate: str) -> Optional[int]:
+    # <path>.<pid> or <path>.<pid>.<n>; None for the legacy single file
+    suffix = candidate[len(path) + 1:].split(".")[0]
+    return int(suffix) if suffix.isdigit() else None
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
+
+
+def make_analyzer():
+    # scikit-learn/scipy are imported on first use: they dominate app import time
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    # same tokenization as the old fitted vectorizer: lowercase, english stop words
+    return TfidfVectorizer(lowercase=True, stop_words="english").build_analyzer()
+
+
+class IncrementalTfidf:
+    """
+    Vocabulary and document-frequency store for TF-IDF that grows one
+    document at a time.
+
+    add() tokenizes a document, bumps the document frequency of its distinct
+    terms and returns its vector under the current IDF, all in O(document
+    length). Raw term counts are kept per document so matrix() can re-weight
+    the whole corpus under the current IDF without tokenizing again.
+
+    Weights follow sklearn's TfidfVectorizer defaults: raw term counts,
+    smooth idf = ln((1 + n) / (1 + df)) + 1, rows L2-normalised. A corpus
+    vectorized with matrix() matches TfidfVectorizer(stop_words="english")
+    .fit_transform on the same texts to within 1e-12 per entry, except that
+    columns are in first-seen order rather than alphabetical and there is
+    no max_features cap (the vocabulary is unbounded). Rows returned by
+    add() only use the IDF of the moment; they drift from a fresh fit as
+    later documents change df, until the next matrix().
+    """
+
+    def __init__(self):
+        self.analyzer = make_analyzer()
+        self.vocabulary: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.n_docs = 0
+        self._df = np.zeros(1024, dtype=np.int64)
+        self._doc_counts: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    @property
+    def n_terms(self) -> int:
+        return len(self.terms)
+
+    @property
+    def df(self) -> np.ndarray:
+        return self._df[:self.n_terms]
+
+    # Updating
+
+    def add(self, text: str) -> csr_matrix:
+        """Count a new document and return its 1 x n_terms vector."""
+        cols, counts = self._count(text, grow=True)
+        self._df[cols] += 1
+        self.n_docs += 1
+        self._doc_counts.append((cols, counts))
+        return self._rows([(cols, counts)])
+
+    def add_many(self, texts: Sequence[str]) -> None:
+        """Count documents without vectorizing them (use matrix() afterwards)."""
+        for text in texts:
+            cols, counts = self._count(text, grow=True)
+            self._df[cols] += 1
+            self.n_docs += 1
+            self._doc_counts.append((cols, counts))
+
+    def frozen(self) -> "IncrementalTfidf":
+        """Copy with the vocabulary and df but without per-document counts (for transform())."""
+        copy = IncrementalTfidf.__new__(IncrementalTfidf)
+        copy.__setstate__({
+            "vocabulary": dict(self.vocabulary),
+            "terms": list(self.terms),
+            "n_docs": self.n_docs,
+            "_df": self._df.copy(),
+            "_doc_counts": [],
+        })
+        return copy
+
+    def __getstate__(self):
+        # the analyzer is rebuilt on unpickling rather than pickled
+        state = dict(self.__dict__)
+        state.pop("analyzer", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.analyzer = make_analyzer()
+
+    # Vectorizing
+
+    def idf(self, cols: np.ndarray) -> np.ndarray:
+        return np.log((1.0 + self.n_docs) / (1.0 + self._df[cols])) + 1.0
+
+    def matrix(self) -> csr_matrix:
+        """All stored documents re-weighted and re-normalised with the current IDF."""
+        return self._rows(self._doc_counts)
+
+    def transform(self, texts: Sequence[str]) -> csr_matrix:
+        """Vectorize texts with the current vocabulary and IDF without storing them."""
+        return self._rows([self._count(text, grow=False) for text in texts])
+
+    def _count(self, text: str, grow: bool) -> Tuple[np.ndarray, np.ndarray]:
+        counts = Counter(self.analyzer(text))
+        cols, values = [], []
+        for term, count in counts.items():
+            col = self.vocabulary.get(term)
+            if col is None:
+                if not grow:
+                    continue
+                col = self._new_term(term)
+            cols.append(col)
+            values.append(count)
+        return np.array(cols, dtype=np.int64), np.array(values, dtype=np.float64)
+
+    def _new_term(self, term: str) -> int:
+        col = len(self.terms)
+        self.vocabulary[term] = col
+        self.terms.append(term)
+        if col >= len(self._df):
+            self._df = np.concatenate([self._df, np.zeros(len(self._df), dtype=np.int64)])
+        return col
+
+    def _rows(self, docs: Sequence[Tuple[np.ndarray, np.ndarray]]) -> csr_matrix:
+        from scipy.sparse import csr_matrix
+
+        lengths = [len(cols) for cols, _ in docs]
+        indptr = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+        if indptr[-1] == 0:
+            return csr_matrix((len(docs), self.n_terms))
+
+        indices = np.concatenate([cols for cols, _ in docs])
+        data = np.concatenate([counts for _, counts in docs]) * self.idf(indices)
+
+        # per-row L2 norms without leaving the flat arrays
+        row_of = np.repeat(np.arange(len(docs)), lengths)
+        norms = np.sqrt(np.bincount(row_of, weights=data * data, minlength=len(docs)))
+        data /= norms[row_of]
+
+        matrix = csr_matrix((data, indices, indptr), shape=(len(docs), self.n_terms))
+        matrix.sort_indices()
+        return matrix
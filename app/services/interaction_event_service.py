@@ -1,37 +1,110 @@
-from typing import List
+import logging
+from typing import Callable, List, Optional
 from app.models.interaction_event import InteractionEvent
 from app.data.db import get_connection
+from app.config.config import Config
+from app.repositories.article_stats_repository import ArticleStatsRepository
+from app.repositories.event_bucket_repository import EventBucketRepository
+from app.repositories.experiment_group_stats_repository import ExperimentGroupStatsRepository
+
+logger = logging.getLogger("article_engine")
+
+# Hot read queries; tests/test_query_plans.py checks each one is index-backed
+COUNT_FOR_ARTICLE_SQL = """
+    SELECT COUNT(*) FROM interaction_events WHERE article_id = ? AND event_type = ?
+"""
+
+TOTAL_DURATION_FOR_ARTICLE_SQL = """
+    SELECT COALESCE(SUM(duration_ms), 0)
+    FROM interaction_events
+    WHERE article_id = ? AND event_type = ? AND duration_ms IS NOT NULL
+"""
+
+ARTICLE_IDS_FOR_USER_SQL = """
+    SELECT DISTINCT article_id FROM interaction_events WHERE user_id = ?
+"""
 
 
 class InteractionEventService:
 
+    def __init__(self, buffer=None):
+        self.stats_repo = ArticleStatsRepository()
+        self.buckets_repo = EventBucketRepository(window_hours=Config.TRENDING_WINDOW_HOURS)
+        self.groups_repo = ExperimentGroupStatsRepository()
+        # optional EventWriteBuffer; when set, log() is write-behind
+        self.buffer = buffer
+        # optional EventWriterClient; when set, a separate writer process commits
+        self.writer = None
+        # callbacks invoked with each batch of events once it is committed
+        self._listeners: List[Callable[[List[InteractionEvent]], None]] = []
+
+    def subscribe(self, listener: Callable[[List[InteractionEvent]], None]) -> None:
+        self._listeners.append(listener)
+
     def log(self, event: InteractionEvent):
+        self.log_many([event])
+        return event
+
+    def log_many(self, events: List[InteractionEvent]) -> None:
+        if self.writer is not None:
+            # committed by the writer process (or spilled to disk); listeners
+            # in this process only ever see events handed over here
+            self.writer.put_many(events)
+            self._notify(events)
+            return
+        if self.buffer is not None:
+            # a full queue pushes back: whatever did not fit is written inline
+            events = events[self.buffer.put_many(events):]
+            if not events:
+                return
+        self.write_events(events)
+
+    def write_events(self, events: List[InteractionEvent]) -> None:
+        """Insert events and update their counters in a single transaction."""
         conn = get_connection()
-        cur = conn.cursor()
 
-        cur.execute(
-            """
-            INSERT INTO interaction_events(
-                article_id,
-                user_id,
-                event_type,
-                duration_ms,
-                experiment_group
-            )
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (
-                event.article_id,
-                event.user_id,
-                event.event_type,
-                event.duration_ms,
-                getattr(event, "experiment_group", None),
+        # the connection is shared by the thread: commit, or roll back on error
+        with conn:
+            cur = conn.cursor()
+            cur.executemany(
+                """
+                INSERT INTO interaction_events(
+                    article_id,
+                    user_id,
+                    event_type,
+                    duration_ms,
+                    experiment_group,
+                    created_at
+                )
+                VALUES (?, ?, ?, ?, ?, COALESCE(?, datetime('now')))
+                """,
+                [
+                    (
+                        event.article_id,
+                        event.user_id,
+                        event.event_type,
+                        event.duration_ms,
+                        getattr(event, "experiment_group", None),
+                        getattr(event, "created_at", None),
+                    )
+                    for event in events
+                ]
             )
-        )
+            # counters move in the same transaction as the event rows
+            self.stats_repo.apply_many(cur, events)
+            self.buckets_repo.apply_many(cur, events)
+            self.groups_repo.apply_many(cur, events)
 
-        conn.commit()
-        conn.close()
-        return event
+        self._notify(events)
+
+    def _notify(self, events: List[InteractionEvent]) -> None:
+        # the events are already committed: a failing listener must not fail
+        # the request (clients would retry and duplicate) or starve the others
+        for listener in self._listeners:
+            try:
+                listener(events)
+            except Exception:
+                logger.exception(f"Event listener {listener!r} failed")
 
     def list_for_article(self, article_id: int) -> List[InteractionEvent]:
         conn = get_connection()
@@ -41,7 +114,6 @@ class InteractionEventService:
             (article_id,)
         )
         rows = cur.fetchall()
-        conn.close()
 
         events: List[InteractionEvent] = []
         for row in rows:
@@ -61,25 +133,27 @@ class InteractionEventService:
     def count_for_article(self, article_id: int, event_type: str) -> int:
         conn = get_connection()
         cur = conn.cursor()
-        cur.execute(
-            "SELECT COUNT(*) FROM interaction_events WHERE article_id = ? AND event_type = ?",
-            (article_id, event_type)
-        )
+        cur.execute(COUNT_FOR_ARTICLE_SQL, (article_id, event_type))
         (n,) = cur.fetchone()
-        conn.close()
         return int(n)
 
     def total_duration_ms_for_article(self, article_id: int, event_type: str) -> int:
         conn = get_connection()
         cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT COALESCE(SUM(duration_ms), 0)
-            FROM interaction_events
-            WHERE article_id = ? AND event_type = ? AND duration_ms IS NOT NULL
-            """,
-            (article_id, event_type)
-        )
+        cur.execute(TOTAL_DURATION_FOR_ARTICLE_SQL, (article_id, event_type))
         (total,) = cur.fetchone()
-        conn.close()
         return int(total or 0)
+
+    def article_ids_for_user(self, user_id: int) -> List[int]:
+        """Articles the user has any event for."""
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute(ARTICLE_IDS_FOR_USER_SQL, (user_id,))
+        return [row[0] for row in cur.fetchall()]
+
+    def popular_article_ids(self, limit: int, exclude_article_id: Optional[int] = None) -> List[int]:
+        return self.stats_repo.top_article_ids(limit, exclude_article_id=exclude_article_id)
+
+    def experiment_group_summary(self):
+        """Views, likes and total time spent per A/B group (from the rollup table)."""
+        return self.groups_repo.summary()
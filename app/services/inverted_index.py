@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+# Scores are compared after rounding so accumulation order cannot reorder ties
+# (same precision as content_index.rank_candidates).
+SCORE_DECIMALS = 10
+
+
+class InvertedIndex:
+    """
+    Term -> postings retrieval over the rows of a ContentIndex matrix.
+
+    Postings hold precomputed TF-IDF weights and every term keeps its maximum
+    weight, so a query can stop admitting new documents (MaxScore style) once
+    the best score still reachable by an unseen document cannot enter the
+    top-k. Already admitted documents keep accumulating, so their scores are
+    exact. Results follow the content ranking rule: same category first,
+    each group by similarity (desc), ties by newest id, zero-similarity
+    articles filling the tail.
+    """
+
+    def __init__(self, matrix, ids: np.ndarray, category_ids: np.ndarray):
+        self.doc_terms = matrix.tocsr()
+        postings = self.doc_terms.tocsc()
+        postings.sort_indices()
+        self.n_indexed = matrix.shape[0]  # rows covered by the postings below
+        self.indptr = postings.indptr
+        self.doc_index = postings.indices
+        self.weights = postings.data
+
+        self.max_weight = np.zeros(postings.shape[1])
+        nonempty = np.diff(self.indptr) > 0
+        if nonempty.any():
+            self.max_weight[nonempty] = np.maximum.reduceat(self.weights, self.indptr[:-1][nonempty])
+
+        self.tail = None  # postings of rows appended by extended()
+        self._set_rows(ids, category_ids)
+
+    def extended(self, matrix, ids: np.ndarray, category_ids: np.ndarray) -> "InvertedIndex":
+        """
+        Index for `matrix`, whose first n_indexed rows must be unchanged:
+        the postings are shared and only the appended rows are indexed, as a
+        small tail that every query scores exhaustively. Costs O(appended
+        entries) plus O(n) array work instead of a full rebuild.
+        """
+        index = object.__new__(InvertedIndex)
+        index.__dict__.update(self.__dict__)
+        index.doc_terms = matrix.tocsr()
+        n_terms = matrix.shape[1]
+        grown = n_terms - (len(self.indptr) - 1)
+        if grown > 0:
+            # terms first seen in appended rows have no postings in the shared part
+            index.indptr = np.concatenate([self.indptr, np.full(grown, self.indptr[-1])])
+            index.max_weight = np.concatenate([self.max_weight, np.zeros(grown)])
+        tail = index.doc_terms[self.n_indexed:].tocsc()
+        tail.sort_indices()
+        index.tail = (tail.indptr, tail.indices + self.n_indexed, tail.data)
+        index._set_rows(ids, category_ids)
+        return index
+
+    def _set_rows(self, ids: np.ndarray, category_ids: np.ndarray) -> None:
+        self.n_docs = len(ids)
+        self.ids = ids
+        self.category_ids = category_ids
+
+        # fill order for zero-similarity articles: newest first, overall and per category
+        self.rows_by_id_desc = np.argsort(-ids, kind="stable")
+        by_category = self.rows_by_id_desc[np.argsort(category_ids[self.rows_by_id_desc], kind="stable")]
+        categories, starts = np.unique(category_ids[by_category], return_index=True)
+        self._category_rows = {
+            int(c): rows for c, rows in zip(categories, np.split(by_category, starts[1:]))
+        }
+
+        self._buffers = threading.local()
+
+    def _scratch(self):
+        # per-thread accumulators, reset after each query (only touched slots)
+        buf = self._buffers
+        if getattr(buf, "acc", None) is None or len(buf.acc) != self.n_docs:
+            buf.acc = np.zeros(self.n_docs)
+            buf.seen = np.zeros(self.n_docs, dtype=bool)
+        return buf.acc, buf.seen
+
+    def search(self, row: int, limit: int) -> np.ndarray:
+        """Rows of the top `limit` articles for the article at `row`."""
+        if limit <= 0:
+            return np.empty(0, dtype=np.int64)
+
+        current_category = int(self.category_ids[row])
+        need_same, need_other = self._group_sizes(row, limit)
+
+        start, end = self.doc_terms.indptr[row], self.doc_terms.indptr[row + 1]
+        q_terms = self.doc_terms.indices[start:end]
+        q_weights = self.doc_terms.data[start:end]
+
+        # most promising terms first; remaining[i] bounds what terms i.. can still add
+        upper = q_weights * self.max_weight[q_terms]
+        order = np.argsort(-upper, kind="stable")
+        q_terms, q_weights, upper = q_terms[order], q_weights[order], upper[order]
+        remaining = np.concatenate([np.cumsum(upper[::-1])[::-1], [0.0]])
+
+        acc, seen = self._scratch()
+        touched = []
+        try:
+            if self.tail is not None:
+                # appended rows are few: score them exactly before pruning the rest
+                t_indptr, t_docs, t_weights = self.tail
+                for term, q_weight in zip(q_terms, q_weights):
+                    lo, hi = t_indptr[term], t_indptr[term + 1]
+                    docs = t_docs[lo:hi]
+                    acc[docs] += t_weights[lo:hi] * q_weight
+                    fresh = docs[~seen[docs]]
+                    seen[fresh] = True
+                    touched.append(fresh)
+
+            stop = _StopRule(self.category_ids, row, current_category, need_same, need_other)
+            admitting = not stop.update(touched, acc, remaining[0])
+            for i, (term, q_weight) in enumerate(zip(q_terms, q_weights)):
+                lo, hi = self.indptr[term], self.indptr[term + 1]
+                docs = self.doc_index[lo:hi]
+                contrib = self.weights[lo:hi] * q_weight
+                if admitting:
+                    acc[docs] += contrib
+                    fresh = docs[~seen[docs]]
+                    seen[fresh] = True
+                    touched.append(fresh)
+                    admitting = not stop.update([fresh], acc, remaining[i + 1])
+                else:
+                    known = seen[docs]
+                    acc[docs[known]] += contrib[known]
+
+            candidates = np.concatenate(touched) if touched else np.empty(0, dtype=np.int64)
+            candidates = candidates[candidates != row]
+            return self._select(row, candidates, acc[candidates], seen, need_same, need_other)
+        finally:
+            for docs in touched:
+                acc[docs] = 0.0
+                seen[docs] = False
+
+    def rank_scored(self, row: int, candidates: np.ndarray, scores: np.ndarray, limit: int) -> np.ndarray:
+        """
+        Rank externally computed scores (e.g. one row of a blocked M @ M.T
+        product) with the same rules as search(). `candidates` are the rows
+        with non-zero similarity.
+        """
+        if limit <= 0:
+            return np.empty(0, dtype=np.int64)
+        _, seen = self._scratch()
+        seen[candidates] = True
+        try:
+            keep = candidates != row
+            need_same, need_other = self._group_sizes(row, limit)
+            return self._select(row, candidates[keep], scores[keep], seen, need_same, need_other)
+        finally:
+            seen[candidates] = False
+
+    def _group_sizes(self, row: int, limit: int):
+        # how many results come from the article's own category and from the rest
+        current_category = int(self.category_ids[row])
+        same_total = 0
+        if current_category != -1:
+            same_total = len(self._category_rows.get(current_category, ())) - 1
+        need_same = min(limit, same_total)
+        need_other = min(limit - need_same, self.n_docs - 1 - same_total)
+        return need_same, need_other
+
+    def _select(self, row, candidates, scores, seen, need_same, need_other) -> np.ndarray:
+        current_category = int(self.category_ids[row])
+        scores = np.round(scores, SCORE_DECIMALS)
+
+        if current_category == -1:
+            same_mask = np.zeros(len(candidates), dtype=bool)
+        else:
+            same_mask = self.category_ids[candidates] == current_category
+
+        same = self._top(candidates[same_mask], scores[same_mask], need_same)
+        if len(same) < need_same:
+            same = np.concatenate([same, self._fill(
+                self._category_rows[current_category], seen, row, need_same - len(same))])
+
+        other = self._top(candidates[~same_mask], scores[~same_mask], need_other)
+        if len(other) < need_other:
+            other = np.concatenate([other, self._fill(
+                self.rows_by_id_desc, seen, row, need_other - len(other),
+                exclude_category=current_category)])
+
+        return np.concatenate([same, other]).astype(np.int64)
+
+    def _top(self, rows: np.ndarray, scores: np.ndarray, k: int) -> np.ndarray:
+        if k <= 0 or len(rows) == 0:
+            return np.empty(0, dtype=np.int64)
+        if len(rows) > k:
+            # keep the k best plus anything tied with the k-th so ids can break ties
+            kth = np.argpartition(-scores, k - 1)[k - 1]
+            keep = scores >= scores[kth]
+            rows, scores = rows[keep], scores[keep]
+        order = np.lexsort((-self.ids[rows], -scores))
+        return rows[order][:k]
+
+    def _fill(self, fill_order: np.ndarray, seen: np.ndarray, row: int, k: int,
+              exclude_category=None) -> np.ndarray:
+        """First k rows of fill_order with zero similarity (never touched)."""
+        picked = []
+        chunk = max(64, 4 * k)
+        for start in range(0, len(fill_order), chunk):
+            block = fill_order[start:start + chunk]
+            keep = ~seen[block] & (block != row)
+            if exclude_category is not None and exclude_category != -1:
+                keep &= self.category_ids[block] != exclude_category
+            picked.extend(block[keep][:k - len(picked)])
+            if len(picked) >= k:
+                break
+        return np.array(picked, dtype=np.int64)
+
+
+class _StopRule:
+    """
+    When search() may stop admitting documents: an unseen document scores at
+    most the current bound, so it is irrelevant once both groups already
+    hold enough candidates scoring strictly above it. Scores only grow and
+    the bound only falls, so a candidate that crossed it stays above: only
+    the ones still below are re-checked, and each is counted once.
+    """
+
+    def __init__(self, category_ids, row, current_category, need_same, need_other):
+        self.category_ids = category_ids
+        self.row = row
+        self.current_category = current_category
+        self.need_same = need_same
+        self.need_other = need_other
+        self.above_same = 0
+        self.above_other = 0
+        self.below = np.empty(0, dtype=np.int64)
+
+    def update(self, fresh, acc, bound) -> bool:
+        """Add newly admitted rows; True once admission can stop."""
+        below = np.concatenate([self.below] + fresh)
+        below = below[below != self.row]
+        crossed = acc[below] > bound
+        if crossed.any():
+            above = below[crossed]
+            below = below[~crossed]
+            same = 0
+            if self.current_category != -1:
+                same = int(np.count_nonzero(self.category_ids[above] == self.current_category))
+            self.above_same += same
+            self.above_other += len(above) - same
+        self.below = below
+        return self.above_same >= self.need_same and self.above_other >= self.need_other
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.data.db import get_connection
+from app.services.heavy_hitters import LIKE_WEIGHT, MAX_MINUTES, MINUTE_WEIGHT
+
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
+
+# One engagement weight per event, same weights as PopularityStrategy
+WEIGHT_SQL = f"""
+        CASE event_type
+            WHEN 'view' THEN 1.0
+            WHEN 'like' THEN {LIKE_WEIGHT}.0
+            WHEN 'time_spent' THEN MIN(COALESCE(duration_ms, 0) / 60000.0, {MAX_MINUTES}) * {MINUTE_WEIGHT}
+            ELSE 0.0
+        END"""
+
+ENGAGEMENT_SQL = f"""
+    SELECT user_id, article_id, {WEIGHT_SQL} AS weight
+    FROM interaction_events
+    WHERE typeof(user_id) = 'integer' AND id <= ?
+"""
+
+# Catch-up read for a built model: a rowid range, so only the new events are
+# touched; anonymous rows are returned too so last_event_id moves past them
+ENGAGEMENT_SINCE_SQL = f"""
+    SELECT id, user_id, article_id, {WEIGHT_SQL} AS weight
+    FROM interaction_events
+    WHERE id > ?
+    ORDER BY id
+"""
+
+
+def event_weight(event_type: str, duration_ms: Optional[int]) -> float:
+    if event_type == "view":
+        return 1.0
+    if event_type == "like":
+        return float(LIKE_WEIGHT)
+    if event_type == "time_spent":
+        return min((duration_ms or 0) / 60000.0, MAX_MINUTES) * MINUTE_WEIGHT
+    return 0.0
+
+
+class ItemItemModel:
+    """
+    "People who engaged with X also engaged with Y" neighbours.
+
+    A user x article matrix of summed engagement weights (log1p-damped) is
+    read from interaction_events in chunks of `chunk_size` rows, each chunk
+    folded into the sparse matrix, so memory is bounded by the distinct
+    (user, article) pairs rather than the event count. Item-item cosine
+    similarity is computed with sparse products one block of articles at a
+    time (X[:, block].T @ X) and only the top `neighbors` per article are
+    kept in memory.
+
+    The database is the source of truth for updates: a logged batch only
+    marks the model stale (O(1), also while it is still building), and the
+    next read fetches every event with id > last_event_id, so events
+    committed during a rebuild or by other processes are never lost.
+    Changed (user, article) cells go to an overlay held as a small
+    correction matrix D next to the base matrix X; similarities are scored
+    against X + D without copying X and only the changed articles' norms
+    are recomputed. The overlay is merged into X once it holds more than
+    `merge_ratio` of X's entries. The touched articles and every article
+    the same users engaged with get their neighbours recomputed.
+    """
+
+    def __init__(self, neighbors: int = 50, chunk_size: int = 200000, block_size: int = 512,
+                 merge_ratio: float = 0.1):
+        self.neighbors = neighbors
+        self.chunk_size = chunk_size
+        self.block_size = block_size
+        self.merge_ratio = merge_ratio
+
+        self._lock = threading.RLock()
+        self._built = False
+        self._stale = False
+        self.user_index: Dict[int, int] = {}
+        self.item_index: Dict[int, int] = {}
+        self.item_ids = np.empty(0, dtype=np.int64)
+        self.counts: Optional[csr_matrix] = None  # raw summed weights, users x items (base)
+        self.matrix: Optional[csr_matrix] = None  # log1p(counts), what similarities use
+        self.by_item: Optional[csr_matrix] = None  # matrix transposed, items x users
+        self._sq_norms = np.empty(0)  # squared column norms of matrix + overlay
+        # (user row, item column) -> (raw count in base, raw count now)
+        self._overlay: Dict[Tuple[int, int], Tuple[float, float]] = {}
+        self._delta: Optional[csr_matrix] = None  # log1p(now) - log1p(base), users x items
+        self._delta_t: Optional[csr_matrix] = None
+        self._dirty: Set[int] = set()
+        self.last_event_id = 0
+
+    # Building
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def ensure_built(self) -> None:
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self.rebuild()
+
+    def rebuild(self) -> None:
+        counts, user_index, item_index, last_id = engagement_matrix(self.chunk_size)
+        with self._lock:
+            self.user_index = user_index
+            self.item_index = item_index
+            self.item_ids = np.array(sorted(item_index, key=item_index.get), dtype=np.int64)
+            self._set_base(counts)
+            self._neighbors = self._compute(np.arange(len(item_index)))
+            self._dirty = set()
+            # anything committed after last_id is read by the next _refresh()
+            self.last_event_id = int(last_id)
+            self._built = True
+
+    def _set_base(self, counts: csr_matrix) -> None:
+        counts.sort_indices()
+        self.counts = counts
+        self.matrix = counts.log1p()
+        self.by_item = self.matrix.T.tocsr()
+        self._sq_norms = np.asarray(self.by_item.multiply(self.by_item).sum(axis=1)).ravel()
+        self._overlay = {}
+        self._delta = self._delta_t = None
+
+    # Incremental updates
+
+    def on_events_logged(self, events) -> None:
+        """InteractionEventService listener: the next read catches up from the database."""
+        self._stale = True
+
+    def _refresh(self) -> None:
+        with self._lock:
+            if self._stale:
+                # cleared first: a batch logged during the read marks it again
+                self._stale = False
+                self._apply(self._events_since(self.last_event_id))
+            if self._dirty:
+                dirty = np.array(sorted(self._dirty), dtype=np.int64)
+                self._neighbors.update(self._compute(dirty))
+                self._dirty = set()
+
+    def _events_since(self, last_id: int) -> List[Tuple[int, int, float]]:
+        """(user_id, article_id, weight) of events after last_id; moves last_event_id."""
+        cur = get_connection().cursor()
+        cur.execute(ENGAGEMENT_SINCE_SQL, (last_id,))
+        pending = []
+        for event_id, user_id, article_id, weight in cur.fetchall():
+            self.last_event_id = max(self.last_event_id, int(event_id))
+            # rows that bypassed API validation may carry non-integer user ids
+            if isinstance(user_id, int) and weight > 0:
+                pending.append((user_id, int(article_id), float(weight)))
+        return pending
+
+    def _apply(self, pending) -> None:
+        if not pending:
+            return
+        from scipy.sparse import coo_matrix
+
+        users = [self.user_index.setdefault(u, len(self.user_index)) for u, _, _ in pending]
+        new_ids = []
+        for _, article_id, _ in pending:
+            if article_id not in self.item_index:
+                self.item_index[article_id] = len(self.item_index)
+                new_ids.append(article_id)
+        items = [self.item_index[a] for _, a, _ in pending]
+        if new_ids:
+            self.item_ids = np.concatenate([self.item_ids, np.array(new_ids, dtype=np.int64)])
+
+        shape = (len(self.user_index), len(self.item_index))
+        if shape != self.counts.shape:
+            self.counts = _resized(self.counts, shape)
+            self.matrix = _resized(self.matrix, shape)
+            self.by_item = _resized(self.by_item, shape[::-1])
+            self._sq_norms = np.concatenate([self._sq_norms, np.zeros(shape[1] - len(self._sq_norms))])
+
+        for user, item, (_, _, weight) in zip(users, items, pending):
+            base, now = self._overlay.get((user, item)) or (_cell(self.counts, user, item),) * 2
+            self._overlay[(user, item)] = (base, now + weight)
+
+        touched = np.unique(items)
+        if len(self._overlay) > self.merge_ratio * max(self.counts.nnz, 1):
+            cells = np.array(list(self._overlay), dtype=np.int64)
+            raw = np.array([now - base for base, now in self._overlay.values()])
+            self._set_base(self.counts + coo_matrix((raw, (cells[:, 0], cells[:, 1])), shape=shape).tocsr())
+        else:
+            cells = np.array(list(self._overlay), dtype=np.int64)
+            values = np.array([np.log1p(now) - np.log1p(base) for base, now in self._overlay.values()])
+            self._delta = coo_matrix((values, (cells[:, 0], cells[:, 1])), shape=shape).tocsr()
+            self._delta_t = self._delta.T.tocsr()
+            columns = self._item_rows(touched)
+            self._sq_norms[touched] = np.asarray(columns.multiply(columns).sum(axis=1)).ravel()
+
+        # similarities change for the touched items and everything their users engaged with
+        engaged = self.matrix[np.unique(users)]
+        if self._delta is not None:
+            engaged = engaged + self._delta[np.unique(users)]
+        self._dirty.update(int(i) for i in touched)
+        self._dirty.update(int(i) for i in np.unique(engaged.indices))
+
+    def _item_rows(self, items: np.ndarray) -> csr_matrix:
+        """Columns of matrix + overlay for the given items, as items x users rows."""
+        rows = self.by_item[items]
+        return rows if self._delta_t is None else rows + self._delta_t[items]
+
+    # Similarity
+
+    def _compute(self, items: np.ndarray) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+        """Top neighbours (article ids, cosine scores) of the given item columns."""
+        result: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        if self.matrix is None or self.matrix.shape[1] == 0:
+            return result
+        norms = np.sqrt(self._sq_norms)
+        norms[norms == 0] = 1.0
+
+        for start in range(0, len(items), self.block_size):
+            block = items[start:start + self.block_size]
+            rows = self._item_rows(block)
+            # block x items co-engagement against X + D, without materialising X + D
+            products = rows @ self.matrix
+            if self._delta is not None:
+                products = products + rows @ self._delta
+            products = products.tocsr()
+            for i, item in enumerate(block):
+                lo, hi = products.indptr[i], products.indptr[i + 1]
+                cols = products.indices[lo:hi]
+                scores = products.data[lo:hi] / (norms[item] * norms[cols])
+                keep = (cols != item) & (scores > 0)
+                cols, scores = cols[keep], scores[keep]
+                if len(cols) > self.neighbors:
+                    top = np.argpartition(-scores, self.neighbors - 1)[:self.neighbors]
+                    cols, scores = cols[top], scores[top]
+                ids = self.item_ids[cols]
+                order = np.lexsort((-ids, -np.round(scores, 10)))
+                result[int(self.item_ids[item])] = (ids[order], scores[order])
+        return result
+
+    def neighbors_of(self, article_id: int, limit: int) -> List[Tuple[int, float]]:
+        """(article_id, cosine) of the most co-engaged articles, best first."""
+        self.ensure_built()
+        self._refresh()
+        ids, scores = self._neighbors.get(article_id, (np.empty(0, dtype=np.int64), np.empty(0)))
+        return [(int(i), float(s)) for i, s in zip(ids[:limit], scores[:limit])]
+
+    def stats(self):
+        return {
+            "users": len(self.user_index),
+            "articles": len(self.item_index),
+            "pairs": int(self.counts.nnz) if self.counts is not None else 0,
+            "overlay_pairs": len(self._overlay),
+            "last_event_id": self.last_event_id,
+        }
+
+
+def engagement_matrix(chunk_size: int = 200000):
+    """
+    Summed engagement weights per (user, article) as a users x articles CSR
+    matrix, read from interaction_events `chunk_size` rows at a time.
+    Returns (matrix, {user_id: row}, {article_id: column}, last event id read).
+    """
+    # scipy is imported on first use: it dominates app import time
+    from scipy.sparse import coo_matrix, csr_matrix
+
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT COALESCE(MAX(id), 0) FROM interaction_events")
+    (last_id,) = cur.fetchone()
+
+    user_index: Dict[int, int] = {}
+    item_index: Dict[int, int] = {}
+    counts = csr_matrix((0, 0))
+    cur.execute(ENGAGEMENT_SQL, (last_id,))
+    while True:
+        rows = cur.fetchmany(chunk_size)
+        if not rows:
+            break
+        chunk = np.array([tuple(r) for r in rows], dtype=np.float64)
+        user_rows = np.fromiter(
+            (user_index.setdefault(int(u), len(user_index)) for u in chunk[:, 0]),
+            dtype=np.int64, count=len(chunk))
+        item_cols = np.fromiter(
+            (item_index.setdefault(int(a), len(item_index)) for a in chunk[:, 1]),
+            dtype=np.int64, count=len(chunk))
+        shape = (len(user_index), len(item_index))
+        delta = coo_matrix((chunk[:, 2], (user_rows, item_cols)), shape=shape).tocsr()
+        counts = _resized(counts, shape) + delta
+
+    counts = counts.tocsr()
+    counts.eliminate_zeros()
+    return counts, user_index, item_index, int(last_id)
+
+
+def _resized(matrix: csr_matrix, shape) -> csr_matrix:
+    from scipy.sparse import csr_matrix
+
+    # grow a CSR matrix to a larger shape without copying its entries
+    if matrix.shape == shape:
+        return matrix
+    indptr = matrix.indptr
+    if shape[0] > matrix.shape[0]:
+        indptr = np.concatenate([indptr, np.full(shape[0] - matrix.shape[0], indptr[-1])])
+    return csr_matrix((matrix.data, matrix.indices, indptr), shape=shape)
+
+
+def _cell(matrix: csr_matrix, row: int, col: int) -> float:
+    # value of one entry of a CSR matrix with sorted indices
+    lo, hi = matrix.indptr[row], matrix.indptr[row + 1]
+    i = lo + np.searchsorted(matrix.indices[lo:hi], col)
+    return float(matrix.data[i]) if i < hi and matrix.indices[i] == col else 0.0
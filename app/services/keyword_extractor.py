@@ -0,0 +1,72 @@
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.repositories.keyword_repository import KeywordRepository
+
+logger = logging.getLogger("article_engine")
+
+
+class KeywordExtractor:
+    """
+    Keeps article_keywords in step with the shared ContentIndex.
+
+    Articles are keyworded as they are created (once the index is built;
+    earlier ones are picked up by extract_all() or on first read), and the
+    whole corpus is re-keyworded in a background thread whenever the index
+    is refitted, since a refit changes every IDF weight.
+    """
+
+    def __init__(self, content_index, repo: Optional[KeywordRepository] = None,
+                 top_n: int = 10, chunk_size: int = 1000):
+        self.content_index = content_index
+        self.repo = repo or KeywordRepository()
+        self.top_n = top_n
+        self.chunk_size = chunk_size
+
+        self._lock = threading.Lock()
+        self._running = False
+        self._rerun = False
+
+    def extract(self, article_ids: Sequence[int]) -> Dict[int, List[Tuple[str, float]]]:
+        """Compute and store the keywords of the given articles."""
+        keywords = self.content_index.keyword_weights(list(article_ids), top_n=self.top_n)
+        if keywords:
+            self.repo.replace_many(list(keywords.items()))
+        return keywords
+
+    def extract_all(self) -> int:
+        """Re-keyword every indexed article, one transaction per chunk."""
+        self.content_index.ensure_built()
+        ids = [a.id for a in self.content_index.articles]
+        for start in range(0, len(ids), self.chunk_size):
+            self.extract(ids[start:start + self.chunk_size])
+        return len(ids)
+
+    def on_article_created(self, article_id: int) -> None:
+        """ArticleRepository listener; register after ContentIndex.on_article_created."""
+        if self.content_index.built:
+            self.extract([article_id])
+
+    def on_index_refit(self) -> None:
+        """ContentIndex refit listener: re-keyword the corpus without blocking the caller."""
+        with self._lock:
+            if self._running:
+                # a run is in progress with the old weights; go again once it ends
+                self._rerun = True
+                return
+            self._running = True
+        threading.Thread(target=self._run_all, name="keyword-extractor", daemon=True).start()
+
+    def _run_all(self) -> None:
+        while True:
+            try:
+                n = self.extract_all()
+                logger.info(f"Re-keyworded {n} articles after index refit")
+            except Exception:
+                logger.exception("Keyword extraction after index refit failed")
+            with self._lock:
+                if not self._rerun:
+                    self._running = False
+                    return
+                self._rerun = False
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FILES = ("user_factors", "item_factors", "user_ids", "item_ids", "item_norms")
+# symlink to the published version directory, swapped atomically by save_factors
+CURRENT = "current"
+# versions kept on disk: the published one plus the previous, which a process
+# that resolved CURRENT just before a swap may still be opening
+KEEP_VERSIONS = 2
+
+
+def train_als(engagement, factors: int = 32, regularization: float = 0.1, alpha: float = 10.0,
+              iterations: int = 10, seed: int = 42) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Implicit-feedback ALS (Hu, Koren & Volinsky). `engagement` is a users x
+    items CSR matrix r; preference is 1 where r > 0 and confidence is
+    1 + alpha * r. Alternates exact least-squares solves for user and item
+    factors, using the YtY + Yt(Cu - I)Y trick so each row only touches
+    the items it has engagement with. Returns (user_factors, item_factors).
+    """
+    rng = np.random.default_rng(seed)
+    by_user = engagement.tocsr().astype(np.float64) * alpha  # C - I
+    by_item = by_user.T.tocsr()
+
+    users = rng.normal(scale=0.01, size=(by_user.shape[0], factors))
+    items = rng.normal(scale=0.01, size=(by_user.shape[1], factors))
+    for _ in range(iterations):
+        users = _least_squares(by_user, items, regularization)
+        items = _least_squares(by_item, users, regularization)
+    return users, items
+
+
+def _least_squares(confidence, fixed: np.ndarray, regularization: float) -> np.ndarray:
+    factors = fixed.shape[1]
+    gram = fixed.T @ fixed + regularization * np.eye(factors)
+    solved = np.zeros((confidence.shape[0], factors))
+    for row in range(confidence.shape[0]):
+        lo, hi = confidence.indptr[row], confidence.indptr[row + 1]
+        if lo == hi:
+            continue
+        y = fixed[confidence.indices[lo:hi]]
+        c = confidence.data[lo:hi]
+        a = gram + (y.T * c) @ y
+        b = y.T @ (1.0 + c)
+        solved[row] = np.linalg.solve(a, b)
+    return solved
+
+
+def save_factors(directory: str, user_ids: Sequence[int], item_ids: Sequence[int],
+                 user_factors: np.ndarray, item_factors: np.ndarray, **metadata) -> str:
+    """
+    Write factor matrices as .npy files, rows sorted by id so lookups are a
+    binary search on the (memory-mapped) id arrays. Every training run gets
+    its own version directory; once all files are written the CURRENT
+    symlink is swapped to it in one rename, so a load never mixes arrays of
+    two runs. Running servers keep their old mapping until restarted.
+    Returns the version directory.
+    """
+    os.makedirs(directory, exist_ok=True)
+    user_ids = np.asarray(user_ids, dtype=np.int64)
+    item_ids = np.asarray(item_ids, dtype=np.int64)
+    user_order, item_order = np.argsort(user_ids), np.argsort(item_ids)
+    item_factors = np.ascontiguousarray(item_factors[item_order], dtype=np.float32)
+
+    arrays = {
+        "user_factors": np.ascontiguousarray(user_factors[user_order], dtype=np.float32),
+        "item_factors": item_factors,
+        "user_ids": user_ids[user_order],
+        "item_ids": item_ids[item_order],
+        "item_norms": np.linalg.norm(item_factors, axis=1).astype(np.float32),
+    }
+    version = f"v{time.time_ns()}"
+    version_dir = os.path.join(directory, version)
+    os.makedirs(version_dir)
+    for name, array in arrays.items():
+        np.save(os.path.join(version_dir, f"{name}.npy"), array)
+    with open(os.path.join(version_dir, "model.json"), "w", encoding="utf-8") as f:
+        json.dump({"trained_at": time.time(), "factors": int(item_factors.shape[1]), **metadata}, f)
+
+    tmp = os.path.join(directory, f"{CURRENT}.tmp.{os.getpid()}")
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    os.symlink(version, tmp)
+    os.replace(tmp, os.path.join(directory, CURRENT))
+    _prune_versions(directory)
+    return version_dir
+
+
+def _prune_versions(directory: str) -> None:
+    # names are v<ns>: same length for centuries, so they sort by age
+    versions = sorted(
+        name for name in os.listdir(directory)
+        if name.startswith("v") and name[1:].isdigit() and os.path.isdir(os.path.join(directory, name))
+    )
+    for name in versions[:-KEEP_VERSIONS]:
+        # mapped pages of a deleted file stay valid in the processes using them
+        shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+def model_directory(directory: str) -> str:
+    """The published version directory (flat layout of older trainings otherwise)."""
+    current = os.path.join(directory, CURRENT)
+    # resolved once, so all files are opened from the same version
+    return os.path.realpath(current) if os.path.lexists(current) else directory
+
+
+class MatrixFactorizationModel:
+    """
+    Read side of the ALS factors written by train_als.py.
+
+    Arrays are opened with np.load(mmap_mode="r"), so every worker process
+    maps the same files and shares their pages. Similar articles are the
+    cosine of item factors and personal recommendations the dot product
+    with the user's factors: one matrix-vector product plus argpartition.
+    """
+
+    def __init__(self, user_factors, item_factors, user_ids, item_ids, item_norms):
+        self.user_factors = user_factors
+        self.item_factors = item_factors
+        self.user_ids = user_ids
+        self.item_ids = item_ids
+        self.item_norms = item_norms
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["MatrixFactorizationModel"]:
+        """Memory-map a trained model; None if it has not been trained yet."""
+        directory = model_directory(directory)
+        paths = [os.path.join(directory, f"{name}.npy") for name in FILES]
+        if not all(os.path.exists(p) for p in paths):
+            return None
+        return cls(*(np.load(p, mmap_mode="r") for p in paths))
+
+    def _row(self, ids: np.ndarray, key: int) -> Optional[int]:
+        i = int(np.searchsorted(ids, key))
+        return i if i < len(ids) and ids[i] == key else None
+
+    def has_user(self, user_id: int) -> bool:
+        return self._row(self.user_ids, user_id) is not None
+
+    def similar_items(self, article_id: int, limit: int) -> List[int]:
+        row = self._row(self.item_ids, article_id)
+        if row is None or self.item_norms[row] == 0:
+            return []
+        norms = self.item_norms * self.item_norms[row]
+        scores = np.divide(self.item_factors @ self.item_factors[row], norms,
+                           out=np.zeros(len(norms), dtype=np.float32), where=norms > 0)
+        scores[row] = -np.inf
+        return self._top(scores, limit)
+
+    def recommend_for_user(self, user_id: int, limit: int,
+                           exclude_article_ids: Sequence[int] = ()) -> List[int]:
+        row = self._row(self.user_ids, user_id)
+        if row is None:
+            return []
+        scores = self.item_factors @ self.user_factors[row]
+        for article_id in exclude_article_ids:
+            item = self._row(self.item_ids, article_id)
+            if item is not None:
+                scores[item] = -np.inf
+        return self._top(scores, limit)
+
+    def _top(self, scores: np.ndarray, limit: int) -> List[int]:
+        limit = min(limit, int(np.count_nonzero(np.isfinite(scores))))
+        if limit <= 0:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        # best first, ties by newest id
+        order = np.lexsort((-self.item_ids[top], -scores[top]))
+        return [int(i) for i in self.item_ids[top[order]]]
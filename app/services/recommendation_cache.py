@@ -0,0 +1,144 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.cache import LRUCache
+from app.models.article import Article
+
+
+class DataVersion:
+    """
+    Cheap, monotonically increasing versions of the data recommendations
+    depend on. The article version moves on every insert; the engagement
+    version only moves once per `engagement_bucket` logged events, so
+    popularity results may lag by up to that many events.
+    """
+
+    def __init__(self, engagement_bucket: int = 100):
+        self.engagement_bucket = max(1, engagement_bucket)
+        self._articles = 0
+        self._events = 0
+        self._lock = threading.Lock()
+
+    def on_article_created(self, article_id: int) -> None:
+        with self._lock:
+            self._articles += 1
+
+    def on_events_logged(self, events) -> None:
+        with self._lock:
+            self._events += len(events)
+
+    @property
+    def articles(self) -> int:
+        return self._articles
+
+    @property
+    def engagement(self) -> int:
+        return self._events // self.engagement_bucket
+
+    def current(self, uses_engagement: bool) -> Tuple[int, int]:
+        return (self._articles, self.engagement if uses_engagement else 0)
+
+
+class RecommendationCache:
+    """
+    Memoizes strategy results keyed by (strategy name, article_id, limit).
+
+    An entry is served only while the DataVersion it was computed under is
+    still current and it is younger than `max_staleness` seconds; the age
+    limit also covers writes made by other worker processes.
+    """
+
+    def __init__(self, version: DataVersion, maxsize: int = 10000,
+                 max_staleness: Optional[float] = 60):
+        self.version = version
+        self.entries = LRUCache(maxsize=maxsize, ttl=max_staleness)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.time_saved = 0.0
+
+    def wrap(self, name: str, strategy, uses_engagement: bool = True) -> "CachedStrategy":
+        return CachedStrategy(name=name, inner=strategy, cache=self, uses_engagement=uses_engagement)
+
+    def lookup(self, key, version) -> Optional[List[Article]]:
+        entry = self.entries.get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            entry_version, results, compute_seconds = entry
+            if entry_version != version:
+                self.stale += 1
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.time_saved += compute_seconds
+        return results
+
+    def store(self, key, version, results: List[Article], compute_seconds: float) -> None:
+        self.entries.set(key, (version, results, compute_seconds))
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "maxsize": self.entries.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "time_saved_ms": round(self.time_saved * 1000.0, 2),
+            "article_version": self.version.articles,
+            "engagement_version": self.version.engagement,
+        }
+
+
+class CachedStrategy:
+    """RecommendationStrategy wrapper that serves results from a RecommendationCache."""
+
+    def __init__(self, name: str, inner, cache: RecommendationCache, uses_engagement: bool = True):
+        self.name = name
+        self.inner = inner
+        self.cache = cache
+        self.uses_engagement = uses_engagement
+
+    def recommend(self, article_id: int, limit: int = 5) -> List[Article]:
+        key = (self.name, article_id, limit)
+        # read the version before computing so a concurrent write can only make the entry stale
+        version = self.cache.version.current(self.uses_engagement)
+
+        results = self.cache.lookup(key, version)
+        if results is not None:
+            return list(results)
+
+        start = time.perf_counter()
+        results = self.inner.recommend(article_id=article_id, limit=limit)
+        self.cache.store(key, version, list(results), time.perf_counter() - start)
+        return results
+
+    def recommend_many(self, article_ids: List[int], limit: int = 5) -> Dict[int, List[Article]]:
+        """Cached seeds are served from the cache, the rest in one inner.recommend_many() call."""
+        version = self.cache.version.current(self.uses_engagement)
+        results: Dict[int, List[Article]] = {}
+        missing = []
+        for article_id in dict.fromkeys(article_ids):
+            cached = self.cache.lookup((self.name, article_id, limit), version)
+            if cached is None:
+                missing.append(article_id)
+            else:
+                results[article_id] = list(cached)
+
+        if missing:
+            start = time.perf_counter()
+            computed = self.inner.recommend_many(missing, limit=limit)
+            # the batch's cost, shared evenly for the time_saved statistic
+            per_seed = (time.perf_counter() - start) / len(missing)
+            for article_id, recs in computed.items():
+                self.cache.store((self.name, article_id, limit), version, list(recs), per_seed)
+            results.update(computed)
+        return results
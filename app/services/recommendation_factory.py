@@ -1,21 +1,82 @@
+from app.services.item_similarity import ItemItemModel
 from app.services.recommendation_strategies import (
+    CollaborativeStrategy,
+    MatrixFactorizationStrategy,
     PopularityStrategy,
     ContentBasedStrategy,
     HybridStrategy,
     RecommendationStrategy,
+    TrendingStrategy,
 )
+from app.services.trending_service import TrendingService
 
 class RecommendationFactory:
     @staticmethod
-    def create(strategy_name: str, article_service, event_service) -> RecommendationStrategy:
+    def create(strategy_name: str, article_service, event_service, content_index=None, cache=None,
+               related_articles=None, trending=None, popularity=None,
+               item_model=None, mf_model=None) -> RecommendationStrategy:
         name = (strategy_name or "").strip().lower()
 
         if name in ["content", "content_based", "content-based"]:
-            return ContentBasedStrategy(article_service=article_service)
+            strategy = ContentBasedStrategy(
+                article_service=article_service,
+                content_index=content_index,
+                related_articles=related_articles,
+            )
+            # content similarity does not depend on engagement
+            return cache.wrap("content", strategy, uses_engagement=False) if cache else strategy
 
         if name in ["hybrid", "mixed", "mix", "combined"]:
-            content = ContentBasedStrategy(article_service=article_service)
-            popularity = PopularityStrategy(article_service=article_service, event_service=event_service)
-            return HybridStrategy(content_strategy=content, popularity_strategy=popularity)
+            content = ContentBasedStrategy(
+                article_service=article_service,
+                content_index=content_index,
+                related_articles=related_articles,
+            )
+            popular = PopularityStrategy(
+                article_service=article_service, event_service=event_service, ranking=popularity
+            )
+            strategy = HybridStrategy(content_strategy=content, popularity_strategy=popular)
+            return cache.wrap("hybrid", strategy) if cache else strategy
 
-        return PopularityStrategy(article_service=article_service, event_service=event_service)
+        if name in ["collaborative", "cf", "item-item", "item_item"]:
+            strategy = CollaborativeStrategy(
+                article_service=article_service,
+                model=item_model or ItemItemModel(),
+                fallback=ContentBasedStrategy(
+                    article_service=article_service,
+                    content_index=content_index,
+                    related_articles=related_articles,
+                ),
+            )
+            return cache.wrap("collaborative", strategy) if cache else strategy
+
+        if name in ["als", "mf", "matrix_factorization"]:
+            strategy = MatrixFactorizationStrategy(
+                article_service=article_service,
+                model=mf_model,
+                fallback=ContentBasedStrategy(
+                    article_service=article_service,
+                    content_index=content_index,
+                    related_articles=related_articles,
+                ),
+                popularity=PopularityStrategy(
+                    article_service=article_service, event_service=event_service, ranking=popularity
+                ),
+            )
+            # factors only change when train_als.py runs (and the app restarts)
+            return cache.wrap("als", strategy, uses_engagement=False) if cache else strategy
+
+        if name in ["trending", "trend", "hot"]:
+            strategy = TrendingStrategy(
+                article_service=article_service,
+                trending=trending or TrendingService(),
+                fallback=PopularityStrategy(
+                    article_service=article_service, event_service=event_service, ranking=popularity
+                ),
+            )
+            return cache.wrap("trending", strategy) if cache else strategy
+
+        strategy = PopularityStrategy(
+            article_service=article_service, event_service=event_service, ranking=popularity
+        )
+        return cache.wrap("popular", strategy) if cache else strategy
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Protocol
+from typing import TYPE_CHECKING, Dict, List, Optional, Protocol
 
 from app.models.article import Article
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+if TYPE_CHECKING:
+    from app.services.content_index import ContentIndex
 
 from dataclasses import dataclass
 from typing import List
@@ -17,13 +17,74 @@ class RecommendationStrategy(Protocol):
     def recommend(self, article_id: int, limit: int = 5) -> List[Article]:
         ...
 
+    def recommend_many(self, article_ids: List[int], limit: int = 5) -> Dict[int, List[Article]]:
+        """recommend() for every seed id (same results), sharing work across seeds."""
+        ...
+
+
+def articles_by_seed(article_service, ids_by_seed: Dict[int, List[int]]) -> Dict[int, List[Article]]:
+    """Resolve every seed's id list with a single get_articles() call."""
+    wanted = list(dict.fromkeys(i for ids in ids_by_seed.values() for i in ids))
+    found = {a.id: a for a in article_service.get_articles(wanted)}
+    return {seed: [found[i] for i in ids if i in found] for seed, ids in ids_by_seed.items()}
+
+
+def existing_ids(article_service, ids: List[int]) -> List[int]:
+    """`ids` that still have an article row, in order."""
+    # rankings built from events or trained offline may name deleted articles
+    found = {a.id for a in article_service.get_articles(ids)}
+    return [i for i in ids if i in found]
+
+
+def without_seed(ranked_ids: List[int], seed: int, limit: int) -> List[int]:
+    """A shared ranking (fetched with limit + 1) as recommend() would return it for `seed`."""
+    return [i for i in ranked_ids if i != seed][:limit]
+
 
 @dataclass
 class PopularityStrategy:
     article_service: any
     event_service: any
+    # in-memory ranking (HeavyHittersTracker) used instead of article_stats
+    ranking: any = None
 
     def recommend(self, article_id: int, limit: int = 5) -> List[Article]:
+        if self.ranking is not None:
+            ids = existing_ids(self.article_service, self.ranking.popular_article_ids(limit + 1))
+            ids = without_seed(ids, article_id, limit)
+            if len(ids) >= limit:
+                return self.article_service.get_articles(ids)
+            # too few (existing) articles tracked yet, e.g. cold start: rank from the database
+
+        # ranked straight from the materialized article_stats table
+        ranked_ids = getattr(self.event_service, "popular_article_ids", None)
+        if ranked_ids is not None:
+            ids = ranked_ids(limit, exclude_article_id=article_id)
+            return self.article_service.get_articles(ids)
+
+        return self._score_all(article_id, limit)
+
+    def recommend_many(self, article_ids: List[int], limit: int = 5) -> Dict[int, List[Article]]:
+        seeds = list(dict.fromkeys(article_ids))
+        # the ranking does not depend on the seed: load it once, drop each seed from it
+        ids_by_seed: Dict[int, List[int]] = {}
+        if self.ranking is not None:
+            ranked = existing_ids(self.article_service, self.ranking.popular_article_ids(limit + 1))
+            ids_by_seed = {seed: without_seed(ranked, seed, limit) for seed in seeds}
+            ids_by_seed = {seed: ids for seed, ids in ids_by_seed.items() if len(ids) >= limit}
+
+        cold = [seed for seed in seeds if seed not in ids_by_seed]
+        ranked_ids = getattr(self.event_service, "popular_article_ids", None)
+        if cold and ranked_ids is None:
+            return {**articles_by_seed(self.article_service, ids_by_seed),
+                    **{seed: self._score_all(seed, limit) for seed in cold}}
+        if cold:
+            ranked = ranked_ids(limit + 1)
+            ids_by_seed.update({seed: without_seed(ranked, seed, limit) for seed in cold})
+        return articles_by_seed(self.article_service, ids_by_seed)
+
+    def _score_all(self, article_id: int, limit: int) -> List[Article]:
+        # event services without materialized stats: score every article
         all_articles = self.article_service.list_articles()
 
         scored = []
@@ -48,67 +109,157 @@ class PopularityStrategy:
 
 
 @dataclass
-class ContentBasedStrategy:
+class TrendingStrategy:
     article_service: any
+    trending: any  # TrendingService
+    # PopularityStrategy used to fill the list when too few articles are trending
+    fallback: any = None
 
     def recommend(self, article_id: int, limit: int = 5) -> List[Article]:
-        current = self.article_service.get_article(article_id)
-        if not current:
-            return []
-
-        all_articles = self.article_service.list_articles()
-        if not all_articles:
-            return []
-
-        # text = title + content + category_name
-        def build_text(a: Article) -> str:
-            title = (a.title or "").strip()
-            content = (a.content or "").strip()
-            category = (a.category_name or "").strip()
-            return f"{title} {content} {category}".strip()
-
-        texts = [build_text(a) for a in all_articles]
+        ids = existing_ids(self.article_service,
+                           self.trending.trending_article_ids(limit, exclude_article_id=article_id))
+        if len(ids) < limit and self.fallback is not None:
+            seen = set(ids)
+            for a in self.fallback.recommend(article_id, limit=limit + len(ids)):
+                if a.id not in seen and len(ids) < limit:
+                    ids.append(a.id)
+                    seen.add(a.id)
+        return self.article_service.get_articles(ids)
+
+    def recommend_many(self, article_ids: List[int], limit: int = 5) -> Dict[int, List[Article]]:
+        seeds = list(dict.fromkeys(article_ids))
+        # decayed scores are computed once for the whole batch
+        ranked = existing_ids(self.article_service, self.trending.trending_article_ids(limit + 1))
+        ids_by_seed = {seed: without_seed(ranked, seed, limit) for seed in seeds}
+
+        short = [seed for seed, ids in ids_by_seed.items() if len(ids) < limit]
+        if short and self.fallback is not None:
+            # popularity rankings are prefix-stable, so one longer list covers every seed
+            filler = self.fallback.recommend_many(short, limit=2 * limit)
+            for seed in short:
+                ids = ids_by_seed[seed]
+                seen = set(ids)
+                for a in filler[seed]:
+                    if a.id not in seen and len(ids) < limit:
+                        ids.append(a.id)
+                        seen.add(a.id)
+        return articles_by_seed(self.article_service, ids_by_seed)
 
-        idx = None
-        for i, a in enumerate(all_articles):
-            if a.id == article_id:
-                idx = i
-                break
-        if idx is None:
-            return []
 
-        vectorizer = TfidfVectorizer(
-            lowercase=True,
-            max_features=5000,
-            stop_words="english"
-        )
-        tfidf_matrix = vectorizer.fit_transform(texts)
+@dataclass
+class CollaborativeStrategy:
+    article_service: any
+    model: any  # ItemItemModel
+    # used when the article has too few co-engaged neighbours (e.g. no user events yet)
+    fallback: any = None
 
-        sims = cosine_similarity(tfidf_matrix[idx], tfidf_matrix).flatten()
+    def recommend(self, article_id: int, limit: int = 5) -> List[Article]:
+        ids = [i for i, _ in self.model.neighbors_of(article_id, limit)]
+        results = self.article_service.get_articles(ids)
+        if len(results) < limit and self.fallback is not None:
+            seen = {a.id for a in results} | {article_id}
+            for a in self.fallback.recommend(article_id, limit=limit + len(results)):
+                if a.id not in seen and len(results) < limit:
+                    results.append(a)
+                    seen.add(a.id)
+        return results
+
+    def recommend_many(self, article_ids: List[int], limit: int = 5) -> Dict[int, List[Article]]:
+        seeds = list(dict.fromkeys(article_ids))
+        results = articles_by_seed(self.article_service, {
+            seed: [i for i, _ in self.model.neighbors_of(seed, limit)] for seed in seeds
+        })
+        short = [seed for seed in seeds if len(results[seed]) < limit]
+        if short and self.fallback is not None:
+            filler = self.fallback.recommend_many(short, limit=2 * limit)
+            for seed in short:
+                seen = {a.id for a in results[seed]} | {seed}
+                for a in filler[seed]:
+                    if a.id not in seen and len(results[seed]) < limit:
+                        results[seed].append(a)
+                        seen.add(a.id)
+        return results
 
-        current_category_id = getattr(current, "category_id", None)
 
-        same_category_scored = []
-        other_scored = []
+@dataclass
+class MatrixFactorizationStrategy:
+    article_service: any
+    model: any  # MatrixFactorizationModel, None until train_als.py has run
+    # article-based fallback for untrained models / articles without factors
+    fallback: any = None
+    # ranking for users without factors
+    popularity: any = None
 
-        for i, sim in enumerate(sims):
-            a = all_articles[i]
-            if a.id == article_id:
-                continue
+    def recommend(self, article_id: int, limit: int = 5) -> List[Article]:
+        ids = self.model.similar_items(article_id, limit) if self.model is not None else []
+        results = self.article_service.get_articles(ids)
+        if len(results) < limit and self.fallback is not None:
+            return self.fallback.recommend(article_id, limit=limit)
+        return results
+
+    def recommend_many(self, article_ids: List[int], limit: int = 5) -> Dict[int, List[Article]]:
+        seeds = list(dict.fromkeys(article_ids))
+        results = articles_by_seed(self.article_service, {
+            seed: self.model.similar_items(seed, limit) if self.model is not None else [] for seed in seeds
+        })
+        short = [seed for seed in seeds if len(results[seed]) < limit]
+        if short and self.fallback is not None:
+            results.update(self.fallback.recommend_many(short, limit=limit))
+        return results
+
+    def recommend_for_user(self, user_id: int, limit: int = 5,
+                           exclude_article_ids=()) -> List[Article]:
+        ids = []
+        if self.model is not None:
+            ids = self.model.recommend_for_user(user_id, limit, exclude_article_ids=exclude_article_ids)
+        # the factors may name articles deleted since training
+        results = self.article_service.get_articles(ids)
+        if len(results) < limit and self.popularity is not None:
+            seen = {a.id for a in results} | set(exclude_article_ids)
+            for a in self.popularity.recommend(None, limit=limit + len(seen)):
+                if a.id not in seen and len(results) < limit:
+                    results.append(a)
+                    seen.add(a.id)
+        return results
 
-            item = (float(sim), a)
 
-            if current_category_id is not None and getattr(a, "category_id", None) == current_category_id:
-                same_category_scored.append(item)
-            else:
-                other_scored.append(item)
+@dataclass
+class ContentBasedStrategy:
+    article_service: any
+    content_index: Optional[ContentIndex] = None
+    # RelatedArticlesRepository: serve neighbours precomputed offline
+    related_articles: any = None
 
-        same_category_scored.sort(key=lambda x: x[0], reverse=True)
-        other_scored.sort(key=lambda x: x[0], reverse=True)
+    def recommend(self, article_id: int, limit: int = 5) -> List[Article]:
+        if self.related_articles is not None:
+            ids = self.related_articles.neighbor_ids(article_id, limit)
+            if len(ids) >= limit:
+                return self.article_service.get_articles(ids)
+            # not processed yet (or fewer neighbours stored): score live
+
+        return self._index().similar(article_id, limit=limit)
+
+    def recommend_many(self, article_ids: List[int], limit: int = 5) -> Dict[int, List[Article]]:
+        seeds = list(dict.fromkeys(article_ids))
+        precomputed: Dict[int, List[int]] = {}
+        if self.related_articles is not None:
+            for seed in seeds:
+                ids = self.related_articles.neighbor_ids(seed, limit)
+                if len(ids) >= limit:
+                    precomputed[seed] = ids
+
+        live = [seed for seed in seeds if seed not in precomputed]
+        # one index (fitted once) and one sparse product per block of seeds
+        results = self._index().similar_many(live, limit=limit) if live else {}
+        return {**articles_by_seed(self.article_service, precomputed), **results}
+
+    def _index(self) -> ContentIndex:
+        # without a shared index fall back to a throwaway one (fits per call)
+        if self.content_index is not None:
+            return self.content_index
+        from app.services.content_index import ContentIndex
+        return ContentIndex(self.article_service)
 
-        ranked = same_category_scored + other_scored
-        return [a for score, a in ranked[:limit]]
-    
 @dataclass
 class HybridStrategy:
         content_strategy: any
@@ -117,7 +268,16 @@ class HybridStrategy:
         def recommend(self, article_id: int, limit: int = 5) -> List[Article]:
             content_recs = self.content_strategy.recommend(article_id=article_id, limit=limit)
             pop_recs = self.popularity_strategy.recommend(article_id=article_id, limit=limit)
+            return self._merge(article_id, content_recs, pop_recs, limit)
+
+        def recommend_many(self, article_ids: List[int], limit: int = 5) -> Dict[int, List[Article]]:
+            content = self.content_strategy.recommend_many(article_ids, limit=limit)
+            popular = self.popularity_strategy.recommend_many(article_ids, limit=limit)
+            return {seed: self._merge(seed, content[seed], popular[seed], limit) for seed in content}
 
+        @staticmethod
+        def _merge(article_id: int, content_recs: List[Article], pop_recs: List[Article],
+                   limit: int) -> List[Article]:
             merged = []
             seen = set()
 
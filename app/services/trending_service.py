@@ -0,0 +1,48 @@
+import heapq
+from typing import Dict, List, Optional
+
+from app.repositories.event_bucket_repository import EventBucketRepository, current_hour
+
+
+class TrendingService:
+    """
+    Time-decayed popularity over the hourly buckets of the active window.
+
+    A bucket that is `age` hours old counts with weight
+    0.5 ** (age / half_life_hours); each article's score uses the
+    PopularityStrategy weights over the decayed sums
+    (views + likes*3 + minutes*2, minutes capped at 10).
+    """
+
+    def __init__(self, repo: Optional[EventBucketRepository] = None,
+                 half_life_hours: float = 12, window_hours: int = 72):
+        self.repo = repo or EventBucketRepository(window_hours=window_hours)
+        self.half_life_hours = half_life_hours
+        self.window_hours = window_hours
+
+    def scores(self, now_hour: Optional[int] = None) -> Dict[int, float]:
+        hour = current_hour() if now_hour is None else now_hour
+        since = hour - self.window_hours
+        decay = {h: 0.5 ** ((hour - h) / self.half_life_hours) for h in range(since, hour + 1)}
+
+        sums: Dict[int, List[float]] = {}
+        for bucket_hour, article_id, views, likes, time_ms in self.repo.active(since):
+            # buckets stamped in the future (clock skew) count as current
+            weight = decay.get(bucket_hour, 1.0)
+            s = sums.setdefault(article_id, [0.0, 0.0, 0.0])
+            s[0] += views * weight
+            s[1] += likes * weight
+            s[2] += time_ms * weight
+
+        return {
+            article_id: views + likes * 3 + min(time_ms / 60000.0, 10) * 2
+            for article_id, (views, likes, time_ms) in sums.items()
+        }
+
+    def trending_article_ids(self, limit: int, exclude_article_id: Optional[int] = None,
+                             now_hour: Optional[int] = None) -> List[int]:
+        """Top `limit` article ids by decayed score, ties by newest id."""
+        scores = self.scores(now_hour)
+        scores.pop(exclude_article_id, None)
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return [article_id for article_id, score in top if score > 0]
@@ -0,0 +1,90 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.data.db import close_connection
+
+logger = logging.getLogger("article_engine")
+
+
+class Warmup:
+    """
+    Builds recommendation state in a background thread while the app
+    already serves traffic.
+
+    Steps run in registration order; a failing step is logged and recorded
+    but does not stop the rest, since every model also builds lazily on
+    first use. It does keep the process from being ready: status() backs
+    the /readyz endpoint and lists the failed steps.
+    """
+
+    def __init__(self):
+        self._steps: List[Tuple[str, Callable[[], None]]] = []
+        self._status: Dict[str, Dict] = {}
+        self._done = threading.Event()
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, name: str, step: Callable[[], None]) -> "Warmup":
+        self._steps.append((name, step))
+        self._status[name] = {"state": "pending"}
+        return self
+
+    def start(self) -> "Warmup":
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+        self._thread.start()
+        return self
+
+    def run(self) -> None:
+        """Run every step in the calling thread (warm-up disabled / scripts)."""
+        self._started_at = time.monotonic()
+        self._run()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    @property
+    def ready(self) -> bool:
+        """Finished, with every step done."""
+        return self._done.is_set() and not self.failed()
+
+    def failed(self) -> List[str]:
+        return [name for name, state in list(self._status.items()) if state["state"].startswith("failed")]
+
+    def status(self):
+        elapsed = None
+        if self._started_at is not None:
+            end = self._finished_at or time.monotonic()
+            elapsed = round((end - self._started_at) * 1000.0, 1)
+        return {
+            "ready": self.ready,
+            "finished": self._done.is_set(),
+            "failed": self.failed(),
+            "elapsed_ms": elapsed,
+            "steps": {name: dict(state) for name, state in self._status.items()},
+        }
+
+    def _run(self) -> None:
+        try:
+            for name, step in self._steps:
+                self._status[name] = {"state": "running"}
+                start = time.perf_counter()
+                try:
+                    step()
+                    state = "done"
+                except Exception as e:
+                    logger.exception(f"Warm-up step {name} failed")
+                    state = f"failed: {e}"
+                self._status[name] = {
+                    "state": state,
+                    "ms": round((time.perf_counter() - start) * 1000.0, 1),
+                }
+        finally:
+            # the warm-up thread's pooled connection is not needed afterwards
+            close_connection()
+            self._finished_at = time.monotonic()
+            self._done.set()
+            logger.info(f"Warm-up finished in {self.status()['elapsed_ms']}ms")
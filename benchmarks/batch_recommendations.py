@@ -0,0 +1,95 @@
+"""
+Batch recommendations against the per-id loop: for every strategy,
+recommend() called once per seed article against one recommend_many() call
+for all seeds, then the same through HTTP (N GET /api/recommendations/<id>
+requests against one POST /api/recommendations/batch) via the test client.
+The recommendation cache is disabled so every seed is computed.
+
+    python -m benchmarks.batch_recommendations --articles 10000 --events 300000 --seeds 500
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from app.config.config import Config
+from app.data.db import close_all
+from app.services.article_service import ArticleService
+from app.services.content_index import ContentIndex
+from app.services.interaction_event_service import InteractionEventService
+from app.services.item_similarity import ItemItemModel
+from app.services.recommendation_factory import RecommendationFactory
+from app.services.trending_service import TrendingService
+from benchmarks.suite import STRATEGIES, prepare
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def report(name: str, n: int, loop_s: float, batch_s: float) -> None:
+    print(f"  {name:28s} loop {n / loop_s:9.0f} seeds/s ({loop_s * 1000:8.1f}ms)  "
+          f"batch {n / batch_s:9.0f} seeds/s ({batch_s * 1000:8.1f}ms)  x{loop_s / batch_s:5.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--events", type=int, default=300000)
+    parser.add_argument("--seeds", type=int, default=500, help="seed articles per batch")
+    parser.add_argument("--limit", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    Config.RECOMMENDATION_CACHE_SIZE = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        prepare(os.path.join(tmp, "bench.db"), args.articles, args.events, n_categories=20, seed=args.seed)
+        print(f"{args.articles} articles, {args.events} events (prepared in {time.perf_counter() - start:.1f}s), "
+              f"{args.seeds} seeds, limit {args.limit}")
+        seeds = random.Random(args.seed).sample(range(1, args.articles + 1), min(args.seeds, args.articles))
+
+        article_service = ArticleService()
+        event_service = InteractionEventService()
+        content_index = ContentIndex(article_service)
+        content_index.ensure_built()
+        content_index.inverted_index()
+        trending = TrendingService(half_life_hours=Config.TRENDING_HALF_LIFE_HOURS,
+                                   window_hours=Config.TRENDING_WINDOW_HOURS)
+        item_model = ItemItemModel(neighbors=Config.CF_NEIGHBORS, chunk_size=Config.CF_CHUNK_SIZE)
+        item_model.ensure_built()
+
+        print("Strategies")
+        for name in STRATEGIES:
+            strategy = RecommendationFactory.create(
+                name, article_service, event_service,
+                content_index=content_index, trending=trending, item_model=item_model,
+            )
+            loop_s = timed(lambda: [strategy.recommend(i, args.limit) for i in seeds])
+            batch_s = timed(lambda: strategy.recommend_many(seeds, args.limit))
+            report(name, len(seeds), loop_s, batch_s)
+
+        from app.main import create_app
+
+        app = create_app()
+        app.extensions["warmup"].wait()
+        client = app.test_client()
+
+        print("HTTP (test client)")
+        for name in STRATEGIES:
+            loop_s = timed(lambda: [
+                client.get(f"/api/recommendations/{i}?strategy={name}") for i in seeds
+            ])
+            batch_s = timed(lambda: client.post("/api/recommendations/batch", json={
+                "article_ids": seeds, "strategy": name, "limit": args.limit,
+            }))
+            report(name, len(seeds), loop_s, batch_s)
+
+        close_all()
+
+
+if __name__ == "__main__":
+    main()
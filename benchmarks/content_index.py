@@ -0,0 +1,84 @@
+"""
+Per-request latency of content recommendations: the prebuilt ContentIndex
+(inverted-index top-k and brute-force scoring) versus refitting TF-IDF over
+the corpus on every request.
+
+    python -m benchmarks.content_index --sizes 10000,100000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from app.services.content_index import ContentIndex, build_text
+from benchmarks.synthetic import InMemoryArticleService, generate_articles
+
+
+def refit_per_request(articles, article_id, limit):
+    """The pre-index implementation: fit_transform on every call."""
+    texts = [build_text(a) for a in articles]
+    idx = next(i for i, a in enumerate(articles) if a.id == article_id)
+    vectorizer = TfidfVectorizer(lowercase=True, max_features=5000, stop_words="english")
+    matrix = vectorizer.fit_transform(texts)
+    sims = cosine_similarity(matrix[idx], matrix).flatten()
+    ranked = sorted(
+        ((float(s), a) for s, a in zip(sims, articles) if a.id != article_id),
+        key=lambda x: x[0], reverse=True,
+    )
+    return [a for _, a in ranked[:limit]]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000.0
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return f"mean={statistics.mean(samples):8.2f}ms  p50={statistics.median(samples):8.2f}ms  p95={p95:8.2f}ms"
+
+
+def run(size: int, queries: int, refit_queries: int, limit: int) -> None:
+    articles = generate_articles(size)
+    service = InMemoryArticleService(articles)
+    rng = random.Random(7)
+
+    index = ContentIndex(service)
+    build_ms = timed(index.build)
+
+    ids = [rng.randrange(1, size + 1) for _ in range(queries)]
+    index.similar(ids[0], limit)  # builds the postings lists
+    index_samples = [timed(index.similar, i, limit) for i in ids]
+    brute_samples = [timed(index.similar_brute_force, i, limit) for i in ids]
+
+    print(f"\n{size} articles")
+    print(f"  index build (once):      {build_ms:10.2f}ms")
+    print(f"  inverted index top-k:    {summarize(index_samples)}")
+    print(f"  brute-force scoring:     {summarize(brute_samples)}")
+
+    if refit_queries:
+        listed = service.list_articles()
+        refit_samples = [timed(refit_per_request, listed, i, limit) for i in ids[:refit_queries]]
+        print(f"  refit per request:       {summarize(refit_samples)}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--refit-queries", type=int, default=3,
+                        help="requests timed with the old refit path (slow)")
+    parser.add_argument("--limit", type=int, default=8)
+    args = parser.parse_args()
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        run(size, args.queries, args.refit_queries, args.limit)
+
+
+if __name__ == "__main__":
+    main()
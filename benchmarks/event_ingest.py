@@ -0,0 +1,136 @@
+"""
+Event ingestion throughput with several web-worker processes writing at
+once: "direct" (every process commits its own single-event transactions)
+against "process" (every process hands events to the single writer
+process over its Unix socket, which commits in batches).
+
+Reports events/s over the whole run, per-call latency seen by a worker,
+failed calls ("database is locked" once busy_timeout runs out) and, in
+process mode, how many events were spilled to disk under backpressure.
+
+    python -m benchmarks.event_ingest --workers 8 --events 2000
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.config.config import Config
+from app.data.db import close_all, get_connection
+from app.data.schema import init_db
+from benchmarks.synthetic import generate_events
+
+ROOT = Path(__file__).resolve().parent.parent
+N_ARTICLES = 1000
+
+
+def prepare(path: str) -> None:
+    Config.DB_PATH = path
+    init_db()
+    conn = get_connection()
+    with conn:
+        conn.executemany(
+            "INSERT INTO articles(id, title, category_id, content) VALUES (?, ?, NULL, '')",
+            [(i, f"Article {i}") for i in range(1, N_ARTICLES + 1)],
+        )
+    close_all()
+
+
+def worker(mode: str, db_path: str, synchronous: str, address: str, spill_dir: str,
+           n_events: int, seed: int):
+    from app.services.event_writer import EventWriterClient
+    from app.services.interaction_event_service import InteractionEventService
+
+    Config.DB_PATH = db_path
+    Config.DB_SYNCHRONOUS = synchronous
+    service = InteractionEventService()
+    if mode == "process":
+        service.writer = EventWriterClient(address, Config.SECRET_KEY.encode(), spill_dir)
+
+    events = generate_events(n_events, N_ARTICLES, seed=seed)
+    latencies, errors = [], 0
+    for event in events:
+        start = time.perf_counter()
+        try:
+            service.log(event)
+        except sqlite3.OperationalError:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+    spilled = service.writer.spilled if service.writer else 0
+    return latencies, errors, spilled
+
+
+def run(mode: str, n_workers: int, n_events: int, synchronous: str) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        address = os.path.join(tmp, "writer.sock")
+        spill_dir = os.path.join(tmp, "spill")
+        prepare(db_path)
+
+        writer = None
+        if mode == "process":
+            env = dict(os.environ, DB_PATH=db_path, EVENT_WRITER_ADDRESS=address,
+                       EVENT_SPILL_DIR=spill_dir, DB_SYNCHRONOUS=synchronous)
+            writer = subprocess.Popen([sys.executable, "event_writer.py"], cwd=str(ROOT), env=env,
+                                      stderr=subprocess.DEVNULL)
+            while not os.path.exists(address):
+                time.sleep(0.05)
+
+        ctx = multiprocessing.get_context("spawn")
+        start = time.perf_counter()
+        with ctx.Pool(n_workers) as pool:
+            results = pool.starmap(worker, [
+                (mode, db_path, synchronous, address, spill_dir, n_events, seed) for seed in range(n_workers)
+            ])
+        handed_over = time.perf_counter() - start
+
+        if writer is not None:
+            # SIGTERM drains the queue and replays spills: count that as ingest time
+            writer.terminate()
+            writer.wait()
+        elapsed = time.perf_counter() - start
+
+        conn = sqlite3.connect(db_path)
+        (stored,) = conn.execute("SELECT COUNT(*) FROM interaction_events").fetchone()
+        conn.close()
+
+    latencies = sorted(ms for r in results for ms in r[0])
+    return {
+        "stored": stored,
+        "events_per_s": stored / elapsed,
+        "handed_over_s": handed_over,
+        "elapsed_s": elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "errors": sum(r[1] for r in results),
+        "spilled": sum(r[2] for r in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--events", type=int, default=2000, help="events per worker")
+    parser.add_argument("--modes", default="direct,process")
+    parser.add_argument("--synchronous", default=Config.DB_SYNCHRONOUS,
+                        help="PRAGMA synchronous for every writer (FULL fsyncs each commit)")
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers x {args.events} events, one event per call, "
+          f"synchronous={args.synchronous}, {os.cpu_count()} CPUs")
+    for mode in args.modes.split(","):
+        r = run(mode, args.workers, args.events, args.synchronous)
+        print(f"  {mode:8s} {r['events_per_s']:9.0f} events/s  stored={r['stored']:7d}  "
+              f"elapsed={r['elapsed_s']:6.2f}s (handed over in {r['handed_over_s']:.2f}s)  "
+              f"p50={r['p50_ms']:6.2f}ms  p99={r['p99_ms']:7.2f}ms  "
+              f"errors={r['errors']}  spilled={r['spilled']}")
+
+
+if __name__ == "__main__":
+    main()
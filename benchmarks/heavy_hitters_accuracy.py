@@ -0,0 +1,105 @@
+"""
+Accuracy and latency of the in-memory heavy-hitters tracker against the
+exact popularity ranking served from article_stats.
+
+Events are written once to a temporary SQLite database, then replayed into
+trackers of different capacities. For each capacity and k the benchmark
+reports precision@k (overlap with the exact top-k), the length of the
+exactly ordered prefix, and the worst relative score error in the top-k.
+
+    python -m benchmarks.heavy_hitters_accuracy --events 200000 --articles 20000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from app.config.config import Config
+from app.data.db import close_all
+from app.data.schema import init_db
+from app.repositories.article_stats_repository import ArticleStatsRepository
+from app.services.heavy_hitters import HeavyHittersTracker, score_of
+from app.services.interaction_event_service import InteractionEventService
+from benchmarks.synthetic import generate_events
+
+
+def exact_ranking(stats_repo, k):
+    start = time.perf_counter()
+    ids = stats_repo.top_article_ids(k)
+    return ids, (time.perf_counter() - start) * 1000.0
+
+
+def median_ms(fn, repeat=200):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples)
+
+
+def run(n_events, n_articles, skew, capacities, ks, batch_size):
+    events = generate_events(n_events, n_articles, skew=skew)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.DB_PATH = os.path.join(tmp, "bench.db")
+        init_db()
+        service = InteractionEventService()
+        start = time.perf_counter()
+        for offset in range(0, len(events), batch_size):
+            service.write_events(events[offset:offset + batch_size])
+        print(f"{n_events} events over {n_articles} articles (skew={skew}), "
+              f"written in {time.perf_counter() - start:.1f}s")
+
+        stats_repo = ArticleStatsRepository()
+        exact_scores = {
+            article_id: score_of(views, likes, time_ms)
+            for article_id, views, likes, time_ms in stats_repo.top_stats(n_articles)
+        }
+        exact = {k: exact_ranking(stats_repo, k)[0] for k in ks}
+        sql_ms = median_ms(lambda: stats_repo.top_article_ids(max(ks)), repeat=50)
+        close_all()
+
+    print(f"exact SQL top-{max(ks)}: median {sql_ms:.3f}ms")
+    for capacity in capacities:
+        tracker = HeavyHittersTracker(capacity=capacity)
+        start = time.perf_counter()
+        for offset in range(0, len(events), batch_size):
+            tracker.on_events_logged(events[offset:offset + batch_size])
+        ingest_s = time.perf_counter() - start
+        query_ms = median_ms(lambda: tracker.popular_article_ids(max(ks)))
+
+        print(f"\ncapacity={capacity}  ingest {len(events) / ingest_s:,.0f} events/s  "
+              f"top-{max(ks)} median {query_ms:.3f}ms  evictions={tracker.evictions}")
+        for k in ks:
+            approx = tracker.popular_article_ids(k)
+            truth = exact[k]
+            overlap = len(set(approx) & set(truth)) / max(1, len(truth))
+            prefix = next((i for i, (a, b) in enumerate(zip(approx, truth)) if a != b), min(len(approx), len(truth)))
+            errors = [
+                abs(estimate - exact_scores.get(article_id, 0.0)) / max(exact_scores.get(article_id, 0.0), 1e-9)
+                for article_id, estimate, _ in tracker.top(k)
+            ]
+            print(f"  k={k:<4} precision@k={overlap:6.3f}  exact prefix={prefix:<4} "
+                  f"max rel. error={max(errors, default=0.0):8.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--skew", type=float, default=1.1)
+    parser.add_argument("--capacities", default="100,500,1000,5000")
+    parser.add_argument("--ks", default="10,50,100")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    run(args.events, args.articles, args.skew,
+        [int(c) for c in args.capacities.split(",")],
+        [int(k) for k in args.ks.split(",")],
+        args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Concurrent load test against a real HTTP server: a pool of client threads
+sends a weighted mix of requests for a fixed duration and every response
+is timed. Reports per route throughput, p50/p95/p99 latency, error rate
+and lock-timeout rate (503 from the app when SQLite's busy_timeout runs
+out waiting for the write lock).
+
+By default a server is launched on a synthetic database (run.py, Flask's
+threaded server). Use --server-cmd to launch something else, or --url to
+target a server that is already running. Launched servers get
+EXPERIMENT_GROUP_HEADER=true, so --group-a sets the A/B split through the
+X-Experiment-Group header. Pass --env to compare configurations.
+
+    python -m benchmarks.loadtest --concurrency 16 --duration 30 \\
+        --mix article=50,event=30,recommend=15,analytics=5
+    python -m benchmarks.loadtest --env EVENT_INGEST_MODE=buffered --output buffered.json
+    python -m benchmarks.loadtest --server-cmd "gunicorn -w 4 -b 127.0.0.1:{port} run:app"
+
+Article ids follow the same Zipf skew as the synthetic events. Client
+threads share the machine with the server; with few cores the client
+itself limits the reachable rate.
+"""
+import argparse
+import http.client
+import itertools
+import json
+import os
+import random
+import shlex
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from benchmarks.suite import STRATEGIES, prepare
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# kind -> (method, path for an article id, body for an article id)
+Request = Tuple[str, str, Optional[dict]]
+
+
+def request_kinds(rng: random.Random, n_articles: int) -> Dict[str, Callable[[int], Request]]:
+    pages = max(1, n_articles // 50)
+    return {
+        "article": lambda i: ("GET", f"/articles/{i}", None),
+        "event": lambda i: ("POST", "/api/events", {"event_type": rng.choice(["view", "view", "like"]),
+                                                    "article_id": i}),
+        "batch": lambda i: ("POST", "/api/events/batch", [
+            {"event_type": "view", "article_id": i, "user_id": rng.randrange(1, 1000)} for _ in range(20)
+        ]),
+        "recommend": lambda i: ("GET", f"/api/recommendations/{i}?strategy={rng.choice(STRATEGIES)}", None),
+        "analytics": lambda i: ("GET", f"/analytics?page={rng.randrange(1, pages + 1)}", None),
+        "home": lambda i: ("GET", "/", None),
+        "ab": lambda i: ("GET", "/api/ab-summary", None),
+    }
+
+
+def route_of(path: str) -> str:
+    """Group /articles/17 and /articles/42 under one route label."""
+    path = path.split("?")[0]
+    return "/".join("<id>" if part.isdigit() else part for part in path.split("/"))
+
+
+def parse_mix(mix: str) -> Tuple[List[str], List[float]]:
+    kinds, weights = [], []
+    for part in mix.split(","):
+        kind, weight = part.split("=")
+        kinds.append(kind.strip())
+        weights.append(float(weight))
+    return kinds, weights
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_ready(host: str, port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request("GET", "/readyz")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server on {host}:{port} did not become ready in {timeout}s")
+
+
+class Worker(threading.Thread):
+    """One client: its own keep-alive connection and sample list."""
+
+    def __init__(self, host: str, port: int, next_request: Callable[[random.Random], Tuple[Request, str]],
+                 seed: int, stop: threading.Event, record_after: float):
+        super().__init__(daemon=True)
+        self.host, self.port = host, port
+        self.next_request = next_request
+        self.rng = random.Random(seed)
+        self.stop = stop
+        self.record_after = record_after
+        # (route, status or 0 for a transport error, latency seconds)
+        self.samples: List[Tuple[str, int, float]] = []
+
+    def run(self) -> None:
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        while not self.stop.is_set():
+            (method, path, body), group = self.next_request(self.rng)
+            headers = {"X-Experiment-Group": group}
+            payload = None
+            if body is not None:
+                payload = json.dumps(body)
+                headers["Content-Type"] = "application/json"
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                status = 0
+            if start >= self.record_after:
+                self.samples.append((f"{method} {route_of(path)}", status, time.perf_counter() - start))
+        conn.close()
+
+
+def summarize(samples: List[Tuple[str, int, float]], seconds: float) -> Dict[str, dict]:
+    by_route: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+    for route, status, latency in samples:
+        by_route[route].append((status, latency))
+        by_route["ALL"].append((status, latency))
+
+    report = {}
+    for route, rows in sorted(by_route.items(), key=lambda item: (item[0] == "ALL", item[0])):
+        latencies = sorted(latency * 1000.0 for _, latency in rows)
+        n = len(rows)
+
+        def pct(q: float) -> float:
+            return round(latencies[min(n - 1, int(n * q))], 2)
+
+        report[route] = {
+            "requests": n,
+            "throughput_rps": round(n / seconds, 1),
+            "p50_ms": round(statistics.median(latencies), 2),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+            "max_ms": round(latencies[-1], 2),
+            "error_rate": round(sum(1 for s, _ in rows if s == 0 or s >= 400) / n, 4),
+            "lock_timeout_rate": round(sum(1 for s, _ in rows if s == 503) / n, 4),
+        }
+    return report
+
+
+def run_load(host: str, port: int, kinds: List[str], weights: List[float], group_a: float,
+             n_articles: int, concurrency: int, duration: float, warmup: float, seed: int) -> Dict[str, dict]:
+    ids = list(range(1, n_articles + 1))
+    random.Random(seed).shuffle(ids)
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) ** 1.1 for rank in range(n_articles)))
+
+    def next_request(rng: random.Random) -> Tuple[Request, str]:
+        kind = rng.choices(kinds, weights)[0]
+        article_id = rng.choices(ids, cum_weights=cum_weights)[0]
+        group = "A" if rng.random() < group_a else "B"
+        return builders[kind](article_id), group
+
+    builders = request_kinds(random.Random(seed), n_articles)
+    unknown = set(kinds) - set(builders)
+    if unknown:
+        raise SystemExit(f"unknown request kinds {sorted(unknown)}; choose from {sorted(builders)}")
+
+    stop = threading.Event()
+    record_after = time.perf_counter() + warmup
+    workers = [Worker(host, port, next_request, seed + i, stop, record_after) for i in range(concurrency)]
+    for worker in workers:
+        worker.start()
+    time.sleep(warmup + duration)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return summarize([s for w in workers for s in w.samples], duration)
+
+
+def print_report(report: Dict[str, dict]) -> None:
+    print(f"  {'route':34s} {'req':>7s} {'req/s':>8s} {'p50':>8s} {'p95':>8s} {'p99':>8s} "
+          f"{'errors':>7s} {'locked':>7s}")
+    for route, r in report.items():
+        print(f"  {route:34s} {r['requests']:7d} {r['throughput_rps']:8.1f} {r['p50_ms']:7.1f}ms "
+              f"{r['p95_ms']:7.1f}ms {r['p99_ms']:7.1f}ms {r['error_rate']:7.2%} {r['lock_timeout_rate']:7.2%}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="target a running server instead of launching one")
+    parser.add_argument("--server-cmd", default=f"{shlex.quote(sys.executable)} run.py --port {{port}}",
+                        help="command that starts the server; {port} is substituted")
+    parser.add_argument("--env", action="append", default=[], help="KEY=VALUE for the launched server")
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=100000, help="events in the launched server's database")
+    parser.add_argument("--mix", default="article=50,event=30,recommend=15,analytics=5",
+                        help="weighted request kinds: article, event, batch, recommend, analytics, home, ab")
+    parser.add_argument("--group-a", type=float, default=0.5, help="share of requests in experiment group A")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds first")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args()
+
+    kinds, weights = parse_mix(args.mix)
+    server = None
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.url:
+            target = urlparse(args.url)
+            host, port = target.hostname, target.port or 80
+        else:
+            db_path = os.path.join(tmp, "load.db")
+            start = time.perf_counter()
+            prepare(db_path, args.articles, args.events, n_categories=20, seed=args.seed)
+            print(f"Prepared {args.articles} articles, {args.events} events in {time.perf_counter() - start:.1f}s")
+
+            host, port = "127.0.0.1", free_port()
+            env = dict(os.environ, DB_PATH=db_path, EXPERIMENT_GROUP_HEADER="true",
+                       EVENT_WRITER_ADDRESS=os.path.join(tmp, "writer.sock"),
+                       EVENT_SPILL_DIR=os.path.join(tmp, "spill"),
+                       HEAVY_HITTERS_SNAPSHOT_PATH=os.path.join(tmp, "heavy_hitters.json"),
+                       ALS_MODEL_DIR=os.path.join(tmp, "als"))
+            env.update(item.split("=", 1) for item in args.env)
+            log_path = os.path.join(tmp, "server.log")
+            log = open(log_path, "w")
+            server = subprocess.Popen(shlex.split(args.server_cmd.format(port=port)), cwd=str(ROOT),
+                                      env=env, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            wait_until_ready(host, port, timeout=120)
+            print(f"{args.concurrency} clients for {args.duration:.0f}s against {host}:{port}, "
+                  f"mix {args.mix}, group A {args.group_a:.0%}"
+                  + (f", {' '.join(args.env)}" if args.env else ""))
+            report = run_load(host, port, kinds, weights, args.group_a, args.articles,
+                              args.concurrency, args.duration, args.warmup, args.seed)
+        except RuntimeError:
+            if server is not None:
+                with open(log_path) as f:
+                    print(f.read()[-3000:])
+            raise
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+                log.close()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "routes": report}, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+App startup cost: module import time, create_app() time, time until the
+background warm-up reports ready, and the latency of the first
+recommendation request with and without warm-up. Every sample runs in a
+fresh interpreter so import caches do not carry over.
+
+    python -m benchmarks.startup --articles 10000 --events 100000 --repeat 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from app.config.config import Config
+from app.data.db import close_all, get_connection
+from app.data.schema import init_db
+from app.services.interaction_event_service import InteractionEventService
+from benchmarks.synthetic import generate_articles, generate_events
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+heavy = sorted(m for m in ("sklearn", "scipy") if m in sys.modules)
+app_ = app.main.create_app()
+created = time.perf_counter()
+warmup = app_.extensions["warmup"]
+client = app_.test_client()
+if {wait}:
+    warmup.wait()
+ready = time.perf_counter()
+t = time.perf_counter()
+client.get("/api/recommendations/{article_id}?strategy={strategy}")
+first = time.perf_counter() - t
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "ready_ms": (ready - imported) * 1000,
+    "first_request_ms": first * 1000,
+    "heavy_imported": heavy,
+}}))
+"""
+
+
+def prepare(path: str, n_articles: int, n_events: int) -> None:
+    Config.DB_PATH = path
+    init_db()
+    conn = get_connection()
+    articles = generate_articles(n_articles)
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO categories(id, name) VALUES (?, ?)",
+            {(a.category_id, a.category_name) for a in articles},
+        )
+        conn.executemany(
+            "INSERT INTO articles(id, title, category_id, content) VALUES (?, ?, ?, ?)",
+            [(a.id, a.title, a.category_id, a.content) for a in articles],
+        )
+    events = generate_events(n_events, n_articles)
+    service = InteractionEventService()
+    for offset in range(0, len(events), 5000):
+        service.write_events(events[offset:offset + 5000])
+    close_all()
+
+
+def sample(db_path: str, warmup: bool, strategy: str, article_id: int):
+    env = dict(os.environ, DB_PATH=db_path, WARMUP_ENABLED="true" if warmup else "false",
+               ALS_MODEL_DIR=os.path.join(os.path.dirname(db_path), "als"))
+    code = CHILD.format(wait=warmup, strategy=strategy, article_id=article_id)
+    out = subprocess.run([sys.executable, "-c", code], env=env, cwd=str(ROOT),
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--strategy", default="content")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        prepare(db_path, args.articles, args.events)
+        print(f"{args.articles} articles, {args.events} events, strategy={args.strategy}")
+
+        for warmup in (False, True):
+            runs = [sample(db_path, warmup, args.strategy, args.articles // 2) for _ in range(args.repeat)]
+            label = "with warm-up" if warmup else "no warm-up  "
+            medians = {key: statistics.median(r[key] for r in runs)
+                       for key in ("import_ms", "create_app_ms", "ready_ms", "first_request_ms")}
+            print(f"  {label}  import={medians['import_ms']:7.1f}ms  "
+                  f"create_app={medians['create_app_ms']:7.1f}ms  "
+                  f"ready={medians['ready_ms']:8.1f}ms  "
+                  f"first request={medians['first_request_ms']:8.1f}ms  "
+                  f"heavy modules at import={runs[0]['heavy_imported']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+Benchmark suite over synthetic data: every recommendation strategy's
+recommend(), the hot repository/service methods, and the Flask routes
+through the test client, at several corpus sizes.
+
+Each size gets a fresh SQLite database with N articles over M categories
+and E Zipf-skewed events spread over the trending window (see
+benchmarks/synthetic.py; the same seed always gives the same data). Every
+target is called --repeat times on seeded random articles after one
+untimed warm-up call; mean/p50/p95/max are reported in milliseconds.
+
+    python -m benchmarks.suite --sizes 1000,10000,100000 --events 1000000 --output results.json
+    python -m benchmarks.suite --sizes 1000,10000 --compare baseline.json
+    python -m benchmarks.suite --input results.json --compare baseline.json
+
+--metrics-overhead times the read routes and repository methods again with
+METRICS_ENABLED off and on (fresh app and connections each time) and
+prints the p50 cost of the instrumentation per target.
+
+    python -m benchmarks.suite --sizes 10000 --metrics-overhead
+
+--compare exits with status 1 if any target's p50 got slower than the
+baseline by more than --threshold (relative) and --min-delta-ms (absolute,
+to ignore noise on sub-millisecond targets).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+from app.config.config import Config
+from app.data.db import close_all, get_connection
+from app.data.schema import init_db
+from app.repositories.article_repository import ArticleRepository
+from app.repositories.article_stats_repository import ArticleStatsRepository
+from app.repositories.category_repository import CategoryRepository
+from app.repositories.event_bucket_repository import EventBucketRepository, current_hour
+from app.repositories.keyword_repository import KeywordRepository
+from app.services.article_service import ArticleService
+from app.services.content_index import ContentIndex
+from app.services.interaction_event_service import InteractionEventService
+from app.services.item_similarity import ItemItemModel
+from app.services.keyword_extractor import KeywordExtractor
+from app.services.recommendation_factory import RecommendationFactory
+from app.services.trending_service import TrendingService
+from benchmarks.synthetic import generate_articles, generate_events
+
+STRATEGIES = ["popular", "content", "hybrid", "trending", "collaborative"]
+EVENT_CHUNK = 100000
+
+Target = Tuple[str, Callable[[int], object]]
+
+
+def prepare(path: str, n_articles: int, n_events: int, n_categories: int, seed: int) -> None:
+    Config.DB_PATH = path
+    init_db()
+    conn = get_connection()
+    articles = generate_articles(n_articles, n_categories=n_categories, seed=seed)
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO categories(id, name) VALUES (?, ?)",
+            {(a.category_id, a.category_name) for a in articles},
+        )
+        conn.executemany(
+            "INSERT INTO articles(id, title, category_id, content) VALUES (?, ?, ?, ?)",
+            [(a.id, a.title, a.category_id, a.content) for a in articles],
+        )
+
+    # generated in chunks so memory does not grow with --events
+    service = InteractionEventService()
+    for i, offset in enumerate(range(0, n_events, EVENT_CHUNK)):
+        events = generate_events(min(EVENT_CHUNK, n_events - offset), n_articles,
+                                 n_users=max(1000, n_articles // 10), seed=seed + i,
+                                 span_hours=Config.TRENDING_WINDOW_HOURS)
+        for start in range(0, len(events), 5000):
+            service.write_events(events[start:start + 5000])
+
+    # stored keywords, as a long-running deployment would have them
+    KeywordExtractor(ContentIndex(ArticleService(repo=ArticleRepository()))).extract_all()
+    close_all()
+
+
+def measure(fn: Callable[[int], object], ids: List[int]) -> Dict[str, float]:
+    fn(ids[0])  # untimed: lazy builds and first-use caches
+    samples = []
+    for article_id in ids:
+        start = time.perf_counter()
+        fn(article_id)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    samples.sort()
+    return {
+        "n": len(samples),
+        "mean_ms": round(statistics.mean(samples), 4),
+        "p50_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "max_ms": round(samples[-1], 4),
+    }
+
+
+def strategy_targets() -> List[Target]:
+    article_service = ArticleService()
+    event_service = InteractionEventService()
+    content_index = ContentIndex(article_service)
+    trending = TrendingService(half_life_hours=Config.TRENDING_HALF_LIFE_HOURS,
+                               window_hours=Config.TRENDING_WINDOW_HOURS)
+    item_model = ItemItemModel(neighbors=Config.CF_NEIGHBORS, chunk_size=Config.CF_CHUNK_SIZE)
+
+    targets = []
+    for name in STRATEGIES:
+        strategy = RecommendationFactory.create(
+            name, article_service, event_service,
+            content_index=content_index, trending=trending, item_model=item_model,
+        )
+        targets.append((f"strategy.{name}", lambda i, s=strategy: s.recommend(i, 8)))
+    return targets
+
+
+def repository_targets(n_articles: int, rng: random.Random) -> List[Target]:
+    articles = ArticleRepository()
+    categories = CategoryRepository()
+    stats = ArticleStatsRepository()
+    events = InteractionEventService()
+    buckets = EventBucketRepository(window_hours=Config.TRENDING_WINDOW_HOURS)
+    keywords = KeywordRepository()
+
+    def sample_ids(k: int) -> List[int]:
+        return rng.sample(range(1, n_articles + 1), min(k, n_articles))
+
+    pages = max(1, n_articles // 50)
+    return [
+        ("articles.get_by_id", articles.get_by_id),
+        ("articles.get_many[20]", lambda i: articles.get_many(sample_ids(20))),
+        ("articles.list_all", lambda i: articles.list_all()),
+        ("articles.count_by_category", lambda i: articles.count_by_category()),
+        ("categories.list_all", lambda i: categories.list_all()),
+        ("article_stats.get", stats.get),
+        ("article_stats.top_article_ids", lambda i: stats.top_article_ids(8, exclude_article_id=i)),
+        ("article_stats.engagement_page", lambda i: stats.engagement_page(
+            sort="views", limit=50, offset=50 * (i % pages))),
+        ("events.count_for_article", lambda i: events.count_for_article(i, "view")),
+        ("events.total_duration_ms_for_article", lambda i: events.total_duration_ms_for_article(i, "time_spent")),
+        ("events.list_for_article", events.list_for_article),
+        ("events.experiment_group_summary", lambda i: events.experiment_group_summary()),
+        ("buckets.active", lambda i: buckets.active(current_hour() - Config.TRENDING_WINDOW_HOURS)),
+        ("keywords.for_articles[50]", lambda i: keywords.for_articles(sample_ids(50))),
+    ]
+
+
+def route_targets(client, n_articles: int) -> Tuple[List[Target], List[Target]]:
+    """(read-only routes, routes that write events); writers run last."""
+    pages = max(1, n_articles // 50)
+
+    def get(url_of: Callable[[int], str]) -> Callable[[int], object]:
+        def call(i: int):
+            response = client.get(url_of(i))
+            assert response.status_code == 200, (url_of(i), response.status_code)
+        return call
+
+    def post(url: str, body_of: Callable[[int], object]) -> Callable[[int], object]:
+        def call(i: int):
+            response = client.post(url, json=body_of(i))
+            assert response.status_code == 201, (url, response.status_code)
+        return call
+
+    reads = [
+        ("GET /", get(lambda i: "/")),
+        *[(f"GET /api/recommendations?strategy={s}", get(lambda i, s=s: f"/api/recommendations/{i}?strategy={s}"))
+          for s in STRATEGIES],
+        ("GET /recommendations", get(lambda i: f"/recommendations?article_id={i}&strategy=content")),
+        ("GET /api/analytics/<id>", get(lambda i: f"/api/analytics/{i}")),
+        ("GET /analytics", get(lambda i: f"/analytics?page={1 + i % pages}")),
+        ("GET /api/ab-summary", get(lambda i: "/api/ab-summary")),
+        ("GET /ab-dashboard", get(lambda i: "/ab-dashboard")),
+    ]
+    writes = [
+        ("GET /articles/<id>", get(lambda i: f"/articles/{i}")),
+        ("POST /api/events", post("/api/events", lambda i: {"event_type": "view", "article_id": i})),
+        ("POST /api/events/batch[50]", post("/api/events/batch", lambda i: [
+            {"event_type": "like" if k % 5 == 0 else "view", "article_id": i, "user_id": k} for k in range(50)
+        ])),
+    ]
+    return reads, writes
+
+
+def metrics_overhead(results: Dict[str, dict]) -> None:
+    """Print the p50 difference of every target timed with metrics on and off."""
+    print("  metrics overhead (p50, on - off)")
+    for name, on in results.items():
+        if not name.startswith("metrics_on."):
+            continue
+        off = results["metrics_off." + name[len("metrics_on."):]]
+        delta = on["p50_ms"] - off["p50_ms"]
+        ratio = on["p50_ms"] / off["p50_ms"] - 1 if off["p50_ms"] else 0.0
+        print(f"    {name[len('metrics_on.'):]:40s} {delta:+9.3f}ms ({ratio:+.1%})")
+
+
+def run_size(n_articles: int, n_events: int, n_categories: int, repeat: int, seed: int,
+             with_metrics_overhead: bool = False) -> Dict[str, dict]:
+    from app.main import create_app
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        prepare(os.path.join(tmp, "bench.db"), n_articles, n_events, n_categories, seed)
+        print(f"\n{n_articles} articles, {n_events} events (prepared in {time.perf_counter() - start:.1f}s)")
+
+        rng = random.Random(seed)
+        ids = [rng.randrange(1, n_articles + 1) for _ in range(repeat + 1)]
+        results = {}
+
+        def record(targets: List[Target], prefix: str = "") -> None:
+            for name, fn in targets:
+                name = prefix + name
+                results[name] = measure(fn, ids)
+                r = results[name]
+                print(f"  {name:42s} p50={r['p50_ms']:9.3f}ms  p95={r['p95_ms']:9.3f}ms  mean={r['mean_ms']:9.3f}ms")
+
+        record(strategy_targets())
+        record(repository_targets(n_articles, rng))
+
+        app = create_app()
+        app.extensions["warmup"].wait()
+        reads, writes = route_targets(app.test_client(), n_articles)
+        record(reads)
+        record(writes)
+        close_all()
+
+        if with_metrics_overhead:
+            enabled = Config.METRICS_ENABLED
+            try:
+                for on in (False, True):
+                    # connections pick their (instrumented or plain) class when opened
+                    Config.METRICS_ENABLED = on
+                    app = create_app()
+                    app.extensions["warmup"].wait()
+                    prefix = "metrics_on." if on else "metrics_off."
+                    record(repository_targets(n_articles, random.Random(seed)), prefix)
+                    record(route_targets(app.test_client(), n_articles)[0], prefix)
+                    close_all()
+            finally:
+                Config.METRICS_ENABLED = enabled
+            metrics_overhead(results)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_ms: float) -> List[str]:
+    """Lines describing every target whose p50 regressed against the baseline."""
+    regressions = []
+    print(f"\nCompared with baseline (flagged: p50 > +{threshold:.0%} and > +{min_delta_ms}ms)")
+    for size, targets in results["results"].items():
+        base_targets = baseline["results"].get(size)
+        if base_targets is None:
+            print(f"  {size} articles: not in baseline")
+            continue
+        for name, r in targets.items():
+            base = base_targets.get(name)
+            if base is None:
+                continue
+            delta = r["p50_ms"] - base["p50_ms"]
+            ratio = r["p50_ms"] / base["p50_ms"] if base["p50_ms"] else float("inf")
+            flagged = ratio > 1 + threshold and delta > min_delta_ms
+            line = (f"{size:>7} {name:42s} {base['p50_ms']:9.3f}ms -> {r['p50_ms']:9.3f}ms "
+                    f"({ratio - 1:+.0%})")
+            print(("  REGRESSION " if flagged else "             ") + line)
+            if flagged:
+                regressions.append(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000", help="article counts, comma separated")
+    parser.add_argument("--events", type=int, default=100000, help="events per size")
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=30, help="timed calls per target")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--metrics-overhead", action="store_true",
+                        help="also time reads with METRICS_ENABLED off and on")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--input", help="compare an existing results file instead of running")
+    parser.add_argument("--compare", help="baseline results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative p50 slowdown to flag")
+    parser.add_argument("--min-delta-ms", type=float, default=0.1, help="absolute p50 slowdown to flag")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, encoding="utf-8") as f:
+            results = json.load(f)
+    else:
+        results = {
+            "meta": {
+                "sizes": args.sizes,
+                "events": args.events,
+                "categories": args.categories,
+                "repeat": args.repeat,
+                "seed": args.seed,
+                "metrics_overhead": args.metrics_overhead,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            },
+            "results": {
+                size: run_size(int(size), args.events, args.categories, args.repeat, args.seed,
+                               args.metrics_overhead)
+                for size in args.sizes.split(",")
+            },
+        }
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+            print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s)")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
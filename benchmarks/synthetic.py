@@ -0,0 +1,109 @@
+"""Deterministic synthetic corpora for benchmarks."""
+import itertools
+import random
+import time
+from typing import List
+
+from app.models.article import Article
+from app.models.interaction_event import InteractionEvent
+
+WORDS = [
+    "ai", "model", "data", "cloud", "mobile", "privacy", "security", "network",
+    "startup", "market", "economy", "finance", "budget", "travel", "flight",
+    "hotel", "beach", "mountain", "city", "food", "recipe", "health", "fitness",
+    "sleep", "habit", "focus", "energy", "music", "film", "design", "science",
+    "climate", "energy", "battery", "robot", "space", "rocket", "planet",
+    "school", "career", "remote", "office", "team", "product", "launch",
+    "review", "guide", "tips", "future", "history", "culture", "language",
+    "football", "tennis", "garden", "home", "family", "pets", "coffee", "wine",
+]
+
+
+def _vocabulary(size: int) -> List[str]:
+    vocab = list(dict.fromkeys(WORDS))
+    i = 0
+    while len(vocab) < size:
+        vocab.append(f"term{i}")
+        i += 1
+    return vocab
+
+
+def generate_articles(n: int, n_categories: int = 20, words_per_article: int = 60,
+                      vocab_size: int = 20000, seed: int = 42) -> List[Article]:
+    """
+    N articles spread over M categories. Word draws follow a Zipf-like
+    distribution and every category has its own preferred slice of the
+    vocabulary, so similarity is concentrated inside categories.
+    """
+    rng = random.Random(seed)
+    vocab = _vocabulary(vocab_size)
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(vocab))))
+    categories = [f"Category {c}" for c in range(n_categories)]
+    # every category prefers its own rotation of the vocabulary
+    shifted = [
+        vocab[(c * len(vocab)) // n_categories:] + vocab[:(c * len(vocab)) // n_categories]
+        for c in range(n_categories)
+    ]
+
+    articles = []
+    for i in range(n):
+        c = rng.randrange(n_categories)
+        words = rng.choices(shifted[c], cum_weights=cum_weights, k=words_per_article)
+        articles.append(Article(
+            id=i + 1,
+            title=" ".join(words[:6]).title(),
+            category_id=c + 1,
+            content=" ".join(words[6:]),
+            category_name=categories[c],
+        ))
+    return articles
+
+
+def generate_events(n: int, n_articles: int, skew: float = 1.1, n_users: int = 1000,
+                    seed: int = 42, span_hours: int = 0) -> List[InteractionEvent]:
+    """
+    N interaction events over article ids 1..n_articles. Article popularity
+    follows a Zipf law with exponent `skew` over a shuffled id order, so the
+    most popular articles are not simply the lowest ids. With `span_hours`
+    the events get created_at spread uniformly over that many hours before
+    now; otherwise they are stamped on insert.
+    """
+    rng = random.Random(seed)
+    now = time.time()
+    ranked_ids = list(range(1, n_articles + 1))
+    rng.shuffle(ranked_ids)
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) ** skew for rank in range(n_articles)))
+
+    events = []
+    for article_id in rng.choices(ranked_ids, cum_weights=cum_weights, k=n):
+        roll = rng.random()
+        if roll < 0.7:
+            event_type, duration = "view", None
+        elif roll < 0.85:
+            event_type, duration = "like", None
+        else:
+            event_type, duration = "time_spent", rng.randint(5_000, 300_000)
+        events.append(InteractionEvent(
+            id=None,
+            article_id=article_id,
+            user_id=rng.randrange(1, n_users + 1),
+            event_type=event_type,
+            duration_ms=duration,
+            experiment_group=rng.choice("AB"),
+            created_at=time.strftime(
+                "%Y-%m-%d %H:%M:%S", time.gmtime(now - rng.random() * span_hours * 3600)
+            ) if span_hours else None,
+        ))
+    return events
+
+
+class InMemoryArticleService:
+    def __init__(self, articles: List[Article]):
+        self._articles = list(reversed(articles))  # newest first, like list_all()
+        self._by_id = {a.id: a for a in articles}
+
+    def list_articles(self):
+        return self._articles
+
+    def get_article(self, article_id: int):
+        return self._by_id.get(article_id)
@@ -0,0 +1,13 @@
+import argparse
+import logging
+
+from app.services.event_writer import run_writer
+
+# Single writer process for EVENT_INGEST_MODE=process: owns the only write
+# connection for interaction events. SIGTERM / Ctrl-C drains and exits.
+parser = argparse.ArgumentParser()
+parser.add_argument("--db-path", default=None, help="defaults to Config.DB_PATH")
+args = parser.parse_args()
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
+run_writer(args.db_path)
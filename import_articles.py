@@ -0,0 +1,139 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import time
+from typing import Dict, Iterator, List, Optional
+
+from app.config.config import Config
+from app.data.db import get_connection
+from app.data.schema import init_db
+from app.models.article import Article
+from app.repositories.article_repository import ArticleRepository
+from app.repositories.category_repository import CategoryRepository
+from app.repositories.import_progress_repository import ImportProgressRepository
+
+
+def read_records(path: str, skip: int = 0) -> Iterator[Optional[dict]]:
+    """
+    Stream records from a .csv file (header row) or a JSONL file (one
+    object per line), skipping the first `skip`. Unparseable lines yield
+    None so positions stay line-aligned.
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from itertools.islice(csv.DictReader(f), skip, None)
+        return
+    with open(path, encoding="utf-8") as f:
+        # skipped lines are not parsed at all
+        for line in itertools.islice(f, skip, None):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield record if isinstance(record, dict) else None
+
+
+def _text(record: dict, *keys: str) -> Optional[str]:
+    """First present value of `keys`, stripped ("" if absent); None if it is not a string."""
+    for key in keys:
+        value = record.get(key)
+        if value is not None:
+            return value.strip() if isinstance(value, str) else None
+    return ""
+
+
+def to_article(record: Optional[dict]) -> Optional[Article]:
+    """Article with category_name set (id resolved later); None if invalid."""
+    if record is None:
+        return None
+    title = _text(record, "title")
+    content = _text(record, "content")
+    category = _text(record, "category", "category_name")
+    # wrong types (numbers, lists, objects) make the record invalid, like missing text
+    if not title or not content or category is None:
+        return None
+    return Article(id=None, title=title, category_id=None, content=content, category_name=category or None)
+
+
+def import_articles(path: str, chunk_size: int = 5000, restart: bool = False) -> int:
+    """
+    Import articles from `path` in chunks of `chunk_size` records.
+
+    Each chunk (new categories, articles, and the resume position) is
+    written in one transaction, so an interrupted import continues after
+    the last committed chunk when run again. Categories are resolved
+    through an in-memory name -> id map; only unseen names hit the
+    database. Returns the number of articles imported by this run.
+    """
+    source = os.path.abspath(path)
+    progress = ImportProgressRepository()
+    if restart:
+        progress.reset(source)
+    position = progress.position(source)
+    if position:
+        print(f"Resuming {path} after record {position}")
+
+    article_repo = ArticleRepository()
+    category_repo = CategoryRepository()
+    categories: Dict[str, int] = category_repo.ids_by_name()
+
+    def write_chunk(chunk: List[Article], position: int) -> None:
+        conn = get_connection()
+        with conn:
+            cur = conn.cursor()
+            unseen = {a.category_name for a in chunk if a.category_name and a.category_name not in categories}
+            categories.update(category_repo.insert_missing(cur, unseen))
+            article_repo.insert_many(cur, [
+                Article(None, a.title, categories.get(a.category_name), a.content) for a in chunk
+            ])
+            progress.save(cur, source, position, len(chunk))
+
+    imported = skipped = 0
+    n = position
+    chunk: List[Article] = []
+    start = time.perf_counter()
+    for n, record in enumerate(read_records(path, skip=position), start=position + 1):
+        article = to_article(record)
+        if article is None:
+            skipped += 1
+        else:
+            chunk.append(article)
+        if n % chunk_size == 0:
+            write_chunk(chunk, n)
+            imported += len(chunk)
+            chunk = []
+            rate = (n - position) / (time.perf_counter() - start)
+            print(f"  {n} records, {imported} imported, {skipped} skipped ({rate:.0f} records/s)")
+
+    if n > position and n % chunk_size:
+        write_chunk(chunk, n)
+        imported += len(chunk)
+    print(f"Imported {imported} articles ({skipped} invalid records skipped) "
+          f"in {time.perf_counter() - start:.1f}s")
+    return imported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import articles from JSONL or CSV (title, content, category)")
+    parser.add_argument("path")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="records per transaction")
+    parser.add_argument("--restart", action="store_true", help="ignore the saved position and start over")
+    parser.add_argument("--skip-keywords", action="store_true", help="do not re-keyword the corpus afterwards")
+    parser.add_argument("--related", action="store_true", help="precompute related articles afterwards")
+    parser.add_argument("--workers", type=int, default=4, help="processes for the keyword pass")
+    args = parser.parse_args()
+
+    init_db()
+    imported = import_articles(args.path, args.chunk_size, args.restart)
+
+    # derived data is rebuilt once for the whole import, not per article
+    if imported and not args.skip_keywords:
+        from rekeyword import rekeyword
+        rekeyword(Config.KEYWORDS_TOP_N, 2000, args.workers)
+    if imported and args.related:
+        from precompute_related import precompute
+        precompute(top_k=50, block_size=256, full=False)
+    if imported:
+        print("Restart running servers so their content index picks up the new articles")
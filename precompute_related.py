@@ -0,0 +1,67 @@
+import argparse
+import hashlib
+import time
+
+from app.data.schema import init_db
+from app.repositories.article_repository import ArticleRepository
+from app.repositories.related_articles_repository import RelatedArticlesRepository
+from app.services.article_service import ArticleService
+from app.services.content_index import ContentIndex, build_text
+
+
+def content_hash(article) -> str:
+    return hashlib.sha1(build_text(article).encode("utf-8")).hexdigest()
+
+
+def precompute(top_k: int, block_size: int, full: bool) -> int:
+    """
+    Compute the top-K content neighbours of every new or changed article
+    (all articles with full=True) and store them in related_articles.
+    Similarities are computed one block of rows at a time (block @ M.T).
+    """
+    index = ContentIndex(ArticleService(repo=ArticleRepository()))
+    index.build()
+    inverted = index.inverted_index()
+    if inverted is None:
+        print("Nothing to do: no indexable articles")
+        return 0
+
+    repo = RelatedArticlesRepository()
+    known = {} if full else repo.content_hashes()
+    todo = []
+    for row, article in enumerate(index.articles):
+        digest = content_hash(article)
+        if known.get(article.id) != digest:
+            todo.append((row, article.id, digest))
+
+    print(f"{len(todo)} of {len(index.articles)} articles to (re)compute")
+    start = time.perf_counter()
+    for offset in range(0, len(todo), block_size):
+        block = todo[offset:offset + block_size]
+        products = index.matrix[[row for row, _, _ in block]] @ index.matrix.T
+
+        results = []
+        for i, (row, article_id, digest) in enumerate(block):
+            lo, hi = products.indptr[i], products.indptr[i + 1]
+            candidates, scores = products.indices[lo:hi], products.data[lo:hi]
+            score_of = dict(zip(candidates.tolist(), scores.tolist()))
+            ranked = inverted.rank_scored(row, candidates, scores, top_k)
+            results.append((article_id, digest, [
+                (index.articles[r].id, score_of.get(int(r), 0.0)) for r in ranked
+            ]))
+        repo.replace_many(results)
+
+        done = offset + len(block)
+        print(f"  {done}/{len(todo)} articles ({time.perf_counter() - start:.1f}s)")
+    return len(todo)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute related articles for ContentBasedStrategy")
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--block-size", type=int, default=256)
+    parser.add_argument("--full", action="store_true", help="recompute every article, not only new/changed ones")
+    args = parser.parse_args()
+
+    init_db()
+    precompute(args.top_k, args.block_size, args.full)
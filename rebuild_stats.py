@@ -0,0 +1,11 @@
+from app.config.config import Config
+from app.data.schema import init_db
+from app.services.event_aggregates import rebuild_event_aggregates
+
+# Repair/backfill: recompute article_stats, trending buckets and the A/B
+# rollup from interaction_events (one scan of the event log)
+init_db()
+counts = rebuild_event_aggregates(Config.TRENDING_WINDOW_HOURS)
+print(f"Rebuilt article_stats for {counts['article_stats']} articles, "
+      f"{counts['article_event_buckets']} trending buckets, "
+      f"{counts['experiment_group_stats']} A/B groups")
@@ -0,0 +1,71 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from app.data.schema import init_db
+from app.repositories.article_repository import ArticleRepository
+from app.repositories.keyword_repository import KeywordRepository
+from app.services.content_index import build_text, top_terms
+from app.services.incremental_tfidf import IncrementalTfidf
+
+_tfidf = None
+
+
+def _init_worker(tfidf) -> None:
+    global _tfidf
+    _tfidf = tfidf
+
+
+def _extract_chunk(ids, texts, top_n):
+    rows = top_terms(_tfidf.transform(texts), top_n, with_weights=True)
+    return [
+        (article_id, [(_tfidf.terms[t], weight) for t, weight in pairs])
+        for article_id, pairs in zip(ids, rows)
+    ]
+
+
+def rekeyword(top_n: int, chunk_size: int, workers: int) -> int:
+    """
+    Recompute the stored keywords of every article.
+
+    Document frequencies are counted once over the whole corpus (the same
+    weighting the ContentIndex uses), then chunks are vectorized and ranked
+    in parallel worker processes; each finished chunk is written in one
+    transaction.
+    """
+    articles = ArticleRepository().list_all()
+    texts = [build_text(a) for a in articles]
+    tfidf = IncrementalTfidf()
+    tfidf.add_many(texts)
+    if tfidf.n_terms == 0:
+        print("Nothing to do: no indexable articles")
+        return 0
+
+    repo = KeywordRepository()
+    chunks = [
+        ([a.id for a in articles[start:start + chunk_size]], texts[start:start + chunk_size])
+        for start in range(0, len(articles), chunk_size)
+    ]
+    print(f"{len(articles)} articles in {len(chunks)} chunks, {workers} workers")
+
+    start = time.perf_counter()
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tfidf.frozen(),)) as pool:
+        futures = [pool.submit(_extract_chunk, ids, chunk_texts, top_n) for ids, chunk_texts in chunks]
+        for future in as_completed(futures):
+            results = future.result()
+            repo.replace_many(results)
+            done += len(results)
+            print(f"  {done}/{len(articles)} articles ({time.perf_counter() - start:.1f}s)")
+    return done
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-keyword the whole corpus into article_keywords")
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    init_db()
+    rekeyword(args.top_n, args.chunk_size, args.workers)
@@ -0,0 +1,171 @@
+import argparse
+import itertools
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.config.config import Config
+from app.data.db import get_connection
+from app.data.schema import init_db
+from app.repositories.import_progress_repository import ImportProgressRepository
+from app.services.event_aggregates import rebuild_event_aggregates
+
+EVENT_TYPES = {"view", "like", "time_spent"}
+
+INSERT_SQL = """
+    INSERT INTO interaction_events(article_id, user_id, event_type, duration_ms, experiment_group, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+Row = Tuple[int, Optional[int], str, Optional[int], Optional[str], str]
+
+
+def normalize_timestamp(value) -> Optional[str]:
+    """ISO-8601 (any offset, or naive = UTC) to SQLite's "YYYY-MM-DD HH:MM:SS" in UTC."""
+    if not isinstance(value, str):
+        return None
+    if len(value) == 19 and value[10] == " " and value[4] == "-" and value[13] == ":":
+        # already in SQLite's format (dumps of this database): store as is
+        return value
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def to_row(line: str) -> Optional[Row]:
+    """Insert parameters for one JSONL line; None if it is not a valid event."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict):
+        return None
+    article_id, user_id = record.get("article_id"), record.get("user_id")
+    event_type, duration = record.get("event_type"), record.get("duration_ms")
+    group = record.get("experiment_group")
+    created_at = normalize_timestamp(record.get("created_at"))
+    if (not isinstance(article_id, int) or event_type not in EVENT_TYPES or created_at is None
+            or not (user_id is None or isinstance(user_id, int))
+            or not (duration is None or isinstance(duration, int))
+            # a list or object would make the whole chunk's insert fail
+            or not (group is None or isinstance(group, str))):
+        return None
+    return (article_id, user_id, event_type, duration, group, created_at)
+
+
+def read_chunks(path: str, chunk_size: int, skip: int = 0) -> Iterator[Tuple[int, List[Row], int]]:
+    """Yield (lines consumed so far, valid rows, invalid lines) per `chunk_size` lines."""
+    position = skip
+    with open(path, encoding="utf-8") as f:
+        lines = itertools.islice(f, skip, None)
+        while True:
+            chunk = list(itertools.islice(lines, chunk_size))
+            if not chunk:
+                return
+            rows = [row for row in map(to_row, chunk) if row is not None]
+            position += len(chunk)
+            yield position, rows, len(chunk) - len(rows)
+
+
+def secondary_indexes(conn) -> Dict[str, str]:
+    """{name: CREATE INDEX sql} of interaction_events' explicit indexes."""
+    rows = conn.execute(
+        "SELECT name, sql FROM sqlite_master "
+        "WHERE type = 'index' AND tbl_name = 'interaction_events' AND sql IS NOT NULL"
+    )
+    return {name: sql for name, sql in rows}
+
+
+def drop_indexes(conn, saved_path: str) -> None:
+    indexes = secondary_indexes(conn)
+    if os.path.exists(saved_path):
+        # left by a load that crashed before recreating them
+        with open(saved_path, encoding="utf-8") as f:
+            indexes.update(json.load(f))
+    # definitions are saved first so a crashed load can still recreate them
+    with open(saved_path, "w", encoding="utf-8") as f:
+        json.dump(indexes, f)
+    for name in indexes:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def recreate_indexes(conn, saved_path: str) -> None:
+    if not os.path.exists(saved_path):
+        return
+    with open(saved_path, encoding="utf-8") as f:
+        indexes = json.load(f)
+    existing = secondary_indexes(conn)
+    for name, sql in indexes.items():
+        if name in existing:
+            continue
+        start = time.perf_counter()
+        conn.execute(sql)
+        print(f"  recreated {name} ({time.perf_counter() - start:.1f}s)")
+    os.remove(saved_path)
+
+
+def replay(path: str, chunk_size: int = 50000, restart: bool = False, drop: bool = False) -> int:
+    """
+    Load historical events from a JSONL dump into interaction_events,
+    keeping their created_at and experiment_group.
+
+    Lines are read `chunk_size` at a time and each chunk is written with one
+    executemany in one transaction, together with the resume position, so
+    memory stays bounded and a rerun continues after the last committed
+    chunk. Derived aggregates are not touched per chunk; they are rebuilt
+    in a single pass at the end. With drop=True the secondary indexes on
+    interaction_events are dropped for the load and rebuilt afterwards.
+    Returns the number of events loaded by this run.
+    """
+    source = os.path.abspath(path)
+    progress = ImportProgressRepository()
+    if restart:
+        progress.reset(source)
+    position = progress.position(source)
+    if position:
+        print(f"Resuming {path} after line {position}")
+
+    conn = get_connection()
+    saved_indexes = f"{Config.DB_PATH}.replay-indexes.json"
+    if drop:
+        drop_indexes(conn, saved_indexes)
+
+    loaded = skipped = 0
+    start = time.perf_counter()
+    for position_after, rows, invalid in read_chunks(path, chunk_size, skip=position):
+        with conn:
+            cur = conn.cursor()
+            cur.executemany(INSERT_SQL, rows)
+            progress.save(cur, source, position_after, len(rows))
+        loaded += len(rows)
+        skipped += invalid
+        rate = loaded / (time.perf_counter() - start)
+        print(f"  line {position_after}: {loaded} events loaded, {skipped} skipped ({rate:.0f} events/s)")
+
+    recreate_indexes(conn, saved_indexes)
+
+    aggregate_start = time.perf_counter()
+    counts = rebuild_event_aggregates(Config.TRENDING_WINDOW_HOURS)
+    print(f"Rebuilt aggregates in {time.perf_counter() - aggregate_start:.1f}s: {counts}")
+    print(f"Loaded {loaded} events ({skipped} invalid lines skipped) in {time.perf_counter() - start:.1f}s")
+    return loaded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a JSONL event dump into interaction_events")
+    parser.add_argument("path")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="lines per transaction")
+    parser.add_argument("--restart", action="store_true", help="ignore the saved position and start over")
+    parser.add_argument("--drop-indexes", action="store_true",
+                        help="drop secondary indexes during the load and rebuild them afterwards")
+    args = parser.parse_args()
+
+    init_db()
+    replay(args.path, args.chunk_size, args.restart, args.drop_indexes)
+    print("Restart running servers so in-memory models pick up the replayed events")
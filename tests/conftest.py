@@ -0,0 +1,14 @@
+import pytest
+
+from app.config.config import Config
+from app.data.db import close_connection, get_connection
+from app.data.schema import init_db
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Fresh, migrated SQLite database in a temp dir; yields the connection."""
+    monkeypatch.setattr(Config, "DB_PATH", str(tmp_path / "test.db"))
+    init_db()
+    yield get_connection()
+    close_connection()
@@ -0,0 +1,69 @@
+from app.config.config import Config
+from app.repositories.article_repository import ArticleRepository
+from app.services.article_service import ArticleService
+from app.services.content_index import ContentIndex
+from app.services.interaction_event_service import InteractionEventService
+from app.services.item_similarity import ItemItemModel
+from app.services.recommendation_cache import DataVersion, RecommendationCache
+from app.services.recommendation_factory import RecommendationFactory
+from app.services.trending_service import TrendingService
+from benchmarks.suite import prepare
+
+
+def test_recommend_many_matches_recommend_for_every_strategy(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "DB_PATH", str(tmp_path / "batch.db"))
+    prepare(Config.DB_PATH, n_articles=300, n_events=5000, n_categories=8, seed=7)
+
+    article_service = ArticleService()
+    event_service = InteractionEventService()
+    content_index = ContentIndex(article_service)
+    trending = TrendingService(window_hours=Config.TRENDING_WINDOW_HOURS)
+    item_model = ItemItemModel()
+    seeds = [5, 17, 17, 120, 299, 100000]
+
+    for name in ["popular", "content", "hybrid", "trending", "collaborative", "als"]:
+        strategy = RecommendationFactory.create(
+            name, article_service, event_service,
+            content_index=content_index, trending=trending, item_model=item_model,
+        )
+        many = strategy.recommend_many(seeds, limit=6)
+        assert list(many) == [5, 17, 120, 299, 100000]
+        for seed in many:
+            assert [a.id for a in many[seed]] == [a.id for a in strategy.recommend(seed, 6)], (name, seed)
+
+
+def test_cached_batch_serves_seen_seeds_from_the_cache():
+    class Counting:
+        def __init__(self):
+            self.batches = []
+
+        def recommend_many(self, article_ids, limit=5):
+            self.batches.append(list(article_ids))
+            return {i: [] for i in article_ids}
+
+    inner = Counting()
+    strategy = RecommendationCache(DataVersion()).wrap("content", inner)
+    strategy.recommend_many([1, 2], limit=3)
+    strategy.recommend_many([2, 3, 3], limit=3)
+    assert inner.batches == [[1, 2], [3]]
+
+
+def test_batch_endpoint(db, monkeypatch):
+    monkeypatch.setattr(Config, "WARMUP_ENABLED", False)
+    from app.main import create_app
+
+    client = create_app().test_client()  # seeds the sample articles
+    ids = [a.id for a in ArticleRepository().list_all()[:3]]
+
+    response = client.post("/api/recommendations/batch",
+                           json={"article_ids": ids, "strategy": "content", "limit": 2})
+    assert response.status_code == 200
+    body = response.json
+    assert body["actual_strategy"] == "ContentBasedStrategy"
+    assert [r["article_id"] for r in body["results"]] == ids
+    for r in body["results"]:
+        single = client.get(f"/api/recommendations/{r['article_id']}?strategy=content").json
+        assert r["recommendations"] == single["recommendations"][:2]
+
+    assert client.post("/api/recommendations/batch", json={"article_ids": []}).status_code == 400
+    assert client.post("/api/recommendations/batch", json={"article_ids": [1], "limit": 0}).status_code == 400
@@ -0,0 +1,54 @@
+from app.cache import LRUCache
+from app.models.article import Article
+from app.repositories.cached_repository import CachedArticleRepository, CategoryNameCache
+
+
+def test_lru_evicts_least_recently_used_and_counts():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_entries_expire_after_ttl():
+    cache = LRUCache(maxsize=2, ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_article_create_invalidates_cached_list(db):
+    cached = CachedArticleRepository()
+    assert cached.list_all() == []
+    cached.list_all()
+
+    new_id = cached.create(Article(None, "Title", None, "Body"))
+
+    assert [a.id for a in cached.list_all()] == [new_id]
+    assert cached.count() == 1
+    assert cached.stats()["hits"] == 1
+
+
+def test_category_names_come_from_memory(db):
+    names = CategoryNameCache()
+    tech_id = names.repo.create_or_get_id("Technology")
+    assert names.name_for(tech_id) == "Technology"
+
+    travel_id = names.repo.create_or_get_id("Travel")
+    assert names.name_for(travel_id) == "Travel"
+    assert names.reloads == 1
+
+
+def test_create_listeners_are_per_repository(db):
+    first, second = CachedArticleRepository(), CachedArticleRepository()
+    seen = []
+    first.subscribe(seen.append)
+    second.create(Article(None, "Other", None, "Body"))
+    new_id = first.create(Article(None, "Title", None, "Body"))
+    assert seen == [new_id]
@@ -0,0 +1,82 @@
+from app.models.article import Article
+from app.services.content_index import ContentIndex
+
+
+class FakeArticleService:
+    def __init__(self, articles):
+        self.articles = list(articles)
+
+    def list_articles(self):
+        return list(reversed(self.articles))
+
+    def get_article(self, article_id):
+        return next((a for a in self.articles if a.id == article_id), None)
+
+
+def make_articles():
+    return [
+        Article(1, "AI in apps", 1, "machine learning personalizes mobile apps", "Tech"),
+        Article(2, "Budget travel", 2, "cheap flights and hostels for travel", "Travel"),
+        Article(3, "AR and VR", 1, "virtual reality headsets and apps", "Tech"),
+    ]
+
+
+def test_same_category_ranked_first():
+    index = ContentIndex(FakeArticleService(make_articles()))
+    results = index.similar(1, limit=2)
+    assert [a.id for a in results] == [3, 2]
+
+
+def test_created_article_is_indexed_without_rebuild():
+    service = FakeArticleService(make_articles())
+    index = ContentIndex(service, refit_ratio=1.0)
+    index.build()
+
+    service.articles.append(Article(4, "Travel apps", 2, "apps for cheap flights", "Travel"))
+    index.on_article_created(4)
+
+    assert index.id_to_row[4] == 3
+    assert index.matrix.shape[0] == 4
+    assert [a.id for a in index.similar(2, limit=1)] == [4]
+
+
+def test_appends_grow_in_place_and_leave_snapshots_alone():
+    from app.services.incremental_tfidf import IncrementalTfidf
+
+    service = FakeArticleService(make_articles())
+    index = ContentIndex(service, refit_ratio=100.0)
+    index.build()
+    snapshot = index._snapshot()
+
+    for i in range(4, 40):
+        article = Article(i, f"Travel apps {i}", 2 if i % 2 else 1, f"apps for cheap flights word{i}", "Travel")
+        service.articles.append(article)
+        index.add_article(article)
+
+    matrix, articles, ids, category_ids = snapshot
+    # the article list is shared and only grows; the arrays stop at the snapshot's rows
+    assert matrix.shape[0] == len(ids) == len(category_ids) == 3
+    assert [a.id for a in articles[:3]] == list(ids) == [3, 2, 1]
+
+    # appended rows are weighted with the IDF of their moment, as IncrementalTfidf.add() returns them
+    replay = IncrementalTfidf()
+    replay.add_many([" ".join([a.title, a.content, a.category_name]) for a in reversed(make_articles())])
+    dense = index.matrix.toarray()
+    assert dense.shape == (39, index.tfidf.n_terms)
+    for row, article in enumerate(service.articles[3:], start=3):
+        vector = replay.add(" ".join([article.title, article.content, article.category_name])).toarray().ravel()
+        assert abs(dense[row, :len(vector)] - vector).max() < 1e-12
+    assert list(index._ids) == [3, 2, 1] + list(range(4, 40))
+
+
+def test_top_terms_matches_per_row_sort():
+    from scipy.sparse import csr_matrix
+    from app.services.content_index import top_terms
+
+    matrix = csr_matrix([
+        [0.1, 0.0, 0.7, 0.3, 0.0],
+        [0.0, 0.0, 0.0, 0.0, 0.0],
+        [0.0, 0.9, 0.0, 0.0, 0.2],
+    ])
+    assert top_terms(matrix, 2) == [[2, 3], [], [1, 4]]
+    assert top_terms(matrix, 3) == [[2, 3, 0], [], [1, 4]]
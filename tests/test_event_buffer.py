@@ -0,0 +1,60 @@
+from app.models.interaction_event import InteractionEvent
+from app.services.event_buffer import EventWriteBuffer
+
+
+def make_event(article_id):
+    return InteractionEvent(id=None, article_id=article_id, user_id=None, event_type="view")
+
+
+def test_batches_are_bounded_by_batch_size():
+    batches = []
+    buffer = EventWriteBuffer(batches.append, batch_size=3, flush_interval=0.05).start()
+    for i in range(7):
+        assert buffer.put(make_event(i))
+    buffer.flush()
+    buffer.close()
+
+    assert sum(len(b) for b in batches) == 7
+    assert max(len(b) for b in batches) <= 3
+
+
+def test_close_drains_queue_and_rejects_new_events():
+    batches = []
+    buffer = EventWriteBuffer(batches.append, batch_size=100, flush_interval=10).start()
+    buffer.put(make_event(1))
+    buffer.put(make_event(2))
+    buffer.close()
+
+    assert [e.article_id for b in batches for e in b] == [1, 2]
+    assert buffer.put(make_event(3)) is False
+
+
+def test_put_many_stops_at_a_full_queue():
+    buffer = EventWriteBuffer(lambda batch: None, max_size=2, put_timeout=0.01)
+    # not started: nothing drains the queue
+    assert buffer.put_many([make_event(i) for i in range(3)]) == 2
+
+
+def test_failing_batches_are_retried_then_spilled():
+    attempts, spilled = [], []
+
+    def flaky(batch):
+        attempts.append(len(batch))
+        if len(attempts) < 3:
+            raise RuntimeError("database is locked")
+
+    buffer = EventWriteBuffer(flaky, batch_size=10, flush_interval=0.01, retry_backoff=0.001,
+                              spill=spilled.extend).start()
+    buffer.put_many([make_event(i) for i in range(2)])
+    buffer.flush()
+    assert attempts == [2, 2, 2] and spilled == []
+
+    def broken(batch):
+        raise RuntimeError("disk I/O error")
+
+    buffer.write_batch = broken
+    buffer.put_many([make_event(i) for i in range(3)])
+    buffer.flush()  # returns once the batch is on the spill, not before
+    buffer.close()
+    assert [e.article_id for e in spilled] == [0, 1, 2]
+    assert buffer.spilled == 3 and buffer.dropped == 0
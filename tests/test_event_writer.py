@@ -0,0 +1,104 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from app.models.article import Article
+from app.models.interaction_event import InteractionEvent
+from app.repositories.article_repository import ArticleRepository
+from app.services.event_writer import EventWriterClient, EventWriterServer, SpillDirectory, SpillReplayer
+
+AUTHKEY = b"test"
+
+
+def count_events(db, article_id):
+    return db.execute("SELECT COUNT(*) FROM interaction_events WHERE article_id = ?", (article_id,)).fetchone()[0]
+
+
+def test_client_hands_events_to_writer_process(db, tmp_path):
+    article_id = ArticleRepository().create(Article(None, "t", None, "x"))
+    address = str(tmp_path / "writer.sock")
+    server = EventWriterServer(address, AUTHKEY, str(tmp_path / "spill"), flush_interval=0.01)
+    assert server.acquire()
+    # a second writer for the same socket backs off
+    assert not EventWriterServer(address, AUTHKEY, str(tmp_path / "spill")).acquire()
+
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        client = EventWriterClient(address, AUTHKEY, str(tmp_path / "spill"))
+        for _ in range(50):
+            if client.ping():
+                break
+            time.sleep(0.02)
+        client.put_many([InteractionEvent(None, article_id, 7, "view") for _ in range(5)])
+        server.buffer.flush()
+    finally:
+        server.close()
+        thread.join()
+
+    assert client.stats() == {"sent": 5, "spilled": 0}
+    assert count_events(db, article_id) == 5
+    # stamped by the client, not at commit time
+    assert db.execute("SELECT COUNT(*) FROM interaction_events WHERE created_at IS NULL").fetchone()[0] == 0
+
+
+def test_unreachable_writer_spills_and_replays(db, tmp_path):
+    article_id = ArticleRepository().create(Article(None, "t", None, "x"))
+    spill_dir = str(tmp_path / "spill")
+    client = EventWriterClient(str(tmp_path / "missing.sock"), AUTHKEY, spill_dir, timeout=0.1)
+    client.put_many([InteractionEvent(None, article_id, None, "like"), InteractionEvent(None, article_id, None, "view")])
+
+    assert client.stats() == {"sent": 0, "spilled": 2}
+    assert count_events(db, article_id) == 0
+
+    server = EventWriterServer(str(tmp_path / "writer.sock"), AUTHKEY, spill_dir)
+    assert server.replay() == 2
+    assert server.replay() == 0
+    assert count_events(db, article_id) == 2
+    assert db.execute("SELECT likes FROM article_stats WHERE article_id = ?", (article_id,)).fetchone()[0] == 1
+
+
+def test_replayers_sharing_a_directory_replay_each_file_once(tmp_path):
+    spill_dir = str(tmp_path / "spill")
+    SpillDirectory(spill_dir).append([InteractionEvent(None, 1, None, "view")])
+    written = []
+    other = SpillReplayer(SpillDirectory(spill_dir), written.extend)
+
+    def write_batch(batch):
+        # another worker's pass while ours is mid-file: it must leave the file alone
+        assert other.replay() == 0
+        written.extend(batch)
+
+    assert SpillReplayer(SpillDirectory(spill_dir), write_batch).replay() == 1
+    assert other.replay() == 0
+    assert [e.article_id for e in written] == [1]
+    assert os.listdir(spill_dir) == []
+
+
+def test_claims_of_exited_processes_are_taken_over(tmp_path):
+    spill_dir = tmp_path / "spill"
+    SpillDirectory(str(spill_dir)).append([InteractionEvent(None, 1, None, "view")])
+    exited = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                            capture_output=True, text=True, check=True).stdout.strip()
+    spill = next(spill_dir.iterdir())
+    spill.rename(spill_dir / f"{spill.name}.1.{exited}-1.replay")
+    written = []
+    assert SpillReplayer(SpillDirectory(str(spill_dir)), written.extend).replay() == 1
+    assert os.listdir(spill_dir) == []
+
+
+def test_writer_with_another_authkey_is_treated_as_unreachable(db, tmp_path, monkeypatch):
+    from multiprocessing import AuthenticationError
+
+    client = EventWriterClient(str(tmp_path / "writer.sock"), AUTHKEY, str(tmp_path / "spill"), timeout=0.1)
+
+    def rejected():
+        raise AuthenticationError("digest sent was rejected")
+
+    # what Client() raises when the writer runs with another SECRET_KEY
+    monkeypatch.setattr(client, "_connection", rejected)
+    assert client.ping() is False
+    client.put_many([InteractionEvent(None, 1, None, "view")])
+    assert client.stats() == {"sent": 0, "spilled": 1}
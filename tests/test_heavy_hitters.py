@@ -0,0 +1,93 @@
+import random
+
+from app.models.interaction_event import InteractionEvent
+from app.services.heavy_hitters import HeavyHittersTracker, merge_snapshots, score_of
+
+
+def skewed_events(n, n_articles=500, seed=7):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(n_articles)]
+    events = []
+    for article_id in rng.choices(range(1, n_articles + 1), weights=weights, k=n):
+        kind = rng.choice(["view", "view", "view", "like", "time_spent"])
+        events.append(InteractionEvent(None, article_id, None, kind,
+                                       duration_ms=rng.randint(1000, 90000) if kind == "time_spent" else None))
+    return events
+
+
+def exact_scores(events):
+    totals = {}
+    for e in events:
+        t = totals.setdefault(e.article_id, [0, 0, 0])
+        if e.event_type == "view":
+            t[0] += 1
+        elif e.event_type == "like":
+            t[1] += 1
+        else:
+            t[2] += e.duration_ms
+    return {article_id: score_of(*t) for article_id, t in totals.items()}
+
+
+def test_estimates_bound_true_scores_and_find_heavy_hitters():
+    events = skewed_events(20000)
+    tracker = HeavyHittersTracker(capacity=100)
+    for start in range(0, len(events), 250):
+        tracker.on_events_logged(events[start:start + 250])
+
+    exact = exact_scores(events)
+    top = tracker.top(100)
+    for article_id, estimate, error in top:
+        assert estimate - error - 1e-9 <= exact[article_id] <= estimate + 1e-9
+
+    # every article above total/capacity is tracked
+    threshold = tracker.total / tracker.capacity
+    heavy = {a for a, s in exact.items() if s > threshold}
+    assert heavy <= {a for a, _, _ in top}
+    expected = sorted(exact, key=lambda a: (exact[a], a), reverse=True)[:5]
+    assert tracker.popular_article_ids(5) == expected
+
+
+def test_snapshot_round_trip(tmp_path):
+    tracker = HeavyHittersTracker(capacity=50, snapshot_path=str(tmp_path / "hh.json"))
+    tracker.on_events_logged(skewed_events(3000))
+    tracker.close()
+
+    restored = HeavyHittersTracker(capacity=50, snapshot_path=str(tmp_path / "hh.json"))
+    assert restored.load()
+    assert restored.top(20) == tracker.top(20)
+    assert restored.popular_article_ids(3, exclude_article_id=1) == tracker.popular_article_ids(3, exclude_article_id=1)
+
+
+def test_snapshots_of_exited_workers_are_merged_once(tmp_path):
+    import os
+
+    path = str(tmp_path / "hh.json")
+    events = skewed_events(6000)
+    exact = exact_scores(events)
+    for fake_pid, half in ((999999001, events[:3000]), (999999002, events[3000:])):
+        worker = HeavyHittersTracker(capacity=50, snapshot_path=path)
+        worker.on_events_logged(half)
+        worker.snapshot()
+        os.replace(f"{path}.{os.getpid()}", f"{path}.{fake_pid}")  # as if written by an exited worker
+
+    restarted = HeavyHittersTracker(capacity=50, snapshot_path=path)
+    assert restarted.load()
+    for article_id, estimate, error in restarted.top(20):
+        assert estimate - error - 1e-9 <= exact[article_id] <= estimate + 1e-9
+    expected = sorted(exact, key=lambda a: (exact[a], a), reverse=True)[:5]
+    assert restarted.popular_article_ids(5) == expected
+
+    # the merged counts now live in this process's snapshot only
+    restarted.snapshot()
+    assert sorted(os.listdir(tmp_path)) == [f"hh.json.{os.getpid()}"]
+    again = HeavyHittersTracker(capacity=50, snapshot_path=path)
+    assert again.load() and again.top(20) == restarted.top(20)
+
+
+def test_merge_is_independent_of_snapshot_order():
+    # both sketches full: each id may have been evicted from the other one
+    first = {"capacity": 1, "total": 10.0, "counters": [[1, 10.0, 0.0, 0]]}
+    second = {"capacity": 1, "total": 5.0, "counters": [[2, 5.0, 0.0, 0]]}
+    merged, total = merge_snapshots([first, second])
+    assert (merged, total) == merge_snapshots([second, first])
+    assert merged == {1: [15.0, 5.0, 0], 2: [15.0, 10.0, 0]} and total == 15.0
@@ -0,0 +1,44 @@
+import json
+
+from app.repositories.article_repository import ArticleRepository
+from import_articles import import_articles
+
+
+def write_jsonl(path, records):
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write((record if isinstance(record, str) else json.dumps(record)) + "\n")
+
+
+def test_import_streams_chunks_and_resumes(db, tmp_path):
+    path = tmp_path / "articles.jsonl"
+    write_jsonl(path, [
+        {"title": "One", "content": "alpha", "category": "Tech"},
+        "not json",
+        {"title": "Two", "content": "beta", "category": "Travel"},
+        {"title": "", "content": "no title"},
+        {"title": "Three", "content": "gamma", "category": "Tech"},
+    ])
+    assert import_articles(str(path), chunk_size=2) == 3
+
+    # appended records are picked up on the next run, nothing is imported twice
+    write_jsonl(path, [{"title": "Four", "content": "delta"}])
+    assert import_articles(str(path), chunk_size=2) == 1
+
+    repo = ArticleRepository()
+    assert sorted(a.title for a in repo.list_all()) == ["Four", "One", "Three", "Two"]
+    assert dict(repo.count_by_category()) == {"Tech": 2, "Travel": 1, None: 1}
+    assert tuple(db.execute("SELECT position, imported FROM import_progress").fetchone()) == (6, 4)
+
+
+def test_records_with_wrong_field_types_are_skipped(db, tmp_path):
+    path = tmp_path / "articles.jsonl"
+    write_jsonl(path, [
+        {"title": 42, "content": "number title"},
+        {"title": "List", "content": ["a", "b"]},
+        {"title": "Object", "content": "x", "category": {"name": "Tech"}},
+        {"title": "Fallback", "content": "x", "category": None, "category_name": 7},
+        {"title": "Kept", "content": "x", "category_name": "Tech"},
+    ])
+    assert import_articles(str(path), chunk_size=2) == 1
+    assert [(a.title, a.category_name) for a in ArticleRepository().list_all()] == [("Kept", "Tech")]
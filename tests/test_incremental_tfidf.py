@@ -0,0 +1,56 @@
+import random
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from app.services.incremental_tfidf import IncrementalTfidf
+
+WORDS = ["ai", "apps", "mobile", "travel", "budget", "flights", "habits", "sleep",
+         "focus", "vr", "the", "and", "cheap", "guide", "tips", "Python"]
+
+# documented bound between IncrementalTfidf.matrix() and sklearn
+TOLERANCE = 1e-12
+
+
+def corpus(n, seed=3):
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(1, 12))) for _ in range(n)]
+
+
+def sklearn_dense(texts, terms):
+    vectorizer = TfidfVectorizer(lowercase=True, stop_words="english")
+    expected = vectorizer.fit_transform(texts).toarray()
+    # reorder sklearn's alphabetical columns to first-seen order
+    return expected[:, [vectorizer.vocabulary_[t] for t in terms]]
+
+
+def test_matrix_matches_sklearn():
+    texts = corpus(200)
+    tfidf = IncrementalTfidf()
+    tfidf.add_many(texts)
+
+    actual = tfidf.matrix().toarray()
+    assert np.abs(actual - sklearn_dense(texts, tfidf.terms)).max() < TOLERANCE
+
+
+def test_added_documents_use_current_idf_until_renormalized():
+    texts = corpus(120)
+    tfidf = IncrementalTfidf()
+    tfidf.add_many(texts[:100])
+    rows = [tfidf.add(text) for text in texts[100:]]
+
+    # the last row was weighted with the final IDF, so it is exact
+    expected = sklearn_dense(texts, tfidf.terms)
+    last = rows[-1].toarray().ravel()
+    assert np.abs(last - expected[-1, :len(last)]).max() < TOLERANCE
+
+    # re-weighting from stored counts brings every row back in line
+    assert np.abs(tfidf.matrix().toarray() - expected).max() < TOLERANCE
+
+
+def test_transform_ignores_unknown_terms_and_leaves_state_alone():
+    tfidf = IncrementalTfidf()
+    tfidf.add_many(["ai apps", "travel budget"])
+    row = tfidf.transform(["ai quantum"])
+    assert tfidf.n_docs == 2 and "quantum" not in tfidf.vocabulary
+    assert row.nnz == 1 and row[0, tfidf.vocabulary["ai"]] == 1.0
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from app.models.article import Article
+from app.services.content_index import ContentIndex
+
+WORDS = ["ai", "apps", "mobile", "travel", "budget", "flights", "habits", "sleep",
+         "focus", "energy", "vr", "headset", "beach", "hotel", "recipe", "coffee"]
+
+
+class FakeArticleService:
+    def __init__(self, articles):
+        self.articles = articles
+
+    def list_articles(self):
+        return list(reversed(self.articles))
+
+    def get_article(self, article_id):
+        return next((a for a in self.articles if a.id == article_id), None)
+
+
+def make_corpus(n=300, seed=3):
+    rng = random.Random(seed)
+    articles = []
+    for i in range(1, n + 1):
+        category_id = rng.choice([1, 2, 3, 4, None])
+        # short texts over a small vocabulary: plenty of ties and zero-similarity pairs
+        words = rng.choices(WORDS, k=rng.randint(1, 4))
+        articles.append(Article(i, words[0], category_id, " ".join(words[1:])))
+    return articles
+
+
+@pytest.fixture(scope="module")
+def index():
+    index = ContentIndex(FakeArticleService(make_corpus()))
+    index.build()
+    return index
+
+
+@pytest.mark.parametrize("limit", [1, 5, 8, 40, 400])
+def test_inverted_matches_brute_force(index, limit):
+    for article in index.articles:
+        expected = [a.id for a in index.similar_brute_force(article.id, limit)]
+        actual = [a.id for a in index.similar(article.id, limit)]
+        assert actual == expected, article.id
+
+
+def test_inverted_matches_brute_force_on_a_zipf_vocabulary():
+    from benchmarks.synthetic import generate_articles
+
+    # long documents over a 5000-term Zipf vocabulary, as in the benchmarks
+    articles = generate_articles(400, n_categories=8, vocab_size=5000, seed=11)
+    index = ContentIndex(FakeArticleService(articles))
+    index.build()
+    for article in articles[::4]:
+        for limit in (5, 20):
+            expected = [a.id for a in index.similar_brute_force(article.id, limit)]
+            assert [a.id for a in index.similar(article.id, limit)] == expected, article.id
+
+
+def test_appended_articles_extend_the_postings():
+    corpus = make_corpus(n=360, seed=5)
+    # terms the postings have never seen
+    corpus += [Article(361, "zebra", 2, "quantum zebra ai"), Article(362, "quantum", 2, "zebra travel")]
+    service = FakeArticleService(corpus[:300])
+    index = ContentIndex(service, refit_ratio=1.0)  # no re-weighting: rows are only appended
+    index.build()
+    base = index.inverted_index()
+
+    for article in corpus[300:]:
+        service.articles.append(article)
+        index.add_article(article)
+    extended = index.inverted_index()
+    assert extended is not base and extended.n_indexed == base.n_indexed == 300
+    assert extended.doc_index is base.doc_index  # postings shared, not rebuilt
+
+    for article in corpus[::3]:
+        for limit in (1, 8, 40):
+            expected = [a.id for a in index.similar_brute_force(article.id, limit)]
+            assert [a.id for a in index.similar(article.id, limit)] == expected, article.id
@@ -0,0 +1,91 @@
+import random
+
+from app.config.config import Config
+from app.models.article import Article
+from app.repositories.article_repository import ArticleRepository
+from app.repositories.keyword_repository import KeywordRepository
+from app.services.analytics_service import AnalyticsService
+from app.services.article_service import ArticleService
+from app.services.content_index import ContentIndex
+from app.services.keyword_extractor import KeywordExtractor
+from rekeyword import rekeyword
+
+WORDS = ["ai", "apps", "mobile", "travel", "budget", "flights", "habits", "sleep", "focus", "vr"]
+
+
+def seed_articles(n=30):
+    rng = random.Random(11)
+    repo = ArticleRepository()
+    for _ in range(n):
+        words = rng.choices(WORDS, k=5)
+        repo.create(Article(None, words[0], None, " ".join(words[1:])))
+
+
+def test_batch_rekeyword_matches_index_keywords(db):
+    seed_articles()
+    assert rekeyword(top_n=4, chunk_size=7, workers=2) == 30
+
+    service = ArticleService(repo=ArticleRepository())
+    index = ContentIndex(service)
+    ids = [a.id for a in service.list_articles()]
+    expected = index.keyword_weights(ids, top_n=4)
+    stored = KeywordRepository().for_articles(ids, top_n=4)
+
+    assert stored.keys() == expected.keys()
+    for article_id, pairs in expected.items():
+        assert [k for k, _ in stored[article_id]] == [k for k, _ in pairs]
+        assert [round(w, 9) for _, w in stored[article_id]] == [round(w, 9) for _, w in pairs]
+
+
+def test_keywords_are_stored_on_create_and_read_back(db):
+    seed_articles(10)
+    repo = ArticleRepository()
+    service = ArticleService(repo=repo)
+    index = ContentIndex(service, refit_ratio=1.0)
+    index.build()
+    extractor = KeywordExtractor(index, top_n=5)
+    repo.subscribe(index.on_article_created)
+    repo.subscribe(extractor.on_article_created)
+
+    new_id = repo.create(Article(None, "sleep sleep sleep", None, "focus"))
+    stored = KeywordRepository().for_articles([new_id], top_n=5)
+    assert stored[new_id][0][0] == "sleep"
+
+    analytics = AnalyticsService(index, keyword_extractor=extractor)
+    assert analytics.article(new_id)["top_keywords"].startswith("sleep")
+    # older articles are extracted on first read and then served from the table
+    old_id = service.list_articles()[-1].id
+    assert old_id not in KeywordRepository().for_articles([old_id])
+    analytics.article(old_id)
+    assert old_id in KeywordRepository().for_articles([old_id])
+
+
+def test_analytics_api_is_404_for_an_unknown_article(db, monkeypatch):
+    monkeypatch.setattr(Config, "WARMUP_ENABLED", False)
+    from app.main import create_app
+
+    client = create_app().test_client()  # seeds the sample articles
+    article_id = ArticleRepository().list_all()[0].id
+    assert client.get(f"/api/analytics/{article_id}").status_code == 200
+    response = client.get("/api/analytics/999999")
+    assert response.status_code == 404
+    assert response.json["message"] == "article not found"
+
+
+def test_articles_without_keywords_are_extracted_once(db):
+    article_id = ArticleRepository().create(Article(None, "t", None, "x"))
+
+    class NoKeywords:
+        calls = 0
+
+        def extract(self, article_ids):
+            NoKeywords.calls += 1
+            keywords = {i: [] for i in article_ids}
+            KeywordRepository().replace_many(list(keywords.items()))
+            return keywords
+
+    analytics = AnalyticsService(None, keyword_extractor=NoKeywords())
+    assert analytics.article(article_id)["top_keywords"] == "-"
+    assert analytics.article(article_id)["top_keywords"] == "-"
+    assert NoKeywords.calls == 1
+    assert KeywordRepository().for_articles([article_id]) == {article_id: []}
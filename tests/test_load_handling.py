@@ -0,0 +1,55 @@
+import sqlite3
+
+from app.config.config import Config
+from app.data.db import close_connection
+from app.models.article import Article
+from app.repositories.article_repository import ArticleRepository
+
+
+def make_app(monkeypatch):
+    monkeypatch.setattr(Config, "WARMUP_ENABLED", False)
+    from app.main import create_app
+
+    return create_app()
+
+
+def test_experiment_group_header_only_when_enabled(db, monkeypatch):
+    client = make_app(monkeypatch).test_client()
+    first = client.get("/debug-group", headers={"X-Experiment-Group": "A"}).json["experiment_group"]
+    # ignored: the session keeps whatever group it was assigned
+    assert client.get("/debug-group", headers={"X-Experiment-Group": "B"}).json["experiment_group"] == first
+
+    monkeypatch.setattr(Config, "EXPERIMENT_GROUP_HEADER", True)
+    client = make_app(monkeypatch).test_client()
+    assert client.get("/debug-group", headers={"X-Experiment-Group": "A"}).json["experiment_group"] == "A"
+    assert client.get("/debug-group", headers={"X-Experiment-Group": "B"}).json["experiment_group"] == "B"
+
+
+def test_write_lock_timeout_is_a_retryable_503(db, monkeypatch):
+    article_id = ArticleRepository().create(Article(None, "t", None, "x"))
+    monkeypatch.setattr(Config, "DB_BUSY_TIMEOUT_MS", 50)
+    close_connection()  # reopen with the short busy timeout
+    client = make_app(monkeypatch).test_client()
+
+    blocker = sqlite3.connect(Config.DB_PATH)
+    blocker.execute("BEGIN EXCLUSIVE")
+    try:
+        response = client.post("/api/events", json={"event_type": "like", "article_id": article_id})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert client.get(f"/articles/{article_id}").status_code == 503
+    finally:
+        blocker.rollback()
+        blocker.close()
+
+    response = client.post("/api/events", json={"event_type": "like", "article_id": article_id})
+    assert response.status_code == 201
+
+
+def test_event_user_id_must_be_an_integer(db, monkeypatch):
+    article_id = ArticleRepository().create(Article(None, "t", None, "x"))
+    client = make_app(monkeypatch).test_client()
+    response = client.post("/api/events", json={"event_type": "like", "article_id": article_id, "user_id": "u-42"})
+    assert response.status_code == 400
+    response = client.post("/api/events", json={"event_type": "like", "article_id": article_id, "user_id": 42})
+    assert response.status_code == 201
@@ -0,0 +1,131 @@
+import os
+import random
+
+import numpy as np
+
+from app.config.config import Config
+from app.models.article import Article
+from app.models.interaction_event import InteractionEvent
+from app.repositories.article_repository import ArticleRepository
+from app.services.interaction_event_service import InteractionEventService
+from app.services.matrix_factorization import CURRENT, FILES, MatrixFactorizationModel, save_factors
+from app.services.recommendation_strategies import MatrixFactorizationStrategy
+from train_als import train
+
+
+def clustered_events(n_users=60, seed=4):
+    # two audiences: users 1..30 read articles 1..10, users 31..60 read 11..20
+    rng = random.Random(seed)
+    events = []
+    for user_id in range(1, n_users + 1):
+        articles = range(1, 11) if user_id <= n_users // 2 else range(11, 21)
+        for article_id in rng.sample(list(articles), 6):
+            events.append(InteractionEvent(None, article_id, user_id, rng.choice(["view", "like"])))
+    return events
+
+
+def test_trained_factors_are_memory_mapped_and_recover_clusters(db, tmp_path):
+    InteractionEventService().write_events(clustered_events())
+    assert train(str(tmp_path), factors=2, iterations=8, regularization=0.1, alpha=10.0, chunk_size=50) == 60
+
+    model = MatrixFactorizationModel.load(str(tmp_path))
+    assert isinstance(model.item_factors, np.memmap)
+    assert all(i <= 10 for i in model.similar_items(3, 5))
+    assert all(i > 10 for i in model.similar_items(15, 5))
+
+    # personal recommendations stay in the user's audience and skip what they asked to exclude
+    picks = model.recommend_for_user(45, 4, exclude_article_ids=[11, 12])
+    assert len(picks) == 4 and all(i > 12 for i in picks)
+    assert model.recommend_for_user(999, 4) == []
+
+
+class Fixed:
+    """Fallback ranking: the same ids for every seed."""
+
+    def __init__(self, ids):
+        self.ids = ids
+
+    def recommend(self, article_id, limit=5):
+        return [Article(i, f"article {i}", None, "x") for i in self.ids if i != article_id][:limit]
+
+    def recommend_many(self, article_ids, limit=5):
+        return {seed: self.recommend(seed, limit) for seed in article_ids}
+
+
+class Existing:
+    # ids above 10 were deleted after training
+    def get_articles(self, article_ids):
+        return [Article(i, f"article {i}", None, "x") for i in article_ids if i <= 10]
+
+
+def test_missing_model_uses_fallbacks(tmp_path):
+    assert MatrixFactorizationModel.load(str(tmp_path)) is None
+
+    strategy = MatrixFactorizationStrategy(
+        article_service=Existing(), model=None, fallback=Fixed([7, 8]), popularity=Fixed([1, 2])
+    )
+    assert [a.id for a in strategy.recommend(1, limit=2)] == [7, 8]
+    assert [a.id for a in strategy.recommend_for_user(7, limit=2)] == [1, 2]
+
+
+def test_factor_ids_of_deleted_articles_are_filled_from_the_fallbacks():
+    class Model:
+        def similar_items(self, article_id, limit):
+            return [3, 12][:limit]
+
+        def recommend_for_user(self, user_id, limit, exclude_article_ids=()):
+            return [12, 4][:limit]
+
+    strategy = MatrixFactorizationStrategy(
+        article_service=Existing(), model=Model(), fallback=Fixed([5, 6]), popularity=Fixed([4, 1, 2])
+    )
+    assert [a.id for a in strategy.recommend(1, limit=2)] == [5, 6]
+    assert [a.id for a in strategy.recommend_many([1], limit=2)[1]] == [5, 6]
+    assert [a.id for a in strategy.recommend(1, limit=1)] == [3]
+    # 12 is gone: popular picks fill in, skipping what the user read and what is already listed
+    assert [a.id for a in strategy.recommend_for_user(7, limit=2, exclude_article_ids=[1])] == [4, 2]
+
+
+def test_each_save_is_a_new_version_published_by_one_symlink_swap(tmp_path):
+    directory = str(tmp_path)
+    ids = [3, 1, 2]
+
+    def save(scale):
+        return save_factors(directory, ids, ids, np.eye(3) * scale, np.eye(3) * scale)
+
+    first = save(1.0)
+    old = MatrixFactorizationModel.load(directory)
+    second = save(2.0)
+    assert os.path.realpath(os.path.join(directory, CURRENT)) == second
+    # a model loaded before the swap keeps reading its own version
+    assert float(old.item_norms[0]) == 1.0
+    assert float(MatrixFactorizationModel.load(directory).item_norms[0]) == 2.0
+
+    third = save(3.0)
+    assert not os.path.exists(first)  # only the published and the previous version are kept
+    assert sorted(os.listdir(directory)) == sorted([CURRENT, os.path.basename(second), os.path.basename(third)])
+
+
+def test_flat_layout_of_older_trainings_still_loads(tmp_path):
+    version = save_factors(str(tmp_path / "new"), [1, 2], [1, 2], np.eye(2), np.eye(2))
+    for name in FILES:
+        os.replace(os.path.join(version, f"{name}.npy"), tmp_path / f"{name}.npy")
+    assert MatrixFactorizationModel.load(str(tmp_path)).similar_items(1, 1) == [2]
+
+
+def test_user_recommendations_skip_articles_already_read(db, tmp_path, monkeypatch):
+    repo = ArticleRepository()
+    for i in range(1, 21):
+        repo.create(Article(None, f"article {i}", None, "x"))
+    events = clustered_events()
+    InteractionEventService().write_events(events)
+    train(str(tmp_path), factors=2, iterations=8, regularization=0.1, alpha=10.0, chunk_size=50)
+    monkeypatch.setattr(Config, "ALS_MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(Config, "WARMUP_ENABLED", False)
+    from app.main import create_app
+
+    body = create_app().test_client().get("/api/users/45/recommendations").json
+    assert body["personalized"]
+    read = {e.article_id for e in events if e.user_id == 45}
+    picks = [r["id"] for r in body["recommendations"]]
+    assert picks and not read & set(picks)
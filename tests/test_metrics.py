@@ -0,0 +1,46 @@
+from app import metrics
+from app.config.config import Config
+from app.metrics import Counter, Histogram, Registry
+from app.models.article import Article
+from app.repositories.article_repository import ArticleRepository
+
+
+def test_prometheus_text_format():
+    registry = Registry()
+    requests = Counter("requests_total", "Requests", ["route"], registry=registry)
+    latency = Histogram("latency_seconds", "Latency", ["route"], buckets=(0.1, 1.0), registry=registry)
+
+    requests.labels("/a").inc()
+    requests.labels(route="/a").inc(2)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.labels("/a").observe(value)
+
+    lines = registry.render().splitlines()
+    assert lines[:3] == ["# HELP requests_total Requests", "# TYPE requests_total counter",
+                         'requests_total{route="/a"} 3']
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{route="/a"} 3.65' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+
+
+def test_metrics_endpoint_labels_queries_and_recommendations_by_route(db, monkeypatch):
+    monkeypatch.setattr(Config, "WARMUP_ENABLED", False)
+    monkeypatch.setattr(Config, "EXPERIMENT_GROUP_HEADER", True)
+    from app.main import create_app
+
+    client = create_app().test_client()
+    article_id = ArticleRepository().create(Article(None, "Python tips", None, "python code"))
+    route = "/api/recommendations/<int:article_id>"
+    before = metrics.RECOMMEND_SECONDS.labels(route, "content", "B").count
+
+    response = client.get(f"/api/recommendations/{article_id}?strategy=content",
+                          headers={"X-Experiment-Group": "B"})
+    assert response.status_code == 200
+    assert metrics.RECOMMEND_SECONDS.labels(route, "content", "B").count == before + 1
+
+    body = client.get("/metrics").get_data(as_text=True)
+    assert f'http_requests_total{{route="{route}",method="GET",status="200",group="B"}}' in body
+    assert f'db_query_duration_seconds_count{{route="{route}",statement="SELECT"}}' in body
+    assert 'tfidf_build_duration_seconds_count{phase="fit"}' in body
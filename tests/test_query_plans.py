@@ -0,0 +1,62 @@
+import pytest
+
+from app.data.migrations import MIGRATIONS, current_version
+from app.repositories.article_stats_repository import TOP_POPULAR_SQL, ArticleStatsRepository
+from app.repositories.event_bucket_repository import ACTIVE_BUCKETS_SQL
+from app.repositories.experiment_group_stats_repository import EXPERIMENT_GROUP_SUMMARY_SQL
+from app.repositories.related_articles_repository import NEIGHBORS_SQL
+from app.services.item_similarity import ENGAGEMENT_SINCE_SQL
+from app.services.interaction_event_service import (
+    ARTICLE_IDS_FOR_USER_SQL,
+    COUNT_FOR_ARTICLE_SQL,
+    TOTAL_DURATION_FOR_ARTICLE_SQL,
+)
+
+SERVICE_QUERIES = [
+    (COUNT_FOR_ARTICLE_SQL, (1, "view")),
+    (TOTAL_DURATION_FOR_ARTICLE_SQL, (1, "time_spent")),
+    (EXPERIMENT_GROUP_SUMMARY_SQL, ()),
+    (ARTICLE_IDS_FOR_USER_SQL, (1,)),
+]
+
+
+def plan(conn, sql, params):
+    return [row["detail"] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+
+def test_all_migrations_applied(db):
+    assert current_version(db) == MIGRATIONS[-1][0]
+
+
+@pytest.mark.parametrize("sql,params", SERVICE_QUERIES)
+def test_event_queries_use_an_index(db, sql, params):
+    details = plan(db, sql, params)
+    assert any("interaction_events USING COVERING INDEX" in d for d in details), details
+    assert not any(d.startswith("SCAN interaction_events") for d in details), details
+
+
+def test_popularity_ranking_uses_score_index(db):
+    db.execute("INSERT INTO articles(id, title, content) VALUES (1, 't', 'x')")
+    # id 2 has engagement but no article row: never ranked
+    db.execute("INSERT INTO article_stats(article_id, views, score) VALUES (1, 1, 1), (2, 5, 5)")
+    details = plan(db, TOP_POPULAR_SQL, (1, 8))
+    assert any("idx_article_stats_score" in d for d in details), details
+    assert not any("TEMP B-TREE" in d for d in details), details
+    assert ArticleStatsRepository().top_article_ids(8) == [1]
+    assert [row[0] for row in ArticleStatsRepository().top_stats(8)] == [1]
+
+
+def test_related_articles_lookup_uses_primary_key(db):
+    details = plan(db, NEIGHBORS_SQL, (1, 8))
+    assert any("related_articles USING PRIMARY KEY" in d for d in details), details
+    assert not any("TEMP B-TREE" in d for d in details), details
+
+
+def test_trending_window_is_a_primary_key_range(db):
+    details = plan(db, ACTIVE_BUCKETS_SQL, (480000,))
+    assert any("article_event_buckets USING PRIMARY KEY (bucket_hour>?)" in d for d in details), details
+
+
+def test_collaborative_catch_up_reads_a_rowid_range(db):
+    details = plan(db, ENGAGEMENT_SINCE_SQL, (100,))
+    assert any("interaction_events USING INTEGER PRIMARY KEY" in d for d in details), details
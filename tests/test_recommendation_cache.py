@@ -0,0 +1,42 @@
+from app.services.recommendation_cache import DataVersion, RecommendationCache
+
+
+class CountingStrategy:
+    def __init__(self):
+        self.calls = 0
+
+    def recommend(self, article_id, limit=5):
+        self.calls += 1
+        return [article_id + 1]
+
+
+def test_hits_until_article_version_changes():
+    version = DataVersion()
+    cache = RecommendationCache(version)
+    inner = CountingStrategy()
+    strategy = cache.wrap("content", inner, uses_engagement=False)
+
+    assert strategy.recommend(1, limit=3) == [2]
+    assert strategy.recommend(1, limit=3) == [2]
+    assert inner.calls == 1
+
+    version.on_article_created(10)
+    strategy.recommend(1, limit=3)
+    assert inner.calls == 2
+    assert cache.stats()["stale"] == 1
+
+
+def test_engagement_version_is_bucketed():
+    version = DataVersion(engagement_bucket=3)
+    cache = RecommendationCache(version)
+    inner = CountingStrategy()
+    strategy = cache.wrap("popular", inner)
+
+    strategy.recommend(1)
+    version.on_events_logged([object(), object()])
+    strategy.recommend(1)
+    assert inner.calls == 1
+
+    version.on_events_logged([object()])
+    strategy.recommend(1)
+    assert inner.calls == 2
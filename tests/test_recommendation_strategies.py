@@ -34,3 +34,53 @@ def test_content_strategy_returns_results():
     strategy = ContentBasedStrategy(article_service=FakeArticleService())
     results = strategy.recommend(article_id=1, limit=2)
     assert len(results) == 2
+
+def test_sketch_ranking_skips_ids_without_an_article():
+    class Service(FakeArticleService):
+        def get_articles(self, article_ids):
+            return [FakeArticle(i) for i in article_ids if i <= 3]
+
+    class Ranking:
+        def popular_article_ids(self, limit, exclude_article_id=None):
+            return [i for i in [99, 3, 2, 1] if i != exclude_article_id][:limit]
+
+    class Events(FakeEventService):
+        def popular_article_ids(self, limit, exclude_article_id=None):
+            return [i for i in [2, 3, 1] if i != exclude_article_id][:limit]
+
+    strategy = PopularityStrategy(article_service=Service(), event_service=Events(), ranking=Ranking())
+    # id 99 only exists in the event stream: the ranking is short, the database fills in
+    assert [a.id for a in strategy.recommend(article_id=1, limit=3)] == [2, 3]
+    assert [a.id for a in strategy.recommend_many([1], limit=3)[1]] == [2, 3]
+    assert [a.id for a in strategy.recommend(article_id=1, limit=2)] == [3, 2]
+
+
+class ExistingArticles(FakeArticleService):
+    # ids above 3 were deleted (or never had a row)
+    def get_articles(self, article_ids):
+        return [FakeArticle(i) for i in article_ids if i <= 3]
+
+
+class FixedRanking:
+    def __init__(self, ids):
+        self.ids = ids
+
+    def recommend(self, article_id, limit=5):
+        return [FakeArticle(i) for i in self.ids if i != article_id][:limit]
+
+    def recommend_many(self, article_ids, limit=5):
+        return {seed: self.recommend(seed, limit) for seed in article_ids}
+
+
+def test_trending_fills_in_for_ids_without_an_article():
+    from app.services.recommendation_strategies import TrendingStrategy
+
+    class Trending:
+        def trending_article_ids(self, limit, exclude_article_id=None):
+            return [i for i in [99, 2, 98] if i != exclude_article_id][:limit]
+
+    strategy = TrendingStrategy(article_service=ExistingArticles(), trending=Trending(),
+                                fallback=FixedRanking([3, 2, 1]))
+    assert [a.id for a in strategy.recommend(1, limit=3)] == [2, 3]
+    assert [a.id for a in strategy.recommend_many([1], limit=3)[1]] == [2, 3]
+    assert [a.id for a in strategy.recommend(2, limit=2)] == [3, 1]
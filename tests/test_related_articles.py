@@ -0,0 +1,41 @@
+import random
+
+from app.models.article import Article
+from app.repositories.article_repository import ArticleRepository
+from app.repositories.related_articles_repository import RelatedArticlesRepository
+from app.services.article_service import ArticleService
+from app.services.content_index import ContentIndex
+from app.services.recommendation_strategies import ContentBasedStrategy
+from precompute_related import precompute
+
+WORDS = ["ai", "apps", "mobile", "travel", "budget", "flights", "habits", "sleep", "focus", "vr"]
+
+
+def seed_articles(n=40):
+    rng = random.Random(5)
+    repo = ArticleRepository()
+    for i in range(n):
+        words = rng.choices(WORDS, k=4)
+        repo.create(Article(None, words[0], None, " ".join(words[1:])))
+
+
+def test_precomputed_neighbours_match_live_scoring(db):
+    seed_articles()
+    assert precompute(top_k=10, block_size=7, full=False) == 40
+
+    service = ArticleService(repo=ArticleRepository())
+    live = ContentBasedStrategy(article_service=service, content_index=ContentIndex(service))
+    stored = ContentBasedStrategy(article_service=service, related_articles=RelatedArticlesRepository())
+
+    for article in service.list_articles():
+        assert [a.id for a in stored.recommend(article.id, limit=8)] == \
+               [a.id for a in live.recommend(article.id, limit=8)]
+
+
+def test_incremental_run_only_processes_new_articles(db):
+    seed_articles(10)
+    precompute(top_k=5, block_size=4, full=False)
+
+    ArticleRepository().create(Article(None, "ai apps", None, "mobile vr"))
+    assert precompute(top_k=5, block_size=4, full=False) == 1
+    assert precompute(top_k=5, block_size=4, full=True) == 11
@@ -0,0 +1,119 @@
+import json
+import threading
+from datetime import datetime, timezone
+
+from app.config.config import Config
+from app.data.db import get_connection
+from app.models.interaction_event import InteractionEvent
+from app.repositories.event_bucket_repository import current_hour
+from app.services import event_aggregates
+from app.services.event_aggregates import ROLLUP_SQL, rebuild_event_aggregates
+from app.services.interaction_event_service import InteractionEventService
+from replay_events import replay, secondary_indexes
+
+AGGREGATES = {
+    "article_stats": "SELECT article_id, views, likes, time_spent_ms, score FROM article_stats ORDER BY 1",
+    "buckets": "SELECT * FROM article_event_buckets ORDER BY 1, 2",
+    "groups": "SELECT * FROM experiment_group_stats ORDER BY 1",
+}
+
+
+def at(hour):
+    return datetime.fromtimestamp(hour * 3600, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def snapshot(db):
+    return {name: [tuple(r) for r in db.execute(sql)] for name, sql in AGGREGATES.items()}
+
+
+def test_single_pass_rebuild_matches_ingest_time_aggregates(db):
+    now = current_hour()
+    InteractionEventService().log_many([
+        InteractionEvent(None, 1, None, "view", experiment_group="A", created_at=at(now)),
+        InteractionEvent(None, 1, None, "like", experiment_group="B", created_at=at(now - 1)),
+        InteractionEvent(None, 2, None, "time_spent", 90000, "A", created_at=at(now)),
+        # outside the trending window, still counted in the totals
+        InteractionEvent(None, 2, None, "view", experiment_group="B", created_at=at(now - 500)),
+    ])
+    maintained = snapshot(db)
+    rebuild_event_aggregates(Config.TRENDING_WINDOW_HOURS)
+    assert snapshot(db) == maintained
+
+
+def test_events_committed_during_the_rebuild_scan_are_counted(db, monkeypatch):
+    now = current_hour()
+    service = InteractionEventService()
+    service.log_many([InteractionEvent(None, 1, None, "view", experiment_group="A", created_at=at(now))])
+    late = [
+        InteractionEvent(None, 1, None, "like", experiment_group="A", created_at=at(now)),
+        InteractionEvent(None, 2, None, "view", experiment_group="B", created_at=at(now)),
+    ]
+
+    class ScanRacesAWriter:
+        # another thread (its own connection) commits right after the scan
+        def __getattr__(self, name):
+            return getattr(db, name)
+
+        def __enter__(self):
+            return db.__enter__()
+
+        def __exit__(self, *exc):
+            return db.__exit__(*exc)
+
+        def execute(self, sql, *args):
+            result = db.execute(sql, *args)
+            if sql == ROLLUP_SQL:
+                writer = threading.Thread(target=service.log_many, args=(late,))
+                writer.start()
+                writer.join()
+            return result
+
+    monkeypatch.setattr(event_aggregates, "get_connection", ScanRacesAWriter)
+    rebuild_event_aggregates(Config.TRENDING_WINDOW_HOURS)
+    rebuilt = snapshot(db)
+
+    monkeypatch.setattr(event_aggregates, "get_connection", get_connection)
+    rebuild_event_aggregates(Config.TRENDING_WINDOW_HOURS)
+    assert rebuilt == snapshot(db)
+    assert [r[:3] for r in rebuilt["article_stats"]] == [(1, 1, 1), (2, 1, 0)]
+
+
+def test_replay_keeps_timestamps_and_groups(db, tmp_path):
+    path = tmp_path / "events.jsonl"
+    lines = [
+        {"article_id": 1, "event_type": "view", "experiment_group": "A", "created_at": "2024-03-01T10:15:00Z"},
+        {"article_id": 1, "event_type": "like", "experiment_group": "B", "created_at": "2024-03-01 12:00:00+02:00"},
+        {"article_id": 2, "event_type": "time_spent", "duration_ms": 60000, "experiment_group": "A",
+         "created_at": "2024-03-02 08:00:00"},
+        {"article_id": "x", "event_type": "view", "created_at": "2024-03-01 00:00:00"},
+    ]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n", encoding="utf-8")
+    indexes = secondary_indexes(db)
+
+    assert replay(str(path), chunk_size=2, drop=True) == 3
+    # a second run has nothing left to load
+    assert replay(str(path), chunk_size=2) == 0
+
+    assert [r[0] for r in db.execute("SELECT created_at FROM interaction_events ORDER BY id")] == [
+        "2024-03-01 10:15:00", "2024-03-01 10:00:00", "2024-03-02 08:00:00",
+    ]
+    assert secondary_indexes(db) == indexes
+    summary = {r["experiment_group"]: (r["views"], r["likes"], r["total_duration_ms"])
+               for r in InteractionEventService().experiment_group_summary()}
+    assert summary == {"A": (1, 0, 60000), "B": (0, 1, 0)}
+
+
+def test_lines_with_a_non_text_experiment_group_are_skipped(db, tmp_path):
+    path = tmp_path / "events.jsonl"
+    lines = [
+        {"article_id": 1, "event_type": "view", "experiment_group": ["A"], "created_at": "2024-03-01 10:00:00"},
+        {"article_id": 1, "event_type": "view", "experiment_group": {"g": "B"}, "created_at": "2024-03-01 10:00:00"},
+        {"article_id": 2, "event_type": "view", "experiment_group": "A", "created_at": "2024-03-01 10:00:00"},
+        {"article_id": 3, "event_type": "view", "created_at": "2024-03-01 10:00:00"},
+    ]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n", encoding="utf-8")
+
+    assert replay(str(path), chunk_size=10) == 2
+    assert [tuple(r) for r in db.execute(
+        "SELECT article_id, experiment_group FROM interaction_events ORDER BY id"
+    )] == [(2, "A"), (3, None)]
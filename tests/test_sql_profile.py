@@ -0,0 +1,78 @@
+import logging
+
+from app.config.config import Config
+from app.data import db as db_module
+from app.data.db import close_connection, finish_profile, get_connection, start_profile
+from app.models.article import Article
+from app.repositories.article_repository import ArticleRepository
+
+
+def test_profile_counts_queries_and_flags_repeated_statements(db, monkeypatch, caplog):
+    monkeypatch.setattr(Config, "SQL_PROFILE", True)
+    monkeypatch.setattr(Config, "SQL_N_PLUS_ONE_THRESHOLD", 3)
+    close_connection()
+    conn = get_connection()  # reopened as a profiled connection
+
+    profile = start_profile()
+    for article_id in range(5):
+        get_connection().execute("SELECT title FROM articles WHERE id = ?", (article_id,)).fetchone()
+    conn.execute("SELECT COUNT(*) FROM categories").fetchone()
+    assert (profile.queries, profile.connections, profile.checkouts) == (6, 0, 5)
+
+    close_connection()
+    conn = get_connection()
+    assert profile.connections == 1
+    with caplog.at_level(logging.WARNING, logger="article_engine"):
+        assert finish_profile("GET /test") is profile
+
+    assert profile.seconds > 0
+    assert profile.repeated(3) == [("SELECT title FROM articles WHERE id = ?", 5)]
+    assert "Possible N+1 in GET /test: 5x SELECT title FROM articles WHERE id = ?" in caplog.text
+
+    # not accounted once finished
+    queries = profile.queries
+    conn.execute("SELECT 1").fetchone()
+    assert profile.queries == queries
+
+
+def test_checkout_resolves_the_path_only_when_opening(db, monkeypatch, tmp_path):
+    conn = get_connection()
+
+    def fail():
+        raise AssertionError("path resolved on checkout")
+
+    monkeypatch.setattr(db_module, "db_path", fail)
+    assert get_connection() is conn
+    monkeypatch.setattr(db_module, "db_path", lambda: str(tmp_path / "other.db"))
+    monkeypatch.setattr(Config, "DB_PATH", str(tmp_path / "other.db"))
+    # a changed DB_PATH still swaps the connection
+    assert get_connection() is not conn
+
+
+def test_slow_queries_are_logged_with_their_plan(db, monkeypatch, caplog):
+    monkeypatch.setattr(Config, "SQL_PROFILE", True)
+    monkeypatch.setattr(Config, "SQL_SLOW_QUERY_MS", 0)
+    close_connection()
+
+    with caplog.at_level(logging.WARNING, logger="article_engine"):
+        get_connection().execute("SELECT title FROM articles WHERE id = ?", (1,)).fetchall()
+
+    assert "Slow query" in caplog.text
+    assert "SEARCH articles USING INTEGER PRIMARY KEY" in caplog.text
+
+
+def test_debug_responses_carry_the_profile_header(db, monkeypatch):
+    monkeypatch.setattr(Config, "WARMUP_ENABLED", False)
+    monkeypatch.setattr(Config, "SQL_PROFILE", True)
+    close_connection()
+    from app.main import create_app
+
+    article_id = ArticleRepository().create(Article(None, "t", None, "x"))
+    client = create_app().test_client()
+    assert "X-SQL-Profile" not in client.get(f"/articles/{article_id}").headers
+
+    monkeypatch.setattr(Config, "DEBUG", True)
+    client = create_app().test_client()
+    header = client.get(f"/articles/{article_id}").headers["X-SQL-Profile"]
+    assert header.startswith("queries=")
+    assert "sql_ms=" in header
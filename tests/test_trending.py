@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+
+from app.models.article import Article
+from app.models.interaction_event import InteractionEvent
+from app.repositories.article_repository import ArticleRepository
+from app.repositories.event_bucket_repository import EventBucketRepository, bucket_hour, current_hour
+from app.services.article_service import ArticleService
+from app.services.interaction_event_service import InteractionEventService
+from app.services.recommendation_factory import RecommendationFactory
+from app.services.trending_service import TrendingService
+
+
+def at(hour):
+    # created_at string for the start of an epoch hour
+    return datetime.fromtimestamp(hour * 3600, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def test_bucket_hour_round_trips():
+    assert bucket_hour(at(480000)) == 480000
+    # offsets are converted to UTC, not dropped
+    assert bucket_hour("2024-01-01T05:30:00+02:00") == bucket_hour("2024-01-01 03:30:00")
+
+
+def test_recent_engagement_outranks_old(db):
+    repo = ArticleRepository()
+    old, fresh, other = (repo.create(Article(None, f"t{i}", None, "x")) for i in range(3))
+    now = current_hour()
+
+    events = InteractionEventService()
+    events.log_many(
+        [InteractionEvent(None, old, None, "view", created_at=at(now - 48)) for _ in range(10)]
+        + [InteractionEvent(None, fresh, None, "view", created_at=at(now)) for _ in range(3)]
+    )
+
+    trending = TrendingService(half_life_hours=12, window_hours=72)
+    # 10 views two days ago decay to 10/16; 3 views this hour stay 3
+    assert trending.trending_article_ids(5) == [fresh, old]
+    # all-time popularity still prefers the old article
+    assert events.popular_article_ids(5)[:2] == [old, fresh]
+
+    strategy = RecommendationFactory.create("trending", ArticleService(repo=repo), events, trending=trending)
+    # only `old` is trending besides the current article; popularity fills the rest
+    assert [a.id for a in strategy.recommend(fresh, limit=2)] == [old, other]
+
+
+def test_old_buckets_roll_off(db):
+    now = current_hour()
+    article_id = ArticleRepository().create(Article(None, "t", None, "x"))
+    InteractionEventService().log_many([
+        InteractionEvent(None, article_id, None, "like", created_at=at(now - 200)),
+        InteractionEvent(None, article_id, None, "like", created_at=at(now)),
+    ])
+    assert [row[0] for row in EventBucketRepository().active(0)] == [now]
@@ -0,0 +1,60 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from app.warmup import Warmup
+
+
+def test_steps_run_in_order_and_failures_are_recorded():
+    calls = []
+
+    def broken():
+        raise RuntimeError("boom")
+
+    warmup = Warmup().add("first", lambda: calls.append(1)).add("broken", broken).add("last", lambda: calls.append(3))
+    assert not warmup.ready
+    warmup.start()
+    assert warmup.wait(5)
+
+    status = warmup.status()
+    assert calls == [1, 3]
+    # finished, but not ready: a step failed
+    assert status["finished"] and not status["ready"]
+    assert status["failed"] == ["broken"]
+    assert status["steps"]["first"]["state"] == "done"
+    assert status["steps"]["broken"]["state"] == "failed: boom"
+
+
+def test_app_is_live_immediately_and_ready_after_warmup(db):
+    from app.main import create_app
+
+    app = create_app()
+    client = app.test_client()
+    assert client.get("/healthz").status_code == 200
+
+    assert app.extensions["warmup"].wait(30)
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    assert response.json["steps"]["content_index"]["state"] == "done"
+
+
+def test_importing_the_app_defers_sklearn_and_scipy():
+    code = "import sys, app.main; print(sorted(m for m in ('sklearn', 'scipy') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=str(Path(__file__).resolve().parent.parent))
+    assert result.stdout.strip() == "[]"
+
+
+def test_readyz_is_503_when_a_warmup_step_failed(db, monkeypatch):
+    from app.main import create_app
+    from app.services.item_similarity import ItemItemModel
+
+    def broken(self):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(ItemItemModel, "ensure_built", broken)
+    app = create_app()
+    assert app.extensions["warmup"].wait(30)
+    response = app.test_client().get("/readyz")
+    assert response.status_code == 503
+    assert response.json["failed"] == ["collaborative"]
@@ -0,0 +1,53 @@
+import argparse
+import time
+
+from app.config.config import Config
+from app.data.schema import init_db
+from app.services.item_similarity import engagement_matrix
+from app.services.matrix_factorization import save_factors, train_als
+
+
+def train(output: str, factors: int, iterations: int, regularization: float, alpha: float,
+          chunk_size: int) -> int:
+    """Train ALS factors on all user events and write them to `output`. Returns users trained."""
+    start = time.perf_counter()
+    counts, user_index, item_index, last_id = engagement_matrix(chunk_size)
+    if counts.nnz == 0:
+        print("Nothing to do: no events with a user_id")
+        return 0
+    print(f"{len(user_index)} users x {len(item_index)} articles, {counts.nnz} pairs "
+          f"(read in {time.perf_counter() - start:.1f}s)")
+
+    start = time.perf_counter()
+    # same damping as the item-item model: heavy sessions do not drown out breadth
+    users, items = train_als(counts.log1p(), factors=factors, regularization=regularization,
+                             alpha=alpha, iterations=iterations)
+    print(f"trained {factors} factors x {iterations} iterations in {time.perf_counter() - start:.1f}s")
+
+    version_dir = save_factors(
+        output,
+        user_ids=sorted(user_index, key=user_index.get),
+        item_ids=sorted(item_index, key=item_index.get),
+        user_factors=users,
+        item_factors=items,
+        iterations=iterations,
+        regularization=regularization,
+        alpha=alpha,
+        last_event_id=last_id,
+    )
+    print(f"wrote factors to {version_dir}")
+    return len(user_index)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train implicit ALS factors for MatrixFactorizationStrategy")
+    parser.add_argument("--output", default=Config.ALS_MODEL_DIR)
+    parser.add_argument("--factors", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--regularization", type=float, default=0.1)
+    parser.add_argument("--alpha", type=float, default=10.0)
+    parser.add_argument("--chunk-size", type=int, default=Config.CF_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    init_db()
+    train(args.output, args.factors, args.iterations, args.regularization, args.alpha, args.chunk_size)